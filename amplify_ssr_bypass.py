@@ -13,13 +13,27 @@ technical authorship. AI tools supported the process, but the responsibility,
 modularity, and mutation awareness logic are my own.
 """
 
+import argparse
 import json
 import os
 import shutil
 import hashlib
-from datetime import datetime
 from pathlib import Path
 
+from build_reproducibility import build_timestamp, deterministic, json_options, run_log_name, tree_digest
+from bypass_transaction import BypassTransaction
+
+BYPASS_CACHE_DIR = '.bypass-cache'
+NEXT_CONFIGS = ['next.config.js', 'next.config.mjs', 'next.config.ts']
+STUB_MARKER = '// Static-only configuration'
+BYPASS_INPUTS = ['package.json', 'app', 'amplify_ssr_bypass.py', 'bypass_transaction.py',
+                 'build_reproducibility.py']
+TRACED_ENTRIES = ['out/.next/server/pages/_app.js', 'out/.next/server/pages/_document.js',
+                  'out/.next/server/pages/index.js']
+BYPASS_OUTPUTS = ['package.amplify.json', '.amplify-hosting', 'amplify.json', 'static-site.config',
+                  'amplify_build_wrapper.js', 'out/.next/trace', 'out/server.js'] + \
+                 [f"{entry}.nft.json" for entry in TRACED_ENTRIES]
+
 class AmplifySSRBypass:
     """Intercepts and masks Next.js identity to prevent SSR scaffolding"""
     
@@ -27,11 +41,12 @@ class AmplifySSRBypass:
         self.mutation_log = []
         self.original_hashes = {}
         self.bypass_id = "Amplify-SSR-Detection-Bypass-v1"
+        self.transaction = BypassTransaction()
         
     def log_mutation(self, action, target, before, after, hypothesis=""):
         """Log all mutations for forensic audit trail"""
         mutation = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "bypass_id": self.bypass_id,
             "action": action,
             "target": target,
@@ -80,9 +95,8 @@ class AmplifySSRBypass:
         masked['staticSiteGenerator'] = 'custom'
         masked['_amplify_bypass'] = True
         
-        # Write masked version
-        with open('package.amplify.json', 'w') as f:
-            json.dump(masked, f, indent=2)
+        # Stage masked version
+        self.transaction.write('package.amplify.json', json.dumps(masked, **json_options(indent=2)))
             
         self.log_mutation(
             action="MASK_PACKAGE_JSON",
@@ -96,12 +110,11 @@ class AmplifySSRBypass:
         
     def sanitize_next_config(self):
         """Remove SSR indicators from Next.js configuration"""
-        configs = ['next.config.js', 'next.config.mjs', 'next.config.ts']
-        
-        for config_file in configs:
+        for config_file in NEXT_CONFIGS:
             if Path(config_file).exists():
-                # Rename to hide from Amplify
-                shutil.move(config_file, f".{config_file}.bypass")
+                # Rename to hide from Amplify; a rerun must not back up its own stub
+                if self.original_config(config_file) == config_file:
+                    self.transaction.move(config_file, f".{config_file}.bypass")
                 
                 # Create sanitized stub with correct syntax based on file extension
                 if config_file.endswith('.mjs'):
@@ -129,8 +142,7 @@ module.exports = {
   generateEtags: false
 }"""
                 
-                with open(config_file, 'w') as f:
-                    f.write(stub_content)
+                self.transaction.write(config_file, stub_content)
                     
                 self.log_mutation(
                     action="SANITIZE_CONFIG",
@@ -170,8 +182,7 @@ module.exports = {
         }
         
         for filename, content in static_markers.items():
-            with open(filename, 'w') as f:
-                json.dump(content, f, indent=2)
+            self.transaction.write(filename, json.dumps(content, **json_options(indent=2)))
                 
             self.log_mutation(
                 action="INJECT_METADATA",
@@ -206,19 +217,12 @@ execSync('npx next build', { stdio: 'inherit' });
 console.log('[BYPASS] Static build complete');
 '''
         
-        with open('amplify_build_wrapper.js', 'w') as f:
-            f.write(wrapper_content)
-            
-        os.chmod('amplify_build_wrapper.js', 0o755)
+        self.transaction.write('amplify_build_wrapper.js', wrapper_content, mode=0o755)
         
     def create_server_trace_files(self):
         """Create fake server trace files that Amplify requires"""
         
-        # Ensure out directory exists
-        if not os.path.exists('out'):
-            os.makedirs('out', exist_ok=True)
-            
-        # Create .next directory structure in out
+        # Create .next directory structure in out; staged so --revert removes it
         trace_dirs = [
             'out/.next',
             'out/.next/server',
@@ -227,38 +231,26 @@ console.log('[BYPASS] Static build complete');
         ]
         
         for dir_path in trace_dirs:
-            os.makedirs(dir_path, exist_ok=True)
+            self.transaction.makedirs(dir_path)
             
-        # Create trace files with expected structure
+        # Placeholder traces only: this runs before `npm run build`, so there is
+        # nothing current to trace yet. synthetic_ssr_scaffolding.py traces the
+        # real entries after the build.
         trace_files = {
-            'out/.next/server/pages/_app.js.nft.json': {
-                "version": 1,
-                "files": []
-            },
-            'out/.next/server/pages/_document.js.nft.json': {
-                "version": 1,
-                "files": []
-            },
-            'out/.next/server/pages/index.js.nft.json': {
-                "version": 1,
-                "files": []
-            },
+            f"{entry}.nft.json": {"version": 1, "files": []} for entry in TRACED_ENTRIES
+        }
+        trace_files.update({
             'out/.next/trace': {
                 "version": 1,
                 "files": {}
             }
-        }
+        })
         
         for filepath, content in trace_files.items():
-            dir_path = os.path.dirname(filepath)
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path, exist_ok=True)
-            with open(filepath, 'w') as f:
-                json.dump(content, f)
+            self.transaction.write(filepath, json.dumps(content, **json_options()))
                 
         # Create server.js stub in out
-        with open('out/server.js', 'w') as f:
-            f.write('// Static export stub\n')
+        self.transaction.write('out/server.js', '// Static export stub\n')
             
         self.log_mutation(
             action="CREATE_TRACE_FILES",
@@ -278,23 +270,106 @@ console.log('[BYPASS] Static build complete');
         
     def save_mutation_log(self):
         """Save mutation log for forensic audit"""
-        log_file = f"mutation_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        log_file = run_log_name("mutation_log", self.bypass_id)
         
         with open(log_file, 'w') as f:
             json.dump({
                 "bypass_id": self.bypass_id,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": build_timestamp(),
                 "total_mutations": len(self.mutation_log),
                 "original_hashes": self.original_hashes,
                 "mutations": self.mutation_log
-            }, f, indent=2)
+            }, f, **json_options(indent=2))
             
         return log_file
         
-    def execute_bypass(self):
+    def original_config(self, config_file):
+        """The user's config, even after a previous run replaced it with the stub"""
+        backup = f".{config_file}.bypass"
+        if not os.path.exists(config_file):
+            return None
+        if os.path.exists(backup):
+            with open(config_file, 'r') as f:
+                if f.read(len(STUB_MARKER)) == STUB_MARKER:
+                    return backup
+        return config_file
+        
+    def input_digest(self):
+        """Hash everything the bypass outputs are derived from
+
+        The outputs carry no timestamps (those only go to the mutation log), so
+        the build clock is not part of the key; only deterministic mode is,
+        because it sorts the keys of the JSON markers.
+        """
+        sources = [p for p in BYPASS_INPUTS if os.path.exists(p)]
+        digest = hashlib.sha256(tree_digest(sources)[0].encode())
+        for config_file in NEXT_CONFIGS:
+            source = self.original_config(config_file)
+            if source:
+                with open(source, 'rb') as f:
+                    digest.update(config_file.encode() + b'\0' + hashlib.sha256(f.read()).digest())
+        digest.update(b'sorted-json' if deterministic() else b'')
+        return digest.hexdigest()
+        
+    def output_files(self):
+        outputs = [p for p in BYPASS_OUTPUTS if os.path.exists(p)]
+        for config_file in NEXT_CONFIGS:
+            if os.path.exists(f".{config_file}.bypass"):
+                outputs.extend([config_file, f".{config_file}.bypass"])
+        return outputs
+        
+    def store_in_cache(self, digest):
+        """Keep this run's outputs keyed by the input digest"""
+        files_dir = os.path.join(BYPASS_CACHE_DIR, 'files')
+        shutil.rmtree(files_dir, ignore_errors=True)
+        outputs = self.output_files()
+        for path in outputs:
+            target = os.path.join(files_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(path, target)
+        with open(os.path.join(BYPASS_CACHE_DIR, 'manifest.json'), 'w') as f:
+            json.dump({"digest": digest, "files": outputs}, f, indent=2)
+        return outputs
+        
+    def restore_from_cache(self, digest):
+        """Copy cached outputs back when the inputs are unchanged; None on a miss"""
+        try:
+            with open(os.path.join(BYPASS_CACHE_DIR, 'manifest.json'), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        cached = [os.path.join(BYPASS_CACHE_DIR, 'files', path) for path in manifest["files"]]
+        if manifest.get("digest") != digest or not all(os.path.isfile(p) for p in cached):
+            return None
+        for path, source in zip(manifest["files"], cached):
+            with open(source, 'rb') as f:
+                self.transaction.write(path, f.read(), os.stat(source).st_mode & 0o777)
+        return manifest["files"]
+        
+    def execute_bypass(self, use_cache=True):
         """Execute complete SSR bypass sequence"""
         print(f"[{self.bypass_id}] Starting SSR detection bypass...")
         
+        digest = self.input_digest() if use_cache else None
+        restored = self.restore_from_cache(digest) if use_cache else None
+        if restored is not None:
+            self.transaction.commit()
+            self.log_mutation(
+                action="RESTORE_FROM_CACHE",
+                target=BYPASS_CACHE_DIR,
+                before=digest,
+                after=restored,
+                hypothesis="Unchanged inputs reproduce the same bypass outputs"
+            )
+            log_file = self.save_mutation_log()
+            print(f"[BYPASS] Inputs unchanged ({digest[:12]}), restored {len(restored)} files from cache")
+            return {
+                "status": "cached",
+                "digest": digest,
+                "restored": len(restored),
+                "log_file": log_file
+            }
+        
         # Layer 1: Mask Next.js identity
         self.mask_nextjs_identity()
         print("[BYPASS] Package.json masked")
@@ -315,17 +390,34 @@ console.log('[BYPASS] Static build complete');
         self.create_server_trace_files()
         print("[BYPASS] Server trace files created")
         
+        # Apply every staged layer together; any failure restores the originals
+        committed = self.transaction.commit()
+        print(f"[BYPASS] Applied {len(committed)} file changes (undo with --revert)")
+        
+        if use_cache:
+            cached = self.store_in_cache(digest)
+            print(f"[BYPASS] Cached {len(cached)} outputs under {digest[:12]}")
+            
         # Save forensic log
         log_file = self.save_mutation_log()
         print(f"[BYPASS] Mutation log saved: {log_file}")
         
         return {
             "status": "complete",
+            "digest": digest,
             "mutations": len(self.mutation_log),
             "log_file": log_file
         }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mask Next.js identity for static Amplify hosting")
+    parser.add_argument("--no-cache", action="store_true", help=f"Always recompute, ignoring {BYPASS_CACHE_DIR}")
+    parser.add_argument("--revert", action="store_true", help="Restore every file the bypass changed")
+    args = parser.parse_args()
+    
     bypass = AmplifySSRBypass()
-    result = bypass.execute_bypass()
+    if args.revert:
+        result = {"status": "reverted", "paths": bypass.transaction.revert()}
+    else:
+        result = bypass.execute_bypass(use_cache=not args.no_cache)
     print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -290,6 +290,13 @@ export default function EmbeddedFireMap({ onFireSelect }: EmbeddedFireMapProps)
       street: streetLayer
     };
 
+    // Precomputed density heat layer (tile_pyramid.py); empty areas have no tile
+    L.tileLayer('/tiles/density/{z}/{x}/{y}.png', {
+      minZoom: 4,
+      maxZoom: 8,
+      opacity: 0.8
+    }).addTo(map);
+
     // Create layer group for fire data
     layerGroupRef.current = L.layerGroup().addTo(map);
 
@@ -0,0 +1,79 @@
+/**
+ * Binary Snapshot Decoder
+ * Reads the struct-packed fire-snapshot.bin written by binary_snapshot.py with a DataView
+ *
+ * Layout (little-endian):
+ *   header   0 magic "FIRB" | 4 u16 version | 6 u16 record size | 8 u32 record count
+ *            12 u32 string count | 16 u32 records offset | 20 u32 string offsets offset
+ *            24 u32 string data offset | 28 u32 generated (unix seconds)
+ *   record   0 f32 lat | 4 f32 lng | 8 u32 acres | 12 u32 id | 16 u32 name | 20 u32 county
+ *            24 u16 started day since epoch (0xFFFF unknown) | 26 u8 containment
+ *            27 u8 status (bits 0-1) + evacuation_orders (bit 2)
+ *   strings  u32[string count + 1] offsets into UTF-8 string data
+ */
+
+import type { FireIncident } from './calFireGeoJson';
+
+const MAGIC = 'FIRB';
+const FORMAT_VERSION = 1;
+const RECORD_SIZE = 28;
+const UNKNOWN_DAY = 0xffff;
+const STATUSES: FireIncident['status'][] = ['Active', 'Contained', 'Controlled'];
+
+export interface BinarySnapshot {
+  generated: string | null;
+  incidents: FireIncident[];
+}
+
+export function decodeBinarySnapshot(buffer: ArrayBuffer): BinarySnapshot {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== MAGIC || view.getUint16(4, true) !== FORMAT_VERSION || view.getUint16(6, true) !== RECORD_SIZE) {
+    throw new Error('Unsupported binary snapshot');
+  }
+
+  const count = view.getUint32(8, true);
+  const stringCount = view.getUint32(12, true);
+  const recordsOffset = view.getUint32(16, true);
+  const offsetsOffset = view.getUint32(20, true);
+  const stringsOffset = view.getUint32(24, true);
+  const generated = view.getUint32(28, true);
+
+  // Decode the string table once; records refer to it by index
+  const decoder = new TextDecoder();
+  const bytes = new Uint8Array(buffer);
+  const strings: string[] = new Array(stringCount);
+  for (let i = 0; i < stringCount; i++) {
+    const start = stringsOffset + view.getUint32(offsetsOffset + i * 4, true);
+    const end = stringsOffset + view.getUint32(offsetsOffset + (i + 1) * 4, true);
+    strings[i] = decoder.decode(bytes.subarray(start, end));
+  }
+
+  const incidents: FireIncident[] = new Array(count);
+  for (let i = 0; i < count; i++) {
+    const at = recordsOffset + i * RECORD_SIZE;
+    const day = view.getUint16(at + 24, true);
+    const flags = view.getUint8(at + 27);
+
+    const incident: FireIncident = {
+      id: strings[view.getUint32(at + 12, true)],
+      name: strings[view.getUint32(at + 16, true)],
+      county: strings[view.getUint32(at + 20, true)],
+      lat: view.getFloat32(at, true),
+      lng: view.getFloat32(at + 4, true),
+      acres: view.getUint32(at + 8, true),
+      containment: view.getUint8(at + 26),
+      status: STATUSES[flags & 0x03],
+      evacuation_orders: (flags & 0x04) !== 0
+    };
+    if (day !== UNKNOWN_DAY) {
+      incident.started_date = new Date(day * 86400000).toISOString().slice(0, 10);
+    }
+    incidents[i] = incident;
+  }
+
+  return {
+    generated: generated ? new Date(generated * 1000).toISOString() : null,
+    incidents
+  };
+}
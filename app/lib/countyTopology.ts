@@ -0,0 +1,84 @@
+/**
+ * County Topology Decoder
+ * Decodes the quantized, delta-encoded TopoJSON written by county_geometry_encoder.py
+ */
+
+type Position = [number, number];
+
+interface TopologyGeometry {
+  type: 'Polygon' | 'MultiPolygon';
+  arcs: number[][] | number[][][];
+  properties: Record<string, unknown>;
+}
+
+export interface CountyTopology {
+  type: 'Topology';
+  transform: { scale: [number, number]; translate: [number, number] };
+  objects: { counties: { type: 'GeometryCollection'; geometries: TopologyGeometry[] } };
+  arcs: Position[][];
+}
+
+export interface CountyFeatureCollection {
+  type: 'FeatureCollection';
+  features: {
+    type: 'Feature';
+    properties: Record<string, unknown>;
+    geometry: { type: 'Polygon' | 'MultiPolygon'; coordinates: Position[][] | Position[][][] };
+  }[];
+}
+
+/**
+ * Convert every delta-encoded arc to absolute coordinates once
+ */
+function decodeArcs(topology: CountyTopology): Position[][] {
+  const [sx, sy] = topology.transform.scale;
+  const [tx, ty] = topology.transform.translate;
+
+  return topology.arcs.map(arc => {
+    let x = 0;
+    let y = 0;
+    return arc.map(([dx, dy]) => {
+      x += dx;
+      y += dy;
+      return [x * sx + tx, y * sy + ty] as Position;
+    });
+  });
+}
+
+/**
+ * Stitch arc references into a closed ring (~i means arc i reversed)
+ */
+function decodeRing(arcIndexes: number[], arcs: Position[][]): Position[] {
+  const ring: Position[] = [];
+  arcIndexes.forEach((index, i) => {
+    const arc = index < 0 ? arcs[~index].slice().reverse() : arcs[index];
+    ring.push(...(i === 0 ? arc : arc.slice(1)));
+  });
+  return ring;
+}
+
+/**
+ * Decode a county topology into a GeoJSON FeatureCollection
+ */
+export function decodeCountyTopology(topology: CountyTopology): CountyFeatureCollection {
+  const arcs = decodeArcs(topology);
+
+  return {
+    type: 'FeatureCollection',
+    features: topology.objects.counties.geometries.map(geometry => ({
+      type: 'Feature' as const,
+      properties: geometry.properties,
+      geometry: geometry.type === 'Polygon'
+        ? {
+            type: 'Polygon' as const,
+            coordinates: (geometry.arcs as number[][]).map(ring => decodeRing(ring, arcs))
+          }
+        : {
+            type: 'MultiPolygon' as const,
+            coordinates: (geometry.arcs as number[][][]).map(polygon =>
+              polygon.map(ring => decodeRing(ring, arcs))
+            )
+          }
+    }))
+  };
+}
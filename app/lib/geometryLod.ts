@@ -0,0 +1,26 @@
+/**
+ * Geometry Level-of-Detail Picker
+ * Chooses the simplified GeoJSON written by geometry_simplifier.py for a map zoom
+ */
+
+export interface GeometryLodLevel {
+  maxZoom: number;
+  tolerance: number;
+  file: string;
+  vertices: number;
+  bytes: number;
+}
+
+export interface GeometryLodIndex {
+  method: string;
+  pixels: number;
+  assets: Record<string, { source: string; vertices: number; levels: GeometryLodLevel[] }>;
+}
+
+/**
+ * Coarsest level that is still exact at this zoom, or null for full detail
+ */
+export function pickLodLevel(index: GeometryLodIndex, asset: string, zoom: number): GeometryLodLevel | null {
+  const levels = index.assets[asset]?.levels ?? [];
+  return levels.find(level => zoom <= level.maxZoom) ?? null;
+}
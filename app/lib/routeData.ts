@@ -0,0 +1,63 @@
+/**
+ * Route Data Loader
+ * Fetches the per-incident and per-county JSON written by route_data_generator.py
+ */
+
+import type { FireIncident } from './calFireGeoJson';
+
+export interface IncidentRouteData {
+  incident: FireIncident;
+  county: string;
+  perimeters: { type: 'FeatureCollection'; features: unknown[] };
+}
+
+export interface CountyRouteData {
+  name: string;
+  fips: string | null;
+  incidents: (Pick<FireIncident, 'id' | 'name' | 'acres' | 'containment' | 'status' | 'started_date'> & { data: string })[];
+  totals: { incidents: number; active: number; total_acres: number; max_containment_gap: number };
+}
+
+/**
+ * File stem for an id or county name (mirrors slugify in route_data_generator.py)
+ */
+export function routeDataSlug(value: string): string {
+  return value.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '') || 'unknown';
+}
+
+async function fetchRouteData<T>(path: string): Promise<T | null> {
+  try {
+    const response = await fetch(path);
+    return response.ok ? (await response.json()) as T : null;
+  } catch {
+    return null;
+  }
+}
+
+export interface RouteDataIndex {
+  generated: string | null;
+  counties: Record<string, string>;
+  incidents: Record<string, string>;
+}
+
+let indexRequest: Promise<RouteDataIndex | null> | null = null;
+
+export function fetchRouteDataIndex(): Promise<RouteDataIndex | null> {
+  if (!indexRequest) {
+    indexRequest = fetchRouteData<RouteDataIndex>('/data/index.json');
+  }
+  return indexRequest;
+}
+
+/**
+ * Ids whose slugs collide get a hashed suffix, so resolve the file through the index
+ */
+export async function fetchIncidentRouteData(id: string): Promise<IncidentRouteData | null> {
+  const index = await fetchRouteDataIndex();
+  const path = index?.incidents[id] ?? `/data/incidents/${routeDataSlug(id)}.json`;
+  return fetchRouteData<IncidentRouteData>(path);
+}
+
+export function fetchCountyRouteData(county: string): Promise<CountyRouteData | null> {
+  return fetchRouteData<CountyRouteData>(`/data/counties/${routeDataSlug(county)}.json`);
+}
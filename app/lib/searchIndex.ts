@@ -0,0 +1,110 @@
+/**
+ * Search Index Lookup
+ * Queries the prefix/trigram index written by search_index_builder.py
+ */
+
+export interface SearchIndex {
+  version: number;
+  fields: string[];
+  indexed: string[];
+  docs: (string | number)[][];
+  prefix: Record<string, number[]>;
+  trigram: Record<string, number[]>;
+}
+
+export type SearchResult = Record<string, string | number>;
+
+let indexPromise: Promise<SearchIndex | null> | null = null;
+
+/**
+ * Fetch the index once; later calls share the same request
+ */
+export function loadSearchIndex(url = '/data/search-index.json'): Promise<SearchIndex | null> {
+  if (!indexPromise) {
+    indexPromise = fetch(url)
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return indexPromise;
+}
+
+function normalize(text: unknown): string {
+  return (String(text ?? '').toLowerCase().match(/[a-z0-9]+/g) || []).join(' ');
+}
+
+function trigrams(text: string): string[] {
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= text.length; i++) grams.add(text.slice(i, i + 3));
+  return [...grams];
+}
+
+const decoded = new WeakMap<number[], number[]>();
+
+/**
+ * Posting lists are stored as first doc id plus gaps; decode each once
+ */
+function postingsFor(table: Record<string, number[]>, key: string): number[] {
+  const gaps = table[key];
+  if (!gaps) return [];
+  let postings = decoded.get(gaps);
+  if (!postings) {
+    postings = new Array(gaps.length);
+    let docId = 0;
+    for (let i = 0; i < gaps.length; i++) {
+      docId += gaps[i];
+      postings[i] = docId;
+    }
+    decoded.set(gaps, postings);
+  }
+  return postings;
+}
+
+function intersect(a: number[], b: number[]): number[] {
+  const result: number[] = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      result.push(a[i]);
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return result;
+}
+
+/**
+ * Incidents whose name, county or cause contain every query token,
+ * largest fires first (same semantics as search() in search_index_builder.py)
+ */
+export function searchIndex(index: SearchIndex, query: string, limit = 20): SearchResult[] {
+  const tokens = normalize(query).split(' ').filter(Boolean);
+  if (tokens.length === 0) return [];
+
+  let candidates: number[] | null = null;
+  for (const token of tokens) {
+    const table = token.length >= 3 ? index.trigram : index.prefix;
+    const keys = token.length >= 3 ? trigrams(token) : [token];
+    for (const key of keys) {
+      const postings = postingsFor(table, key);
+      candidates = candidates === null ? postings : intersect(candidates, postings);
+      if (candidates.length === 0) return [];
+    }
+  }
+
+  const positions = index.indexed.map(field => index.fields.indexOf(field));
+  const results: SearchResult[] = [];
+  for (const docId of candidates || []) {
+    const doc = index.docs[docId];
+    const haystack = positions.map(position => normalize(doc[position])).join(' ');
+    if (tokens.every(token => haystack.includes(token))) {
+      results.push(Object.fromEntries(index.fields.map((field, i) => [field, doc[i]])));
+      if (results.length >= limit) break;
+    }
+  }
+  return results;
+}
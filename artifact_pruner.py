@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+ARTIFACT PRUNER
+Shrinks the .next deployment bundle before Amplify uploads it
+
+Computes the reachable set from the manifests, trace files, stylesheets and
+exported pages, finds duplicate content by hash, then removes unreachable files
+and the build-side static/ copies of assets the export already ships under
+_next/static/. Prints the bytes saved before upload. Traces and import scanning
+only see string-literal references, so runtime-loaded files (webpack chunks
+fetched by id, JS manifests, package.json) are kept through an explicit
+keep-list rather than trusted to the walk.
+
+Modes:
+  remove    delete unreachable files and mirrored static/ duplicates (default)
+  hardlink  delete nothing, hardlink every duplicate group; this only saves
+            local disk space, the upload archive stores each path in full
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+
+from build_reproducibility import build_timestamp
+from directory_stats import format_bytes
+from nft_trace_generator import NftTraceGenerator
+
+# Files that are roots of the reachable set wherever they appear
+ROOT_FILENAMES = {
+    'BUILD_ID',
+    'trace',
+    'build-trace.json',
+    'required-server-files.json'
+}
+ROOT_SUFFIXES = ('-manifest.json', '.nft.json', '.html', '.txt')
+
+# Loaded at runtime in ways no trace records (e.g. require("./chunks/" + id));
+# matched against the path relative to the base dir
+KEEP_PATTERNS = [
+    'package.json',
+    '*/package.json',
+    '*-manifest.js',
+    '*_client-reference-manifest.js',
+    '*webpack-runtime.js',
+    '*webpack-api-runtime.js',
+    'server/chunks/*'
+]
+
+# Build-side directory the export mirrors byte for byte: static/<x> == _next/static/<x>
+MIRRORED_PREFIXES = {'static/': '_next/static/'}
+
+# Manifests listing assets relative to the dist dir / server dir
+DIST_RELATIVE_MANIFESTS = ['build-manifest.json', 'app-build-manifest.json']
+SERVER_RELATIVE_MANIFESTS = ['pages-manifest.json', 'app-paths-manifest.json']
+
+_ASSET_REF_RE = re.compile(r'''(?:src|href)=["']/([^"'?#]+)|["'(](/_next/[^"'\\)?#\s]+)''')
+_CSS_URL_RE = re.compile(r'''url\(\s*["']?([^"')?#]+)''')
+
+
+def _collect_strings(value):
+    """Flatten every string inside a JSON value"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _collect_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _collect_strings(item)
+
+
+class ArtifactPruner:
+    """Remove unreachable files and deduplicate the deployment bundle"""
+
+    def __init__(self, base_dir=".next", export_dir="out", mode="remove", dry_run=False):
+        self.base_dir = os.path.abspath(base_dir)
+        self.export_dir = os.path.abspath(export_dir)
+        self.mode = mode
+        self.dry_run = dry_run
+        self.pruner_id = "Artifact-Pruner-v1"
+        self.tracer = NftTraceGenerator(static_root=base_dir)
+        self.mutations = []
+
+    def log_mutation(self, action, target, size, canonical=None):
+        """Log every removal or hardlink for the forensic audit trail"""
+        mutation = {
+            "timestamp": build_timestamp(),
+            "action": action,
+            "target": os.path.relpath(target),
+            "bytes": size
+        }
+        if canonical:
+            mutation["canonical"] = os.path.relpath(canonical)
+        self.mutations.append(mutation)
+
+    def list_files(self):
+        """Map every regular file under the base dir to its stat result"""
+        files = {}
+        stack = [self.base_dir]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files[entry.path] = entry.stat(follow_symlinks=False)
+        return files
+
+    def _exported_paths(self, files):
+        """Files copied into the base dir from the static export"""
+        exported = set()
+        if not os.path.isdir(self.export_dir):
+            return exported
+        for dir_path, dir_names, filenames in os.walk(self.export_dir):
+            # cp -r out/* skips hidden entries such as out/.next
+            if dir_path == self.export_dir:
+                dir_names[:] = [d for d in dir_names if not d.startswith('.')]
+                filenames = [f for f in filenames if not f.startswith('.')]
+            rel_dir = os.path.relpath(dir_path, self.export_dir)
+            for filename in filenames:
+                candidate = os.path.normpath(os.path.join(self.base_dir, rel_dir, filename))
+                if candidate in files:
+                    exported.add(candidate)
+        return exported
+
+    def _load_json(self, path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _references(self, path):
+        """Files referenced by a manifest, trace, page or script"""
+        name = os.path.basename(path)
+        directory = os.path.dirname(path)
+        references = []
+
+        if name in DIST_RELATIVE_MANIFESTS or name in SERVER_RELATIVE_MANIFESTS:
+            data = self._load_json(path)
+            if name in DIST_RELATIVE_MANIFESTS:
+                relative_to = self.base_dir
+            else:
+                relative_to = os.path.join(self.base_dir, 'server')
+            for value in _collect_strings(data):
+                references.append(os.path.normpath(os.path.join(relative_to, value)))
+        elif name.endswith('.nft.json'):
+            data = self._load_json(path) or {}
+            for value in data.get('files', []):
+                references.append(os.path.normpath(os.path.join(directory, value)))
+            references.append(path[:-len('.nft.json')])
+        elif name.endswith('.css'):
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            except OSError:
+                content = ''
+            for match in _CSS_URL_RE.finditer(content):
+                reference = match.group(1).strip()
+                if reference.startswith('data:') or '://' in reference:
+                    continue
+                if reference.startswith('/'):
+                    references.append(os.path.normpath(os.path.join(self.base_dir, reference.lstrip('/'))))
+                else:
+                    references.append(os.path.normpath(os.path.join(directory, reference)))
+        elif name.endswith(('.html', '.txt')):
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            except OSError:
+                content = ''
+            for match in _ASSET_REF_RE.finditer(content):
+                reference = match.group(1) or match.group(2).lstrip('/')
+                references.append(os.path.normpath(os.path.join(self.base_dir, reference)))
+        else:
+            references.extend(self.tracer.module_dependencies(path))
+
+        return references
+
+    def compute_reachable(self, files):
+        """Walk references outwards from the manifest and page roots"""
+        roots = self._exported_paths(files)
+        for path in files:
+            name = os.path.basename(path)
+            rel_path = os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+            if name in ROOT_FILENAMES or name.endswith(ROOT_SUFFIXES) \
+                    or any(fnmatch.fnmatch(rel_path, pattern) for pattern in KEEP_PATTERNS):
+                roots.add(path)
+
+        reachable = set()
+        stack = [path for path in roots if path in files]
+        while stack:
+            path = stack.pop()
+            if path in reachable:
+                continue
+            reachable.add(path)
+            for reference in self._references(path):
+                if reference in files and reference not in reachable:
+                    stack.append(reference)
+        return reachable
+
+    def _content_hash(self, path):
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def find_duplicates(self, files, candidates):
+        """Group candidate files with identical content"""
+        by_size = {}
+        for path in candidates:
+            stat = files[path]
+            if stat.st_size > 0:
+                by_size.setdefault(stat.st_size, []).append(path)
+
+        groups = []
+        for paths in by_size.values():
+            if len(paths) < 2:
+                continue
+            by_hash = {}
+            for path in paths:
+                by_hash.setdefault(self._content_hash(path), []).append(path)
+            groups.extend(sorted(group) for group in by_hash.values() if len(group) > 1)
+        return groups
+
+    def mirrored_duplicates(self, files, exported, groups):
+        """Build-side copies whose exported mirror is in the same duplicate group"""
+        removable = []
+        for group in groups:
+            members = set(group)
+            for path in group:
+                rel_path = os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+                for prefix, mirror in MIRRORED_PREFIXES.items():
+                    if not rel_path.startswith(prefix):
+                        continue
+                    twin = os.path.join(self.base_dir, mirror + rel_path[len(prefix):])
+                    if twin in members and twin in exported:
+                        removable.append((path, twin))
+        return removable
+
+    def _hardlink(self, canonical, duplicate):
+        """Atomically replace a duplicate with a hardlink to the canonical copy"""
+        temp_path = f"{duplicate}.prune-link"
+        os.link(canonical, temp_path)
+        os.replace(temp_path, duplicate)
+
+    def prune(self):
+        """Remove unreachable files and deduplicate what remains"""
+        print(f"[{self.pruner_id}] Pruning {os.path.relpath(self.base_dir)} ({self.mode})...")
+
+        report = {
+            "pruner_id": self.pruner_id,
+            "base_dir": os.path.relpath(self.base_dir),
+            "mode": self.mode,
+            "dry_run": self.dry_run,
+            "status": "PENDING"
+        }
+
+        if not os.path.isdir(self.base_dir):
+            report["status"] = "BASE_DIR_NOT_FOUND"
+            return report
+
+        files = self.list_files()
+        total_bytes = sum(stat.st_size for stat in files.values())
+        reachable = self.compute_reachable(files)
+
+        removed_bytes = 0
+        deduplicated_bytes = 0
+        linked_bytes = 0
+        remaining = set(files)
+        if self.mode == "remove":
+            for path in sorted(set(files) - reachable):
+                size = files[path].st_size
+                if not self.dry_run:
+                    os.remove(path)
+                remaining.discard(path)
+                removed_bytes += size
+                self.log_mutation("REMOVE_UNREACHABLE", path, size)
+
+            exported = self._exported_paths(files)
+            groups = self.find_duplicates(files, remaining)
+            for path, twin in sorted(self.mirrored_duplicates(files, exported, groups)):
+                size = files[path].st_size
+                if not self.dry_run:
+                    os.remove(path)
+                remaining.discard(path)
+                deduplicated_bytes += size
+                self.log_mutation("REMOVE_DUPLICATE", path, size, twin)
+
+        # Hardlinks share one inode: only for local runs, never before a later in-place writer
+        for group in self.find_duplicates(files, remaining) if self.mode == "hardlink" else ():
+            canonical = group[0]
+            canonical_stat = files[canonical]
+            for duplicate in group[1:]:
+                stat = files[duplicate]
+                if (stat.st_dev, stat.st_ino) == (canonical_stat.st_dev, canonical_stat.st_ino):
+                    continue
+                if not self.dry_run:
+                    self._hardlink(canonical, duplicate)
+                linked_bytes += stat.st_size
+                self.log_mutation("HARDLINK_DUPLICATE", duplicate, stat.st_size, canonical)
+
+        report.update({
+            "status": "COMPLETE",
+            "files_scanned": len(files),
+            "files_reachable": len(reachable),
+            "bytes_before": total_bytes,
+            "bytes_removed": removed_bytes,
+            "bytes_deduplicated": deduplicated_bytes,
+            "bytes_hardlinked": linked_bytes,
+            # Hardlinks do not shrink the uploaded archive, only the disk footprint
+            "bytes_after": total_bytes - removed_bytes - deduplicated_bytes,
+            "total_mutations": len(self.mutations)
+        })
+
+        print(f"[PRUNE] {len(files)} files scanned, {len(reachable)} reachable")
+        print(f"[PRUNE] Removed {format_bytes(removed_bytes)} unreachable and "
+              f"{format_bytes(deduplicated_bytes)} duplicate, hardlinked {format_bytes(linked_bytes)}")
+        print(f"[PRUNE] Bytes saved before upload: {removed_bytes + deduplicated_bytes} "
+              f"(+{linked_bytes} hardlinked on disk only, "
+              f"{format_bytes(total_bytes)} -> {format_bytes(report['bytes_after'])})")
+
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune the deployment bundle before upload")
+    parser.add_argument("--base-dir", default=".next")
+    parser.add_argument("--export-dir", default="out")
+    parser.add_argument("--mode", choices=["remove", "hardlink"], default="remove")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    pruner = ArtifactPruner(args.base_dir, args.export_dir, args.mode, args.dry_run)
+    result = pruner.prune()
+    print(json.dumps(result, indent=2))
@@ -13,19 +13,24 @@ technical authorship. AI tools supported the process, but the responsibility,
 modularity, and mutation awareness logic are my own.
 """
 
+import argparse
+import fnmatch
 import json
 import os
 import re
 import shutil
+import time
 from pathlib import Path
-from datetime import datetime
 import hashlib
 
+from build_reproducibility import build_timestamp, json_options, run_log_name
+
 class ArtifactValidityWrapper:
     """Validates and sanitizes all build artifacts against SSR contamination"""
     
     def __init__(self):
         self.ssr_free_schema = self.load_ssr_free_schema()
+        self.scan_policy = self.load_scan_policy()
         self.violation_log = []
         self.sanitized_count = 0
         self.wrapper_id = "Static-Compliance-Wrapper-v1"
@@ -72,6 +77,99 @@ class ArtifactValidityWrapper:
             ]
         }
         
+    def load_scan_policy(self, policy_path=None):
+        """Roots to scan with include/exclude globs, size cap and extension allowlist"""
+        policy = {
+            # Only these can carry the forbidden patterns; forbidden file names are always checked
+            "extensions": [".js", ".jsx", ".ts", ".tsx", ".mjs"],
+            "max_file_size": 5 * 1024 * 1024,
+            "roots": {
+                "out": {
+                    "include": ["**"],
+                    "exclude": ["data/**", "tiles/**", "_next/static/media/**", "**/*.map"]
+                },
+                # Built route chunks are reported, never rewritten in place; the Next.js
+                # runtime (webpack runtimes, shared chunks, manifests, built-in pages) is
+                # framework code that always mentions next/server, so it is left out
+                ".next/server": {
+                    "include": ["app/**", "pages/**", "middleware.js"],
+                    "exclude": ["**/*.map", "chunks/**", "**/*-manifest.js", "app/_not-found/**",
+                                "pages/_app.js", "pages/_document.js", "pages/_error.js"],
+                    "report_only": True
+                },
+                ".next/static": {
+                    "include": ["**"],
+                    "exclude": ["media/**", "css/**", "**/*.map", "chunks/framework-*.js",
+                                "chunks/main-*.js", "chunks/webpack-*.js", "chunks/polyfills-*.js"]
+                }
+            }
+        }
+        if policy_path:
+            with open(policy_path, 'r') as f:
+                overrides = json.load(f)
+            # Roots merge one by one, so overriding one root's excludes keeps the others; null drops a root
+            for root, rules in overrides.pop("roots", {}).items():
+                if rules is None:
+                    policy["roots"].pop(root, None)
+                else:
+                    policy["roots"].setdefault(root, {}).update(rules)
+            policy.update(overrides)
+        return policy
+        
+    def _policy_match(self, rel_path, patterns):
+        """Glob match where 'dir/**' covers the directory itself and '**/x' matches at the root"""
+        return any(fnmatch.fnmatch(rel_path, pattern)
+                   or (pattern.endswith('/**') and fnmatch.fnmatch(rel_path, pattern[:-3]))
+                   or (pattern.startswith('**/') and fnmatch.fnmatch(rel_path, pattern[3:]))
+                   for pattern in patterns)
+        
+    def iter_policy_files(self, root, rules, stats):
+        """Files under root that the policy selects; excluded subtrees are never entered"""
+        include = rules.get("include", ["**"])
+        exclude = rules.get("exclude", [])
+        extensions = tuple(self.scan_policy["extensions"])
+        forbidden = set(self.ssr_free_schema["forbidden_files"])
+        max_size = self.scan_policy.get("max_file_size")
+        
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            try:
+                entries = sorted(os.scandir(os.path.join(root, rel_dir)), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name).replace(os.sep, '/')
+                # d_type answers is_dir() here, so pruned directories cost no stat
+                if entry.is_dir(follow_symlinks=False):
+                    if self._policy_match(rel_path, exclude):
+                        stats["pruned_dirs"] += 1
+                    else:
+                        pending.append(rel_path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                # Name rules first; only a file that passes them is stat()ed for the size cap
+                if self._policy_match(rel_path, exclude) or not self._policy_match(rel_path, include):
+                    reason = "excluded"
+                elif not entry.name.endswith(extensions) and entry.name not in forbidden:
+                    reason = "extension"
+                else:
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        # Vanished or unreadable mid-walk
+                        reason = "unreadable"
+                    else:
+                        if not max_size or size <= max_size:
+                            stats["files_scanned"] += 1
+                            stats["bytes_scanned"] += size
+                            yield entry.path
+                            continue
+                        reason = "size"
+                        stats["bytes_skipped"] += size
+                stats["skipped"][reason] = stats["skipped"].get(reason, 0) + 1
+        
     def validate_artifact(self, filepath):
         """Check artifact for SSR contamination"""
         violations = []
@@ -184,40 +282,57 @@ class ArtifactValidityWrapper:
                 
         return mutations
         
-    def validate_build_output(self, output_dir="out"):
-        """Validate entire build output for static compliance"""
+    def validate_build_output(self, output_dir=None):
+        """Validate every policy root (or just output_dir) for static compliance"""
+        roots = self.scan_policy["roots"]
+        if output_dir is not None:
+            roots = {output_dir: roots.get(output_dir, {"include": ["**"], "exclude": []})}
+            
         validation_report = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "wrapper_id": self.wrapper_id,
             "output_dir": output_dir,
+            "policy_roots": sorted(roots),
+            "roots": {},
             "violations": [],
             "sanitizations": [],
             "status": "PENDING"
         }
         
-        output_path = Path(output_dir)
-        
-        if not output_path.exists():
+        existing = {root: rules for root, rules in roots.items() if Path(root).exists()}
+        if not existing:
             validation_report["status"] = "OUTPUT_DIR_NOT_FOUND"
             return validation_report
             
-        # Scan all files
-        for file_path in output_path.rglob("*"):
-            if file_path.is_file():
+        # Scan only what the policy selects
+        for root, rules in existing.items():
+            started = time.perf_counter()
+            report_only = bool(rules.get("report_only"))
+            stats = {"files_scanned": 0, "bytes_scanned": 0, "bytes_skipped": 0,
+                     "pruned_dirs": 0, "skipped": {}, "violations": 0, "report_only": report_only}
+            for file_path in self.iter_policy_files(root, rules, stats):
                 # Validate
                 violations = self.validate_artifact(file_path)
                 if violations:
                     validation_report["violations"].extend(violations)
+                    stats["violations"] += len(violations)
                     
                 # Sanitize if needed
-                if violations:
+                if violations and not report_only:
                     mutations = self.strip_ssr_logic(file_path)
                     validation_report["sanitizations"].extend(mutations)
                     
+            stats["seconds"] = round(time.perf_counter() - started, 3)
+            validation_report["roots"][root] = stats
+            print(f"[WRAPPER] {root}: scanned {stats['files_scanned']} files "
+                  f"({stats['bytes_scanned']} bytes), skipped {sum(stats['skipped'].values())} "
+                  f"({stats['bytes_skipped']} bytes over the size cap) and {stats['pruned_dirs']} subtrees "
+                  f"in {stats['seconds']}s")
+                    
         # Determine final status
         if validation_report["violations"]:
             validation_report["status"] = "CONTAMINATED"
-            validation_report["action"] = "SANITIZED"
+            validation_report["action"] = "SANITIZED" if validation_report["sanitizations"] else "REPORTED"
         else:
             validation_report["status"] = "CLEAN"
             
@@ -229,7 +344,7 @@ class ArtifactValidityWrapper:
     def log_contradiction(self, artifact, expected, observed):
         """Log SSR recurrence as contradiction artifact"""
         contradiction = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "artifact": artifact,
             "expected_state": expected,
             "observed_state": observed,
@@ -246,9 +361,9 @@ class ArtifactValidityWrapper:
         self.violation_log.append(contradiction)
         
         # Save to file
-        log_file = f"contradiction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        log_file = run_log_name("contradiction", self.wrapper_id)
         with open(log_file, 'w') as f:
-            json.dump(contradiction, f, indent=2)
+            json.dump(contradiction, f, **json_options(indent=2))
             
         return log_file
         
@@ -256,7 +371,7 @@ class ArtifactValidityWrapper:
         """Generate comprehensive mutation log in JSON format"""
         log_data = {
             "wrapper_id": self.wrapper_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "ssr_free_schema": self.ssr_free_schema,
             "total_sanitized": self.sanitized_count,
             "violations": self.violation_log,
@@ -267,9 +382,9 @@ class ArtifactValidityWrapper:
             }
         }
         
-        log_file = f"mutation_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        log_file = run_log_name("mutation_log", self.wrapper_id)
         with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+            json.dump(log_data, f, **json_options(indent=2))
             
         return log_file
         
@@ -297,6 +412,12 @@ class ArtifactValidityWrapper:
         return report
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and sanitize build output for static compliance")
+    parser.add_argument("--policy", help="JSON file overriding the scan policy (roots merge per root; extensions, max_file_size)")
+    args = parser.parse_args()
+    
     wrapper = ArtifactValidityWrapper()
+    if args.policy:
+        wrapper.scan_policy = wrapper.load_scan_policy(args.policy)
     result = wrapper.enforce_static_compliance()
     print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+ASSET FINGERPRINTER
+Content-hash fingerprints and cache header rules for the static export
+
+Next already content-hashes everything under _next/static, so those URLs are
+served as immutable. Public assets such as california-counties.geojson keep
+their plain URL, which is what the app fetches, with a short max-age and a
+content-hash ETag so a revalidation costs a 304 instead of the body. JSON
+under /data and the generated tiles get one pattern rule each instead of
+per-file rules. HTML is always revalidated.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, max-age=0, must-revalidate"
+DATA_CACHE = "public, max-age=300, must-revalidate"
+
+FINGERPRINT_EXTENSIONS = ('.geojson', '.svg', '.png', '.jpg', '.webp', '.ico', '.woff2')
+HTML_EXTENSIONS = ('.html',)
+SKIP_EXTENSIONS = ('.gz', '.br')
+HASH_LENGTH = 12
+
+# Top-level export directories that get pattern rules instead of per-file ones
+PATTERN_RULE_DIRS = ('_next', 'tiles')
+PATTERN_HEADER_RULES = {
+    "/_next/static/(.*)": [
+        {"key": "Cache-Control", "value": IMMUTABLE_CACHE}
+    ],
+    "/data/(.*)\\.json": [
+        {"key": "Cache-Control", "value": DATA_CACHE}
+    ],
+    "/tiles/(.*)": [
+        {"key": "Cache-Control", "value": DATA_CACHE}
+    ]
+}
+
+
+def content_hash(path):
+    """Short content hash used for fingerprints and ETags"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def _route_regex(rel_path):
+    """Exact-match route pattern for a file served from the export root"""
+    return "/" + re.escape(rel_path.replace(os.sep, "/"))
+
+
+class AssetFingerprinter:
+    """Fingerprint exported files and derive cache header rules"""
+
+    def __init__(self, root="out"):
+        self.root = root
+        self.fingerprints = {}
+
+    def scan(self):
+        """Hash every exported file that cache rules apply to"""
+        self.fingerprints = {}
+        for dir_path, dir_names, filenames in os.walk(self.root):
+            rel_dir = os.path.relpath(dir_path, self.root)
+            if rel_dir == '.':
+                # Hidden scaffolding (out/.next), hashed Next assets and generated
+                # tiles are not fingerprinted
+                dir_names[:] = [d for d in dir_names if not d.startswith('.') and d not in PATTERN_RULE_DIRS]
+            for filename in filenames:
+                if filename.endswith(SKIP_EXTENSIONS):
+                    continue
+                if filename.endswith(FINGERPRINT_EXTENSIONS + HTML_EXTENSIONS):
+                    rel_path = os.path.normpath(os.path.join(rel_dir, filename))
+                    self.fingerprints[rel_path] = content_hash(os.path.join(self.root, rel_path))
+        return self.fingerprints
+
+    def header_rules(self):
+        """Routes-manifest header entries keyed by route pattern"""
+        headers = dict(PATTERN_HEADER_RULES)
+        for rel_path, digest in sorted(self.fingerprints.items()):
+            etag = {"key": "ETag", "value": f'"{digest}"'}
+            if rel_path.endswith(HTML_EXTENSIONS):
+                html_headers = [
+                    {"key": "Cache-Control", "value": REVALIDATE_CACHE},
+                    etag
+                ]
+                headers[_route_regex(rel_path)] = html_headers
+                # trailingSlash export serves dir/index.html at /dir/
+                if os.path.basename(rel_path) == "index.html":
+                    directory = os.path.dirname(rel_path)
+                    headers[_route_regex(directory + "/" if directory else "")] = html_headers
+            else:
+                headers[_route_regex(rel_path)] = [
+                    {"key": "Cache-Control", "value": DATA_CACHE},
+                    etag
+                ]
+        return headers
+
+    def fingerprint_export(self):
+        """Scan the export and return header rules; writes nothing"""
+        if not os.path.isdir(self.root):
+            return {}
+        self.scan()
+        return self.header_rules()
+
+
+if __name__ == "__main__":
+    fingerprinter = AssetFingerprinter()
+    print(json.dumps(fingerprinter.fingerprint_export(), indent=2))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+ASSET PRECOMPRESSOR
+Writes .gz (and .br when brotli is installed) siblings for the static export
+
+The static export is otherwise served uncompressed. Text assets above a size
+threshold are compressed in a process pool; siblings that are already newer
+than their source are skipped, and the compression ratio is reported per
+file type.
+"""
+
+import argparse
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from directory_stats import format_bytes
+
+COMPRESSIBLE_EXTENSIONS = ('.html', '.js', '.css', '.json', '.geojson')
+DEFAULT_MIN_SIZE = 1024
+
+
+def _write_atomic(path, data, source_stat):
+    """Write a compressed sibling and give it the source mtime"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.utime(temp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    os.replace(temp_path, path)
+
+
+def _is_fresh(sibling, source_stat):
+    """A sibling is up to date when it is at least as new as its source"""
+    try:
+        return os.stat(sibling).st_mtime_ns >= source_stat.st_mtime_ns
+    except OSError:
+        return False
+
+
+def compress_file(path):
+    """Compress one file, returning per-encoding byte counts"""
+    source_stat = os.stat(path)
+    result = {"path": path, "original": source_stat.st_size, "encodings": {}, "skipped": []}
+
+    encoders = [('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('br', '.br', lambda data: brotli.compress(data, quality=11)))
+
+    data = None
+    for encoding, suffix, encode in encoders:
+        sibling = path + suffix
+        if _is_fresh(sibling, source_stat):
+            result["encodings"][encoding] = os.path.getsize(sibling)
+            result["skipped"].append(encoding)
+            continue
+
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = encode(data)
+
+        # A sibling larger than the source is never worth serving
+        if len(compressed) >= len(data):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+
+        _write_atomic(sibling, compressed, source_stat)
+        result["encodings"][encoding] = len(compressed)
+
+    return result
+
+
+def find_candidates(root, min_size=DEFAULT_MIN_SIZE):
+    """Compressible files under root at or above the size threshold"""
+    candidates = []
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif (entry.name.endswith(COMPRESSIBLE_EXTENSIONS)
+                      and entry.is_file(follow_symlinks=False)
+                      and entry.stat(follow_symlinks=False).st_size >= min_size):
+                    candidates.append(entry.path)
+    return sorted(candidates)
+
+
+def precompress(root="out", min_size=DEFAULT_MIN_SIZE, workers=None):
+    """Precompress every candidate under root and summarize per file type"""
+    print(f"[PRECOMPRESS] Scanning {root} (min size {format_bytes(min_size)}, "
+          f"brotli {'enabled' if brotli is not None else 'unavailable'})...")
+
+    candidates = find_candidates(root, min_size)
+    by_type = {}
+    compressed_count = 0
+    skipped_count = 0
+
+    if candidates:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(compress_file, candidates, chunksize=8):
+                ext = os.path.splitext(result["path"])[1]
+                totals = by_type.setdefault(ext, {"files": 0, "original": 0})
+                totals["files"] += 1
+                totals["original"] += result["original"]
+                for encoding, size in result["encodings"].items():
+                    totals[encoding] = totals.get(encoding, 0) + size
+                skipped_count += len(result["skipped"])
+                compressed_count += len(result["encodings"]) - len(result["skipped"])
+
+    for ext, totals in sorted(by_type.items()):
+        ratios = ", ".join(
+            f"{encoding} {totals[encoding] / totals['original']:.1%}"
+            for encoding in ('gzip', 'br') if encoding in totals
+        )
+        print(f"[PRECOMPRESS] {ext:<9} {totals['files']:>5} files "
+              f"{format_bytes(totals['original']):>8}  {ratios}")
+
+    return {
+        "status": "complete",
+        "root": root,
+        "candidates": len(candidates),
+        "compressed": compressed_count,
+        "up_to_date": skipped_count,
+        "brotli": brotli is not None,
+        "by_type": by_type
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write precompressed siblings for static assets")
+    parser.add_argument("root", nargs="?", default="out")
+    parser.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    result = precompress(args.root, args.min_size, args.workers)
+    print(json.dumps(result, indent=2))
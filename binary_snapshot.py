@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+BINARY SNAPSHOT
+Fixed-width struct-packed incident snapshot with a zero-copy reader
+
+The JSON snapshot repeats every key for every incident. This encoder writes
+public/data/fire-snapshot.bin instead: a 32-byte header, one 28-byte record per
+incident and a deduplicated UTF-8 string table for ids, names and counties.
+BinarySnapshotReader memory-maps the file and views the records as a NumPy
+structured array without copying; app/lib/binarySnapshot.ts reads the same
+layout with a DataView. --compare measures size and parse time against JSON.
+
+Layout (little-endian):
+  header   0  char[4] magic "FIRB"     4  uint16 version      6  uint16 record size
+           8  uint32 record count     12  uint32 string count
+          16  uint32 records offset   20  uint32 string offsets offset
+          24  uint32 string data offset
+          28  uint32 generated (unix seconds, 0 = unknown)
+  record   0  float32 lat   4  float32 lng   (NaN = no location)
+           8  uint32 acres
+          12  uint32 id string   16  uint32 name string   20  uint32 county string
+          24  uint16 started day since 1970-01-01 (0xFFFF = unknown or pre-1970)
+          26  uint8  containment percent
+          27  uint8  bits 0-1 status (Active, Contained, Controlled), bit 2 evacuation_orders
+  strings  uint32[string count + 1] byte offsets into the UTF-8 string data
+"""
+
+import argparse
+import functools
+import gzip
+import json
+import mmap
+import os
+import struct
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+BINARY_PATH = 'public/data/fire-snapshot.bin'
+
+MAGIC = b'FIRB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIII')
+RECORD = struct.Struct('<ffIIIIHBB')
+RECORD_DTYPE = np.dtype([
+    ('lat', '<f4'), ('lng', '<f4'), ('acres', '<u4'),
+    ('id', '<u4'), ('name', '<u4'), ('county', '<u4'),
+    ('started_day', '<u2'), ('containment', 'u1'), ('status', 'u1')
+])
+
+STATUSES = ['Active', 'Contained', 'Controlled']
+EVACUATION_BIT = 0x04
+UNKNOWN_DAY = 0xFFFF
+_EPOCH = date(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _day_iso(day):
+    return (_EPOCH + timedelta(days=day)).isoformat()
+
+
+def _day_number(value):
+    """Days since 1970-01-01, or UNKNOWN_DAY when unparseable or outside uint16"""
+    try:
+        day = (date.fromisoformat((value or '')[:10]) - _EPOCH).days
+    except ValueError:
+        return UNKNOWN_DAY
+    return day if 0 <= day < UNKNOWN_DAY else UNKNOWN_DAY
+
+
+def _unix_seconds(value):
+    try:
+        return int(datetime.fromisoformat((value or '').replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return 0
+
+
+def encode_snapshot(snapshot):
+    """Pack a normalized snapshot into the binary layout"""
+    strings = []
+    string_codes = {}
+
+    def intern(value):
+        value = value or ''
+        if value not in string_codes:
+            string_codes[value] = len(strings)
+            strings.append(value)
+        return string_codes[value]
+
+    records = bytearray()
+    for incident in snapshot.get('incidents', []):
+        status = STATUSES.index(incident['status']) if incident.get('status') in STATUSES else 2
+        if incident.get('evacuation_orders'):
+            status |= EVACUATION_BIT
+        lat, lng = incident.get('lat'), incident.get('lng')
+        records += RECORD.pack(
+            float('nan') if lat is None else lat,
+            float('nan') if lng is None else lng,
+            max(0, min(int(incident.get('acres') or 0), 0xFFFFFFFF)),
+            intern(incident['id']),
+            intern(incident.get('name')),
+            intern(incident.get('county')),
+            _day_number(incident.get('started_date')),
+            max(0, min(int(incident.get('containment') or 0), 100)),
+            status
+        )
+
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+
+    records_offset = HEADER.size
+    offsets_offset = records_offset + len(records)
+    strings_offset = offsets_offset + offsets.nbytes
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, len(records) // RECORD.size,
+                         len(strings), records_offset, offsets_offset, strings_offset,
+                         _unix_seconds(snapshot.get('generated')))
+    return header + bytes(records) + offsets.tobytes() + b''.join(encoded)
+
+
+class BinarySnapshotReader:
+    """Memory-mapped, zero-copy view of a binary snapshot"""
+
+    def __init__(self, path=BINARY_PATH):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, record_size, count, string_count, records_offset,
+         offsets_offset, strings_offset, generated) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} binary snapshot")
+
+        self.generated = generated
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count,
+                                     offset=records_offset)
+        self._offsets = np.frombuffer(self._mmap, dtype='<u4', count=string_count + 1,
+                                      offset=offsets_offset)
+        self._strings_offset = strings_offset
+
+    def __len__(self):
+        return len(self.records)
+
+    def string(self, code):
+        start = self._strings_offset + int(self._offsets[code])
+        end = self._strings_offset + int(self._offsets[code + 1])
+        return self._mmap[start:end].decode('utf-8')
+
+    def _decode(self, record, strings):
+        lat, lng, acres, id_code, name_code, county_code, day, containment, status = record
+        incident = {
+            'id': strings(id_code),
+            'name': strings(name_code),
+            'county': strings(county_code),
+            'lat': None if lat != lat else lat,
+            'lng': None if lng != lng else lng,
+            'acres': acres,
+            'containment': containment,
+            'status': STATUSES[status & 0x03],
+            'evacuation_orders': bool(status & EVACUATION_BIT)
+        }
+        if day != UNKNOWN_DAY:
+            incident['started_date'] = _day_iso(day)
+        return incident
+
+    def incident(self, index):
+        """Decode one record back into the FireIncident subset it stores"""
+        return self._decode(self.records[index].tolist(), self.string)
+
+    def __iter__(self):
+        # Bulk-convert the records and decode each distinct string once
+        decoded = {}
+
+        def strings(code):
+            if code not in decoded:
+                decoded[code] = self.string(code)
+            return decoded[code]
+
+        return (self._decode(record, strings) for record in self.records.tolist())
+
+    def close(self):
+        self.records = self._offsets = None
+        self._mmap.close()
+
+
+def compare(json_path, binary_path, repeat=20):
+    """Size and parse time of the JSON snapshot versus the binary one"""
+    with open(json_path, 'rb') as f:
+        json_bytes = f.read()
+    with open(binary_path, 'rb') as f:
+        binary_bytes = f.read()
+
+    def best(fn):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return round(min(timings) * 1000, 3)
+
+    def read_columns():
+        reader = BinarySnapshotReader(binary_path)
+        total = int(reader.records['acres'].sum())
+        reader.close()
+        return total
+
+    def read_all():
+        reader = BinarySnapshotReader(binary_path)
+        incidents = list(reader)
+        reader.close()
+        return incidents
+
+    return {
+        "json_bytes": len(json_bytes),
+        "json_gzip_bytes": len(gzip.compress(json_bytes, mtime=0)),
+        "binary_bytes": len(binary_bytes),
+        "binary_gzip_bytes": len(gzip.compress(binary_bytes, mtime=0)),
+        "json_parse_ms": best(lambda: json.loads(json_bytes)),
+        "binary_open_and_sum_acres_ms": best(read_columns),
+        "binary_decode_all_ms": best(read_all)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encode the fire snapshot as packed binary")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--output", default=BINARY_PATH)
+    parser.add_argument("--compare", action="store_true", help="Report size and parse time vs JSON")
+    args = parser.parse_args()
+
+    with open(args.snapshot, 'r') as f:
+        snapshot = json.load(f)
+
+    data = encode_snapshot(snapshot)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print(f"[BINARY SNAPSHOT] {len(snapshot.get('incidents', []))} incidents packed into "
+          f"{args.output} ({len(data)} bytes)")
+
+    result = {"output": args.output, "bytes": len(data)}
+    if args.compare:
+        result.update(compare(args.snapshot, args.output))
+    print(json.dumps(result, indent=2))
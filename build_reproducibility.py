@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+BUILD REPRODUCIBILITY
+SOURCE_DATE_EPOCH timestamps plus input and output digests for the build cache
+
+When SOURCE_DATE_EPOCH is set, every post-build stage takes its timestamps
+(build trace, health check, mutation logs and their file names) from it and
+writes JSON with sorted keys, so identical inputs give byte-identical output.
+`inputs` snapshots the digest of the build inputs into .build-inputs.json
+before any stage rewrites them (the embedded snapshot, the next.config stub);
+`record` stores that digest next to a content-addressed digest of the
+post-processed .next tree in .build-digest.json. `check` runs before the
+pipeline and exits 0 when the inputs still match that record and the recorded
+tree is intact, so CI can skip the pipeline entirely.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+DIGEST_PATH = '.build-digest.json'
+INPUTS_PATH = '.build-inputs.json'
+OUTPUT_ROOT = '.next'
+INPUT_PATHS = ['package.json', 'package-lock.json', 'next.config.mjs', 'next.config.js',
+               'next.config.ts', 'tsconfig.json', 'amplify.yml', 'app', 'public']
+# Generated during the build; hashing them would make every fresh checkout miss
+INPUT_EXCLUDES = ['public/data', 'public/tiles']
+SKIPPED_DIRS = {'__pycache__', 'node_modules', '.git'}
+
+
+def source_date_epoch():
+    """SOURCE_DATE_EPOCH as an int, or None when unset or invalid"""
+    value = os.environ.get('SOURCE_DATE_EPOCH', '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def deterministic():
+    return source_date_epoch() is not None
+
+
+def build_time():
+    """Fixed build time in deterministic mode, the wall clock otherwise"""
+    epoch = source_date_epoch()
+    if epoch is None:
+        return datetime.now()
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def build_timestamp():
+    return build_time().isoformat()
+
+
+def build_time_utc():
+    """Timezone-aware UTC build time, for artifacts that record an offset"""
+    epoch = source_date_epoch()
+    if epoch is None:
+        return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def run_log_name(prefix, owner=None):
+    """Timestamped per-run log name; owners stay distinct when the time is fixed
+
+    The stamp is second-granular and constant under SOURCE_DATE_EPOCH, so a
+    counter is appended rather than overwriting an earlier run's log.
+    """
+    stamp = build_time().strftime('%Y%m%d_%H%M%S')
+    if owner and deterministic():
+        stamp = f"{stamp}_{re.sub(r'[^a-z0-9]+', '-', owner.lower()).strip('-')}"
+    name = f"{prefix}_{stamp}.json"
+    run = 1
+    while os.path.exists(name):
+        run += 1
+        name = f"{prefix}_{stamp}_{run}.json"
+    return name
+
+
+def json_options(**options):
+    """json.dump keyword arguments, with sorted keys in deterministic mode"""
+    if deterministic():
+        options['sort_keys'] = True
+    return options
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_tree(paths, excludes=()):
+    """Regular files under paths in a stable order, as (relative path, absolute path)"""
+    excluded = {os.path.normpath(path) for path in excludes}
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(os.path.normpath(path))
+            continue
+        for dir_path, dir_names, filenames in os.walk(path):
+            dir_names[:] = [d for d in dir_names if d not in SKIPPED_DIRS
+                            and os.path.normpath(os.path.join(dir_path, d)) not in excluded]
+            files.extend(os.path.normpath(os.path.join(dir_path, name)) for name in filenames
+                         if not os.path.islink(os.path.join(dir_path, name)))
+    return sorted(set(files))
+
+
+def tree_digest(paths, excludes=(), relative_to=None):
+    """sha256 over sorted (path, content digest) pairs; symlinks are not followed"""
+    digest = hashlib.sha256()
+    count = 0
+    for path in iter_tree(paths, excludes):
+        rel_path = os.path.relpath(path, relative_to) if relative_to else path
+        digest.update(f"{rel_path.replace(os.sep, '/')}\0{_file_digest(path)}\n".encode())
+        count += 1
+    return digest.hexdigest(), count
+
+
+def input_digest(extra_paths=()):
+    """Digest of the sources, configs and scripts the pipeline consumes"""
+    scripts = sorted(name for name in os.listdir('.') if name.endswith('.py'))
+    paths = [p for p in INPUT_PATHS + scripts + list(extra_paths) if os.path.exists(p)]
+    digest, count = tree_digest(paths, INPUT_EXCLUDES)
+    # The epoch is baked into outputs, so it is an input too
+    return hashlib.sha256(f"{digest}:{source_date_epoch()}".encode()).hexdigest(), count
+
+
+class BuildDigest:
+    """Record and check the input/output digest pair for a build"""
+
+    def __init__(self, digest_path=DIGEST_PATH, output_root=OUTPUT_ROOT, extra_inputs=(),
+                 inputs_path=INPUTS_PATH):
+        self.digest_path = digest_path
+        self.output_root = output_root
+        self.extra_inputs = list(extra_inputs)
+        self.inputs_path = inputs_path
+        self.digest_id = "Build-Digest-v1"
+
+    def compute(self, inputs=None):
+        if inputs is None:
+            digest, count = input_digest(self.extra_inputs)
+            inputs = {"input_digest": digest, "input_files": count}
+        outputs, output_files = tree_digest([self.output_root], relative_to=self.output_root) \
+            if os.path.isdir(self.output_root) else (None, 0)
+        return {
+            "source_date_epoch": source_date_epoch(),
+            "input_digest": inputs["input_digest"],
+            "input_files": inputs["input_files"],
+            "output_digest": outputs,
+            "output_files": output_files
+        }
+
+    def snapshot_inputs(self):
+        """Store the input digest before the pipeline starts rewriting inputs"""
+        digest, count = input_digest(self.extra_inputs)
+        inputs = {"input_digest": digest, "input_files": count}
+        with open(self.inputs_path, 'w') as f:
+            json.dump(inputs, f, indent=2, sort_keys=True)
+        print(f"[{self.digest_id}] inputs {digest[:12]} ({count} files)")
+        return inputs
+
+    def record(self):
+        try:
+            with open(self.inputs_path, 'r') as f:
+                inputs = json.load(f)
+        except (OSError, ValueError):
+            print(f"[{self.digest_id}] No {self.inputs_path}, digesting the inputs as they are now")
+            inputs = None
+        result = self.compute(inputs)
+        with open(self.digest_path, 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        if inputs is not None:
+            os.remove(self.inputs_path)
+        print(f"[{self.digest_id}] inputs {result['input_digest'][:12]} -> "
+              f"outputs {str(result['output_digest'])[:12]} ({result['output_files']} files)")
+        return result
+
+    def check(self):
+        """Whether the recorded outputs can be reused as-is"""
+        try:
+            with open(self.digest_path, 'r') as f:
+                recorded = json.load(f)
+        except (OSError, ValueError):
+            return {"reusable": False, "reason": "no recorded digest"}
+        current = self.compute()
+        if current["input_digest"] != recorded.get("input_digest"):
+            return {"reusable": False, "reason": "inputs changed", "input_digest": current["input_digest"]}
+        if current["output_digest"] != recorded.get("output_digest"):
+            return {"reusable": False, "reason": "outputs missing or modified"}
+        return {"reusable": True, "input_digest": current["input_digest"],
+                "output_digest": current["output_digest"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or check reproducible build digests")
+    parser.add_argument("command", choices=["inputs", "record", "check", "digest"])
+    parser.add_argument("--digest-file", default=DIGEST_PATH)
+    parser.add_argument("--output-root", default=OUTPUT_ROOT)
+    parser.add_argument("--inputs-file", default=INPUTS_PATH)
+    parser.add_argument("--inputs", nargs="*", default=[],
+                        help="Extra input paths, e.g. public/data once the feed has been fetched")
+    args = parser.parse_args()
+
+    build_digest = BuildDigest(args.digest_file, args.output_root, args.inputs, args.inputs_file)
+    if args.command == "inputs":
+        print(json.dumps(build_digest.snapshot_inputs(), indent=2))
+    elif args.command == "record":
+        print(json.dumps(build_digest.record(), indent=2))
+    elif args.command == "digest":
+        print(json.dumps(build_digest.compute(), indent=2))
+    else:
+        result = build_digest.check()
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["reusable"] else 1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+BYPASS TRANSACTION
+Stages bypass file mutations in memory and applies or reverts them as a unit
+
+The bypass rewrites package.amplify.json, swaps next.config.* for a stub and
+drops metadata markers and stubs around the tree. Every write, move and
+removal is staged here with the current bytes of each touched path, applied
+together by commit(), and rolled back if any step fails. The originals, and
+every directory the bypass had to create, are also journaled to
+.bypass-journal.json, so `--revert` restores the exact pre-bypass tree;
+amplify.yml runs it when `npm run build` fails.
+"""
+
+import argparse
+import base64
+import json
+import os
+
+JOURNAL_PATH = '.bypass-journal.json'
+
+
+def _read_original(path):
+    """Current bytes and mode of a path, or (None, None) when it does not exist"""
+    if not os.path.isfile(path):
+        return None, None
+    with open(path, 'rb') as f:
+        return f.read(), os.stat(path).st_mode & 0o777
+
+
+def _apply(path, data, mode=None):
+    if data is None:
+        if os.path.lexists(path):
+            os.remove(path)
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+def _remove_empty_dirs(paths):
+    """Remove the given directories, deepest first, when nothing else landed in them"""
+    removed = []
+    for path in sorted(set(paths), key=lambda p: p.count(os.sep), reverse=True):
+        try:
+            os.rmdir(path)
+        except OSError:
+            continue
+        removed.append(path)
+    return removed
+
+
+class BypassTransaction:
+    """All-or-nothing set of file writes with a revert journal"""
+
+    def __init__(self, journal_path=JOURNAL_PATH):
+        self.journal_path = journal_path
+        self.staged = {}
+        self.originals = {}
+        self.created_dirs = []
+        self.transaction_id = "Bypass-Transaction-v1"
+
+    def _remember(self, path):
+        if path not in self.originals:
+            self.originals[path] = _read_original(path)
+
+    def _remember_dirs(self, path):
+        """Missing directories on the way to path, outermost first"""
+        missing = []
+        while path and not os.path.isdir(path) and path not in self.created_dirs:
+            missing.append(path)
+            path = os.path.dirname(path)
+        self.created_dirs.extend(reversed(missing))
+
+    def makedirs(self, path):
+        self._remember_dirs(os.path.normpath(path))
+
+    def current(self, path):
+        """Bytes the path will hold once staged changes are applied"""
+        if path in self.staged:
+            return self.staged[path][0]
+        return _read_original(path)[0]
+
+    def write(self, path, content, mode=None):
+        self._remember(path)
+        self._remember_dirs(os.path.dirname(os.path.normpath(path)))
+        data = content.encode() if isinstance(content, str) else content
+        self.staged[path] = (data, mode)
+
+    def remove(self, path):
+        self._remember(path)
+        self.staged[path] = (None, None)
+
+    def move(self, source, target):
+        data = self.current(source)
+        if data is None:
+            raise FileNotFoundError(source)
+        self.write(target, data, _read_original(source)[1])
+        self.remove(source)
+
+    def _load_journal(self):
+        try:
+            with open(self.journal_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"paths": {}, "dirs": []}
+
+    def _write_journal(self):
+        # An unreverted earlier run keeps its originals: revert goes back to the pristine tree
+        journal = self._load_journal()
+        for path, (data, mode) in self.originals.items():
+            journal["paths"].setdefault(path, {
+                "original": base64.b64encode(data).decode() if data is not None else None,
+                "mode": mode
+            })
+        dirs = journal.setdefault("dirs", [])
+        dirs.extend(path for path in self.created_dirs if path not in dirs)
+        with open(self.journal_path + '.tmp', 'w') as f:
+            json.dump(journal, f, indent=2, sort_keys=True)
+        os.replace(self.journal_path + '.tmp', self.journal_path)
+
+    def commit(self):
+        """Apply every staged change, restoring all originals if any step fails"""
+        self._write_journal()
+        applied = []
+        try:
+            for path in self.created_dirs:
+                os.makedirs(path, exist_ok=True)
+            for path, (data, mode) in self.staged.items():
+                applied.append(path)
+                _apply(path, data, mode)
+        except Exception:
+            for path in reversed(applied):
+                _apply(path, *self.originals[path])
+            _remove_empty_dirs(self.created_dirs)
+            print(f"[{self.transaction_id}] Commit failed, rolled back {len(applied)} paths")
+            raise
+        committed = sorted(self.staged)
+        self.staged = {}
+        self.originals = {}
+        self.created_dirs = []
+        return committed
+
+    def revert(self):
+        """Restore every journaled path to its pre-bypass bytes"""
+        journal = self._load_journal()
+        restored = []
+        for path, entry in sorted(journal["paths"].items()):
+            data = base64.b64decode(entry["original"]) if entry["original"] is not None else None
+            _apply(path, data, entry["mode"])
+            restored.append(path)
+        removed = _remove_empty_dirs(journal.get("dirs", []))
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        print(f"[{self.transaction_id}] Reverted {len(restored)} paths, removed {len(removed)} directories")
+        return restored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Revert the files changed by amplify_ssr_bypass.py")
+    parser.add_argument("--journal", default=JOURNAL_PATH)
+    args = parser.parse_args()
+
+    print(json.dumps({"reverted": BypassTransaction(args.journal).revert()}, indent=2))
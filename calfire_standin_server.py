@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+CAL FIRE STAND-IN SERVER
+Local asyncio server that mimics the CAL FIRE incident endpoints offline
+
+Serves recorded (fixtures/calfire_active.geojson) or synthetic incidents as
+  /umbraco/api/IncidentApi/GeoJsonList   GeoJSON FeatureCollection
+  /umbraco/api/IncidentApi/List          flat JSON list (fetchCalFireData)
+  /rss.xml                               RSS 2.0 feed
+with configurable latency, error rate, truncated-response rate and incident
+count (--scale replicates the recorded incidents). Responses carry ETag/Last-Modified and honour
+conditional requests; the feed changes every --update-interval seconds so
+refresh traffic sees realistic churn.
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import time
+from email.utils import formatdate
+from xml.sax.saxutils import escape
+
+FIXTURE_PATH = 'fixtures/calfire_active.geojson'
+
+GEOJSON_PATH = '/umbraco/api/IncidentApi/GeoJsonList'
+LIST_PATH = '/umbraco/api/IncidentApi/List'
+RSS_PATH = '/rss.xml'
+
+REASONS = {200: 'OK', 304: 'Not Modified', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def synthesize_features(recorded, count, version, churn=0.1):
+    """Replicate recorded features to count, perturbing a churn fraction per version"""
+    rng = random.Random(version)
+    features = []
+    for index in range(count):
+        feature = copy.deepcopy(recorded[index % len(recorded)])
+        props = feature['properties']
+        if index >= len(recorded):
+            # Spread replicas around California so they are distinct incidents
+            props['UniqueId'] = f"{props['UniqueId']}-{index // len(recorded)}"
+            props['Name'] = f"{props['Name']} {index // len(recorded)}"
+            seed = random.Random(index)
+            props['Latitude'] = round(32.6 + seed.random() * 9.3, 6)
+            props['Longitude'] = round(-124.2 + seed.random() * 10.1, 6)
+            feature['geometry']['coordinates'] = [props['Longitude'], props['Latitude']]
+        if version and rng.random() < churn:
+            props['AcresBurned'] = round((props.get('AcresBurned') or 0) * (1 + rng.random() * 0.2), 1)
+            props['PercentContained'] = min(100, (props.get('PercentContained') or 0) + rng.randint(0, 10))
+            props['Updated'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        features.append(feature)
+    return features
+
+
+def render_payload(path, features):
+    """Body and content type for an endpoint"""
+    if path == GEOJSON_PATH:
+        body = json.dumps({"type": "FeatureCollection", "features": features})
+        return body.encode(), 'application/json'
+    if path == LIST_PATH:
+        return json.dumps([feature['properties'] for feature in features]).encode(), 'application/json'
+
+    items = "".join(
+        f"<item><title>{escape(p['Name'])}</title><link>{escape(p.get('Url') or '')}</link>"
+        f"<guid>{escape(p['UniqueId'])}</guid>"
+        f"<description>{escape(p.get('County') or '')} - {p.get('AcresBurned') or 0} acres, "
+        f"{p.get('PercentContained') or 0}% contained</description></item>"
+        for p in (feature['properties'] for feature in features)
+    )
+    body = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>CAL FIRE Incidents (stand-in)</title>{items}</channel></rss>')
+    return body.encode(), 'application/rss+xml'
+
+
+class CalFireStandInServer:
+    """Configurable local stand-in for the CAL FIRE incident API"""
+
+    def __init__(self, fixture_path=FIXTURE_PATH, scale=1.0, incident_count=None,
+                 latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, update_interval=60.0, seed=0,
+                 truncate_rate=0.0):
+        with open(fixture_path, 'r') as f:
+            self.recorded = json.load(f)['features']
+        self.incident_count = incident_count or max(1, int(len(self.recorded) * scale))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.update_interval = update_interval
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.stats = {"requests": 0, "200": 0, "304": 0, "404": 0, "500": 0, "truncated": 0, "bytes_sent": 0}
+        self._payload_cache = {}
+        self._server = None
+
+    def feed_version(self):
+        if not self.update_interval:
+            return 0
+        return int((time.time() - self.started) // self.update_interval)
+
+    def payload(self, path):
+        """Rendered body, content type, ETag and Last-Modified for the current version"""
+        version = self.feed_version()
+        key = (path, version)
+        if key not in self._payload_cache:
+            features = synthesize_features(self.recorded, self.incident_count, version)
+            body, content_type = render_payload(path, features)
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            last_modified = formatdate(self.started + version * self.update_interval, usegmt=True)
+            # Only the current version is ever served again
+            self._payload_cache = {k: v for k, v in self._payload_cache.items() if k[1] == version}
+            self._payload_cache[key] = (body, content_type, etag, last_modified)
+        return self._payload_cache[key]
+
+    async def _respond(self, writer, status, body=b'', headers=None, keep_alive=True, truncate=False):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                 "Access-Control-Allow-Origin: *"]
+        lines.extend(f"{key}: {value}" for key, value in (headers or {}).items())
+        sent = body[:len(body) // 2] if truncate else body
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + sent)
+        await writer.drain()
+        self.stats["truncated" if truncate else str(status)] += 1
+        self.stats["bytes_sent"] += len(body)
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one (keep-alive) connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                self.stats["requests"] += 1
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                path = target.split('?', 1)[0]
+
+                delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000)
+
+                if path not in (GEOJSON_PATH, LIST_PATH, RSS_PATH):
+                    await self._respond(writer, 404, b'not found', keep_alive=keep_alive)
+                elif self.rng.random() < self.error_rate:
+                    await self._respond(writer, 500, b'stand-in error', keep_alive=keep_alive)
+                else:
+                    body, content_type, etag, last_modified = self.payload(path)
+                    validators = {"ETag": etag, "Last-Modified": last_modified}
+                    if (headers.get('if-none-match') == etag
+                            or headers.get('if-modified-since') == last_modified):
+                        await self._respond(writer, 304, headers=validators, keep_alive=keep_alive)
+                    elif method != 'HEAD' and self.rng.random() < self.truncate_rate:
+                        # Full Content-Length, half the body, then hang up
+                        validators["Content-Type"] = content_type
+                        await self._respond(writer, 200, body, validators, keep_alive, truncate=True)
+                        break
+                    else:
+                        validators["Content-Type"] = content_type
+                        body = b'' if method == 'HEAD' else body
+                        await self._respond(writer, 200, body, validators, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Start listening; returns the bound port"""
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def _serve_forever(server, host, port):
+    bound = await server.start(host, port)
+    print(f"[STAND-IN] Serving {server.incident_count} incidents on http://{host}:{bound}")
+    print(f"[STAND-IN]   {GEOJSON_PATH}\n[STAND-IN]   {LIST_PATH}\n[STAND-IN]   {RSS_PATH}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local CAL FIRE feed stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiple of the recorded incident count")
+    parser.add_argument("--incidents", type=int, default=None, help="Exact incident count")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--update-interval", type=float, default=60.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0,
+                        help="Fraction of 200 responses cut off mid-body")
+    args = parser.parse_args()
+
+    stand_in = CalFireStandInServer(args.fixture, args.scale, args.incidents, args.latency_ms,
+                                    args.jitter_ms, args.error_rate, args.update_interval,
+                                    truncate_rate=args.truncate_rate)
+    try:
+        asyncio.run(_serve_forever(stand_in, args.host, args.port))
+    except KeyboardInterrupt:
+        print(json.dumps(stand_in.stats, indent=2))
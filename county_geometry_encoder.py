@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+COUNTY GEOMETRY ENCODER
+Quantizes and delta-encodes public/california-counties.geojson as TopoJSON
+
+Coordinates are snapped to a configurable grid (--precision, in degrees), ring
+vertices are stored as integer deltas, and borders shared by neighbouring
+counties are stored once as shared arcs (disable with --no-shared-arcs).
+app/lib/countyTopology.ts decodes the result back into GeoJSON on the client.
+Reports bytes saved and the maximum coordinate error introduced.
+"""
+
+import argparse
+import json
+import os
+
+SOURCE_PATH = 'public/california-counties.geojson'
+OUTPUT_PATH = 'public/data/california-counties.topo.json'
+DEFAULT_PRECISION = 1e-4
+
+
+def _polygons(geometry):
+    """Yield each polygon (list of rings) of a Polygon or MultiPolygon"""
+    if geometry['type'] == 'Polygon':
+        yield geometry['coordinates']
+    elif geometry['type'] == 'MultiPolygon':
+        yield from geometry['coordinates']
+
+
+def _bbox(features):
+    xs, ys = [], []
+    for feature in features:
+        for polygon in _polygons(feature['geometry']):
+            for ring in polygon:
+                for x, y in ring:
+                    xs.append(x)
+                    ys.append(y)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class CountyGeometryEncoder:
+    """Encode county polygons as quantized, delta-encoded TopoJSON"""
+
+    def __init__(self, precision=DEFAULT_PRECISION, shared_arcs=True):
+        self.precision = precision
+        self.shared_arcs = shared_arcs
+        self.encoder_id = "County-Geometry-Encoder-v1"
+        self.translate = (0.0, 0.0)
+        self.arcs = []
+        self._arc_index = {}
+
+    def quantize_ring(self, ring):
+        """Snap a ring to the grid, dropping consecutive duplicate points"""
+        tx, ty = self.translate
+        quantized = []
+        for x, y in ring:
+            point = (round((x - tx) / self.precision), round((y - ty) / self.precision))
+            if not quantized or quantized[-1] != point:
+                quantized.append(point)
+        if quantized[0] != quantized[-1]:
+            quantized.append(quantized[0])
+        return quantized
+
+    def _find_junctions(self, rings):
+        """Points whose neighbours differ between occurrences start new arcs"""
+        neighbours = {}
+        for ring in rings:
+            points = ring[:-1]
+            count = len(points)
+            for i, point in enumerate(points):
+                before, after = points[i - 1], points[(i + 1) % count]
+                pair = (before, after) if before <= after else (after, before)
+                neighbours.setdefault(point, set()).add(pair)
+        return {point for point, pairs in neighbours.items() if len(pairs) > 1}
+
+    def _register_arc(self, arc):
+        """Return the arc index, reusing an existing (possibly reversed) arc"""
+        key = tuple(arc)
+        if key in self._arc_index:
+            return self._arc_index[key]
+        reverse_key = key[::-1]
+        if self.shared_arcs and reverse_key in self._arc_index:
+            return ~self._arc_index[reverse_key]
+
+        index = len(self.arcs)
+        self.arcs.append(arc)
+        if self.shared_arcs:
+            self._arc_index[key] = index
+        return index
+
+    def _cut_ring(self, ring, junctions):
+        """Split a closed ring into arcs at junction points"""
+        points = ring[:-1]
+        cuts = [i for i, point in enumerate(points) if point in junctions]
+
+        if not cuts:
+            # Rotate isolated rings to a canonical start so duplicates match
+            start = points.index(min(points))
+            rotated = points[start:] + points[:start]
+            return [self._register_arc(rotated + rotated[:1])]
+
+        rotated = points[cuts[0]:] + points[:cuts[0]]
+        offsets = [i - cuts[0] for i in cuts] + [len(points)]
+        closed = rotated + rotated[:1]
+        return [
+            self._register_arc(closed[start:end + 1])
+            for start, end in zip(offsets, offsets[1:])
+        ]
+
+    def _delta_encode(self, arc):
+        encoded = [list(arc[0])]
+        for (x0, y0), (x1, y1) in zip(arc, arc[1:]):
+            encoded.append([x1 - x0, y1 - y0])
+        return encoded
+
+    def encode(self, collection):
+        """Build a TopoJSON topology from a GeoJSON FeatureCollection"""
+        features = collection['features']
+        min_x, min_y, _, _ = _bbox(features)
+        self.translate = (min_x, min_y)
+        self.arcs = []
+        self._arc_index = {}
+
+        quantized_features = []
+        all_rings = []
+        for feature in features:
+            polygons = [
+                [self.quantize_ring(ring) for ring in polygon]
+                for polygon in _polygons(feature['geometry'])
+            ]
+            quantized_features.append((feature, polygons))
+            all_rings.extend(ring for polygon in polygons for ring in polygon)
+
+        junctions = self._find_junctions(all_rings) if self.shared_arcs else set()
+
+        geometries = []
+        for feature, polygons in quantized_features:
+            arcs = [[self._cut_ring(ring, junctions) for ring in polygon] for polygon in polygons]
+            geometry = {"properties": feature.get('properties') or {}}
+            if feature['geometry']['type'] == 'Polygon':
+                geometry.update({"type": "Polygon", "arcs": arcs[0]})
+            else:
+                geometry.update({"type": "MultiPolygon", "arcs": arcs})
+            geometries.append(geometry)
+
+        return {
+            "type": "Topology",
+            "transform": {
+                "scale": [self.precision, self.precision],
+                "translate": list(self.translate)
+            },
+            "objects": {
+                "counties": {"type": "GeometryCollection", "geometries": geometries}
+            },
+            "arcs": [self._delta_encode(arc) for arc in self.arcs]
+        }
+
+    def max_error(self, collection):
+        """Largest coordinate error (degrees) introduced by quantization"""
+        tx, ty = self.translate
+        error = 0.0
+        for feature in collection['features']:
+            for polygon in _polygons(feature['geometry']):
+                for ring in polygon:
+                    for x, y in ring:
+                        qx = round((x - tx) / self.precision) * self.precision + tx
+                        qy = round((y - ty) / self.precision) * self.precision + ty
+                        error = max(error, abs(qx - x), abs(qy - y))
+        return error
+
+    def encode_file(self, source_path=SOURCE_PATH, output_path=OUTPUT_PATH):
+        """Encode a GeoJSON file and report the savings"""
+        print(f"[{self.encoder_id}] Encoding {source_path} "
+              f"(precision {self.precision}, shared arcs {self.shared_arcs})...")
+
+        with open(source_path, 'r') as f:
+            collection = json.load(f)
+
+        topology = self.encode(collection)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(topology, f, separators=(',', ':'))
+
+        bytes_before = os.path.getsize(source_path)
+        bytes_after = os.path.getsize(output_path)
+        error = self.max_error(collection)
+
+        print(f"[TOPOLOGY] {bytes_before} -> {bytes_after} bytes "
+              f"({bytes_before - bytes_after} saved), {len(self.arcs)} arcs, "
+              f"max coordinate error {error:.2e} deg")
+
+        return {
+            "status": "complete",
+            "output": output_path,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved": bytes_before - bytes_after,
+            "arcs": len(self.arcs),
+            "max_error_degrees": error
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize and topology-encode county geometry")
+    parser.add_argument("--source", default=SOURCE_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--precision", type=float, default=DEFAULT_PRECISION,
+                        help="Grid size in degrees")
+    parser.add_argument("--no-shared-arcs", action="store_true")
+    args = parser.parse_args()
+
+    encoder = CountyGeometryEncoder(args.precision, not args.no_shared_arcs)
+    result = encoder.encode_file(args.source, args.output)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+COUNTY SPATIAL INDEX
+Assigns snapshot incidents to county FIPS codes and emits per-county aggregates
+
+Builds a uniform bounding-box grid over the polygons in
+public/california-counties.geojson, then runs vectorized even-odd
+point-in-polygon tests (NumPy, points x edges) only against the counties whose
+boxes share a grid cell with each incident. Incidents that fall outside every
+polygon are matched on the first name in their free-text county field. The map
+reads active counts, total acres and max containment gap straight from the
+output instead of matching strings on every render.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+COUNTIES_PATH = 'public/california-counties.geojson'
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+OUTPUT_PATH = 'public/data/county-aggregates.json'
+DEFAULT_CELL_SIZE = 0.25
+
+
+def _rings(geometry):
+    """Every ring of a Polygon or MultiPolygon"""
+    if geometry['type'] == 'Polygon':
+        return list(geometry['coordinates'])
+    if geometry['type'] == 'MultiPolygon':
+        return [ring for polygon in geometry['coordinates'] for ring in polygon]
+    return []
+
+
+class CountyPolygon:
+    """Edge arrays and bounding box for one county"""
+
+    def __init__(self, fips, name, geometry):
+        self.fips = fips
+        self.name = name
+        edges = []
+        for ring in _rings(geometry):
+            ring = np.asarray(ring, dtype=np.float64)
+            edges.append(np.hstack([ring[:-1], ring[1:]]))
+        self.edges = np.vstack(edges) if edges else np.empty((0, 4))
+        points = self.edges[:, :2] if len(self.edges) else np.zeros((1, 2))
+        self.bbox = (*points.min(axis=0), *points.max(axis=0))
+
+    def contains(self, lng, lat):
+        """Vectorized even-odd rule for arrays of points"""
+        x1, y1, x2, y2 = (self.edges[:, i][None, :] for i in range(4))
+        px, py = lng[:, None], lat[:, None]
+        crosses = (y1 > py) != (y2 > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_intersect = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        hits = crosses & (px < x_intersect)
+        return np.count_nonzero(hits, axis=1) % 2 == 1
+
+
+class CountySpatialIndex:
+    """Bounding-box grid over county polygons"""
+
+    def __init__(self, counties_path=COUNTIES_PATH, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        with open(counties_path, 'r') as f:
+            features = json.load(f)['features']
+
+        self.polygons = [
+            CountyPolygon(f['properties'].get('FIPS'), f['properties'].get('NAME'), f['geometry'])
+            for f in features
+        ]
+        self.by_name = {p.name.lower(): p for p in self.polygons if p.name}
+        self.grid = {}
+        for index, polygon in enumerate(self.polygons):
+            min_x, min_y, max_x, max_y = polygon.bbox
+            for cx in range(self._cell(min_x), self._cell(max_x) + 1):
+                for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+                    self.grid.setdefault((cx, cy), []).append(index)
+
+    def _cell(self, value):
+        return int(np.floor(value / self.cell_size))
+
+    def assign(self, lng, lat):
+        """FIPS index per point, -1 where no polygon contains it"""
+        lng = np.asarray(lng, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        assigned = np.full(len(lng), -1, dtype=np.int64)
+
+        cells_x = np.floor(lng / self.cell_size).astype(np.int64)
+        cells_y = np.floor(lat / self.cell_size).astype(np.int64)
+
+        # Group points by candidate polygon so each polygon is tested once
+        candidates = {}
+        for point, cell in enumerate(zip(cells_x.tolist(), cells_y.tolist())):
+            for polygon_index in self.grid.get(cell, ()):
+                candidates.setdefault(polygon_index, []).append(point)
+
+        for polygon_index in sorted(candidates):
+            points = np.array(candidates[polygon_index])
+            points = points[assigned[points] == -1]
+            if not len(points):
+                continue
+            inside = self.polygons[polygon_index].contains(lng[points], lat[points])
+            assigned[points[inside]] = polygon_index
+
+        return assigned
+
+    def match_name(self, county_text):
+        """Fallback: first county named in a free-text field"""
+        for name in (county_text or '').split(','):
+            polygon = self.by_name.get(name.strip().lower())
+            if polygon:
+                return polygon
+        return None
+
+
+def aggregate(index, incidents):
+    """Per-county active count, total acres and max containment gap"""
+    located = [i for i in incidents if i.get('lat') is not None and i.get('lng') is not None]
+    assigned = index.assign([i['lng'] for i in located], [i['lat'] for i in located])
+    polygon_for = {
+        incident['id']: index.polygons[polygon_index] if polygon_index >= 0 else None
+        for incident, polygon_index in zip(located, assigned.tolist())
+    }
+
+    counties = {}
+    assignments = {}
+    unassigned = []
+    for incident in incidents:
+        polygon = polygon_for.get(incident['id']) or index.match_name(incident.get('county'))
+        if polygon is None:
+            unassigned.append(incident['id'])
+            continue
+
+        assignments[incident['id']] = polygon.fips
+        county = counties.setdefault(polygon.fips, {
+            "name": polygon.name,
+            "incidents": 0,
+            "active": 0,
+            "total_acres": 0,
+            "max_containment_gap": 0,
+            "incident_ids": []
+        })
+        county["incidents"] += 1
+        county["total_acres"] += incident.get('acres') or 0
+        county["incident_ids"].append(incident['id'])
+        if incident.get('status') == 'Active':
+            county["active"] += 1
+            gap = 100 - (incident.get('containment') or 0)
+            county["max_containment_gap"] = max(county["max_containment_gap"], gap)
+
+    return {
+        "counties": dict(sorted(counties.items())),
+        "assignments": assignments,
+        "unassigned": unassigned
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assign incidents to counties and aggregate")
+    parser.add_argument("--counties", default=COUNTIES_PATH)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE)
+    args = parser.parse_args()
+
+    print(f"[COUNTY INDEX] Indexing {args.counties} (cell size {args.cell_size} deg)...")
+    spatial_index = CountySpatialIndex(args.counties, args.cell_size)
+
+    with open(args.snapshot, 'r') as f:
+        snapshot = json.load(f)
+
+    result = aggregate(spatial_index, snapshot.get('incidents', []))
+    result["generated"] = snapshot.get("generated")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, separators=(',', ':'))
+
+    print(f"[COUNTY INDEX] {len(result['assignments'])} incidents assigned to "
+          f"{len(result['counties'])} counties, {len(result['unassigned'])} unassigned")
+    print(json.dumps({k: v for k, v in result.items() if k != "assignments"}, indent=2))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+DIRECTORY STATISTICS COLLECTOR
+Single-walk file counts, byte totals and largest files for nested build roots
+
+Walks the outermost roots once with os.scandir and attributes every entry to
+each requested root that contains it, so '.next' and '.next/server' are never
+scanned twice. Run directly for a du-style report of the build output.
+"""
+
+import heapq
+import os
+import sys
+
+DEFAULT_ROOTS = ['out', '.next', '.next/server', '.next/standalone']
+
+
+def _normalize_root(root):
+    """Normalize a root path for prefix comparisons"""
+    return os.path.normpath(root)
+
+
+def _is_within(path, parent):
+    """Whether a normalized path equals or lies under a normalized parent"""
+    if parent == os.curdir:
+        return not os.path.isabs(path) and path != os.pardir and not path.startswith(os.pardir + os.sep)
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+def _outermost_roots(roots):
+    """Drop roots nested inside another requested root"""
+    outermost = []
+    for root in sorted(roots, key=len):
+        if not any(_is_within(root, parent) for parent in outermost):
+            outermost.append(root)
+    return outermost
+
+
+def collect_directory_stats(roots=None, top_n=5):
+    """Collect stats for every root in one pass over the filesystem"""
+    roots = [_normalize_root(r) for r in (roots or DEFAULT_ROOTS)]
+    stats = {
+        root: {
+            "exists": os.path.isdir(root),
+            "files": 0,
+            "dirs": 0,
+            "bytes": 0,
+            "largest": []
+        }
+        for root in roots
+    }
+    root_set = set(stats)
+
+    # Each stack entry carries the roots the directory belongs to
+    stack = []
+    for root in _outermost_roots(root_set):
+        if stats[root]["exists"]:
+            stack.append((root, (root,)))
+
+    while stack:
+        dir_path, owners = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # scandir paths keep a './' prefix from roots like '.' or './x'
+                        child_owners = owners
+                        entry_path = os.path.normpath(entry.path)
+                        if entry_path in root_set:
+                            child_owners = owners + (entry_path,)
+                        for owner in owners:
+                            stats[owner]["dirs"] += 1
+                        stack.append((entry.path, child_owners))
+                        continue
+
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+
+                for owner in owners:
+                    owner_stats = stats[owner]
+                    owner_stats["files"] += 1
+                    owner_stats["bytes"] += size
+                    largest = owner_stats["largest"]
+                    if len(largest) < top_n:
+                        heapq.heappush(largest, (size, entry.path))
+                    elif size > largest[0][0]:
+                        heapq.heapreplace(largest, (size, entry.path))
+
+    for owner_stats in stats.values():
+        owner_stats["largest"] = [
+            {"path": path, "bytes": size}
+            for size, path in sorted(owner_stats["largest"], reverse=True)
+        ]
+
+    return stats
+
+
+def format_bytes(num_bytes):
+    """Human-readable byte count in du -h style"""
+    size = float(num_bytes)
+    for unit in ['B', 'K', 'M', 'G']:
+        if size < 1024 or unit == 'G':
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def print_report(stats):
+    """Print a du-style report for collected stats"""
+    for root, root_stats in stats.items():
+        if not root_stats["exists"]:
+            print(f"{'-':>8}  {root} (missing)")
+            continue
+        print(f"{format_bytes(root_stats['bytes']):>8}  {root} "
+              f"({root_stats['files']} files, {root_stats['dirs']} dirs)")
+        for item in root_stats["largest"]:
+            print(f"{format_bytes(item['bytes']):>8}    {item['path']}")
+
+
+if __name__ == "__main__":
+    print_report(collect_directory_stats(sys.argv[1:] or None))
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+FIRE INGEST ENGINE
+Concurrent multi-source CAL FIRE ingest with conditional requests and a disk cache
+
+fetchAllFireData / fetchAllFiresGeoJson hit their sources one after another and
+re-download unchanged feeds. This engine fetches every configured source at once
+over a pooled keep-alive HTTP/1.1 session, sends If-None-Match/If-Modified-Since
+from the on-disk response cache (.ingest-cache/, entries evicted after --ttl
+seconds) and on a 304 reuses the cached normalized incidents without reading or
+parsing the body. Changed sources are normalized with convert_to_fire_incident
+and merged with the id / 0.01 degree proximity dedupe of fetchAllFireData.
+--base-url points every source at calfire_standin_server.py for local runs.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import ssl
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from build_reproducibility import build_time_utc
+from fire_snapshot_compiler import CAL_FIRE_BASE, convert_to_fire_incident, sort_incidents
+
+CAL_FIRE_LIST = 'https://www.fire.ca.gov/umbraco/api/IncidentApi/List'
+
+# name -> (url, payload kind)
+SOURCES = {
+    "geojson_active": (f'{CAL_FIRE_BASE}?inactive=false', 'geojson'),
+    "geojson_all": (f'{CAL_FIRE_BASE}?inactive=true', 'geojson'),
+    "incident_list": (CAL_FIRE_LIST, 'list')
+}
+
+CACHE_DIR = '.ingest-cache'
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_CONNECTIONS = 4
+DEDUPE_DEGREES = 0.01
+
+# A truncated or garbled response: short reads, bad framing, corrupt compression
+RESPONSE_ERRORS = (ConnectionError, EOFError, ValueError, IndexError, zlib.error)
+
+
+class ConnectionPool:
+    """Keep-alive connections per (scheme, host, port) with a per-host limit"""
+
+    def __init__(self, max_per_host=DEFAULT_MAX_CONNECTIONS, timeout=30.0):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._limits = {}
+        self._ssl = None
+        self.opened = 0
+        self.reused = 0
+
+    def _limit(self, key):
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self.max_per_host)
+        return self._limits[key]
+
+    async def _open(self, key):
+        scheme, host, port = key
+        if scheme == 'https' and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        self.opened += 1
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if scheme == 'https' else None),
+            self.timeout
+        )
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if status == 304 or status < 200:
+            body = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        return status, headers, body
+
+    async def request(self, url, headers=None):
+        """GET url; returns (status, headers, body)"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == 'https' else 80))
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}",
+                 "Accept: application/json", "Accept-Encoding: gzip",
+                 "User-Agent: fire-ingest-engine/1"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+        async with self._limit(key):
+            idle = self._idle.setdefault(key, [])
+            # A pooled connection may have been closed by the server; retry once fresh
+            for attempt in range(2):
+                if idle and attempt == 0:
+                    reader, writer = idle.pop()
+                    self.reused += 1
+                else:
+                    reader, writer = await self._open(key)
+                completed = False
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, response_headers, body = await asyncio.wait_for(
+                        self._read_response(reader), self.timeout)
+                    completed = True
+                    break
+                except RESPONSE_ERRORS:
+                    if attempt:
+                        raise
+                finally:
+                    # Timeouts and cancellation leave the stream mid-response too
+                    if not completed:
+                        writer.close()
+
+            if response_headers.get('connection', '').lower() == 'close':
+                writer.close()
+            else:
+                idle.append((reader, writer))
+        return status, response_headers, body
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class ResponseCache:
+    """On-disk validators, bodies and normalized incidents keyed by URL"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        return os.path.join(self.cache_dir, hashlib.md5(url.encode()).hexdigest() + suffix)
+
+    def get(self, url):
+        """Cache metadata for url, or None when missing"""
+        try:
+            with open(self._path(url, '.meta.json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_incidents(self, url):
+        try:
+            with open(self._path(url, '.incidents.json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, headers, body, incidents):
+        with open(self._path(url, '.body'), 'wb') as f:
+            f.write(body)
+        with open(self._path(url, '.incidents.json'), 'w') as f:
+            json.dump(incidents, f, separators=(',', ':'))
+        self._write_meta(url, {
+            "url": url,
+            "etag": headers.get('etag'),
+            "last_modified": headers.get('last-modified'),
+            "bytes": len(body),
+            "count": len(incidents),
+            "fetched": time.time(),
+            "validated": time.time()
+        })
+
+    def touch(self, url, meta):
+        """Record a successful revalidation"""
+        meta["validated"] = time.time()
+        self._write_meta(url, meta)
+
+    def _write_meta(self, url, meta):
+        path = self._path(url, '.meta.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+    def evict(self):
+        """Remove entries not revalidated within the TTL; returns the count"""
+        evicted = 0
+        now = time.time()
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.meta.json'):
+                continue
+            try:
+                with open(entry.path, 'r') as f:
+                    validated = json.load(f).get('validated', 0)
+            except (OSError, ValueError):
+                validated = 0
+            if now - validated <= self.ttl:
+                continue
+            stem = entry.path[:-len('.meta.json')]
+            for suffix in ('.meta.json', '.body', '.incidents.json'):
+                if os.path.exists(stem + suffix):
+                    os.remove(stem + suffix)
+            evicted += 1
+        return evicted
+
+
+def normalize_payload(kind, body):
+    """Parse a response body into FireIncident dicts"""
+    data = json.loads(body)
+    items = data.get('features', []) if kind == 'geojson' else [{'properties': item} for item in data]
+    return [
+        convert_to_fire_incident(item)
+        for item in items
+        if (item.get('properties') or {}).get('UniqueId')
+    ]
+
+
+def merge_incidents(incident_lists):
+    """Drop repeated ids, then incidents within DEDUPE_DEGREES of a kept one"""
+    seen_ids = set()
+    buckets = {}
+    merged = []
+    for incidents in incident_lists:
+        for incident in incidents:
+            if incident['id'] in seen_ids:
+                continue
+            lat, lng = incident.get('lat'), incident.get('lng')
+            if lat is not None and lng is not None:
+                cell = (int(lat // DEDUPE_DEGREES), int(lng // DEDUPE_DEGREES))
+                neighbours = (
+                    other
+                    for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    for other in buckets.get((cell[0] + dx, cell[1] + dy), ())
+                )
+                if any(abs(o['lat'] - lat) < DEDUPE_DEGREES and abs(o['lng'] - lng) < DEDUPE_DEGREES
+                       for o in neighbours):
+                    continue
+                buckets.setdefault(cell, []).append(incident)
+            seen_ids.add(incident['id'])
+            merged.append(incident)
+    return sort_incidents(merged)
+
+
+def rebase_url(url, base_url):
+    """Point a source URL at another scheme/host, keeping path and query"""
+    parts = urlsplit(url)
+    return base_url.rstrip('/') + parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+class FireIngestEngine:
+    """Fetch, revalidate and merge every configured source concurrently"""
+
+    def __init__(self, sources=None, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL,
+                 max_connections=DEFAULT_MAX_CONNECTIONS, base_url=None, timeout=30.0):
+        sources = sources or SOURCES
+        self.sources = {
+            name: (rebase_url(url, base_url) if base_url else url, kind)
+            for name, (url, kind) in sources.items()
+        }
+        self.cache = ResponseCache(cache_dir, ttl)
+        self.pool = ConnectionPool(max_connections, timeout)
+        self.engine_id = "Fire-Ingest-Engine-v1"
+
+    async def fetch_source(self, name):
+        url, kind = self.sources[name]
+        started = time.perf_counter()
+        meta = self.cache.get(url)
+        cached = self.cache.load_incidents(url) if meta else None
+
+        headers = {}
+        if meta and cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        result = {"source": name, "url": url}
+        try:
+            status, response_headers, body = await self.pool.request(url, headers)
+        except (OSError, asyncio.TimeoutError) + RESPONSE_ERRORS as error:
+            status, body, response_headers = None, b'', {}
+            result["error"] = str(error) or type(error).__name__
+
+        if status == 304 and cached is not None:
+            self.cache.touch(url, meta)
+            result.update({"status": "NOT_MODIFIED", "changed": False, "incidents": cached})
+        elif status == 200:
+            try:
+                incidents = normalize_payload(kind, body)
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                # A malformed 200 must not replace the cache or sink the other sources
+                result["error"] = f"Unparseable payload: {error}"
+            else:
+                self.cache.store(url, response_headers, body, incidents)
+                result.update({"status": "UPDATED", "changed": True, "incidents": incidents,
+                               "bytes": len(body)})
+        if "status" not in result:
+            # Like Promise.allSettled: a failed source falls back to its last good copy
+            result.setdefault("error", f"HTTP {status}")
+            result.update({"status": "STALE_CACHE" if cached is not None else "FAILED",
+                           "changed": False, "incidents": cached or []})
+
+        result["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def ingest(self):
+        """Fetch all sources at once and merge them"""
+        print(f"[{self.engine_id}] Fetching {len(self.sources)} sources concurrently...")
+        evicted = self.cache.evict()
+        started = time.perf_counter()
+        try:
+            results = await asyncio.gather(*(self.fetch_source(name) for name in self.sources))
+        finally:
+            await self.pool.close()
+
+        incidents = merge_incidents(r["incidents"] for r in results)
+        for r in results:
+            print(f"[INGEST] {r['source']}: {r['status']} "
+                  f"({len(r['incidents'])} incidents, {r['ms']} ms)")
+
+        return {
+            "generated": build_time_utc().isoformat(timespec='seconds'),
+            "changed": any(r["changed"] for r in results),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            "connections_opened": self.pool.opened,
+            "connections_reused": self.pool.reused,
+            "cache_evicted": evicted,
+            "sources": [{k: v for k, v in r.items() if k != "incidents"} for r in results],
+            "count": len(incidents),
+            "incidents": incidents
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent conditional CAL FIRE ingest")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=sorted(SOURCES))
+    parser.add_argument("--base-url", default=None,
+                        help="Rebase every source, e.g. http://127.0.0.1:8765 for the stand-in")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL)
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    parser.add_argument("--output", default=None, help="Write the merged incidents as JSON")
+    args = parser.parse_args()
+
+    engine = FireIngestEngine({name: SOURCES[name] for name in args.sources}, args.cache_dir,
+                              args.ttl, args.max_connections, args.base_url)
+    result = asyncio.run(engine.ingest())
+
+    if args.output and (result["changed"] or not os.path.exists(args.output)):
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({k: result[k] for k in ("generated", "count", "incidents")}, f,
+                      separators=(',', ':'))
+        print(f"[INGEST] {result['count']} merged incidents written to {args.output}")
+
+    print(json.dumps({k: v for k, v in result.items() if k != "incidents"}, indent=2))
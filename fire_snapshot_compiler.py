@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+FIRE SNAPSHOT COMPILER
+Regenerates app/lib/embeddedFireData.ts from a CAL FIRE GeoJSON feed at build time
+
+Normalizes every feature into the FireIncident shape used by calFireGeoJson.ts
+(same status rules and personnel/structure estimates as convertToFireIncident),
+sorts largest fires first and writes a compact TS module plus a JSON data file,
+so first paint shows fresh data without waiting on fetchActiveFiresGeoJson.
+The feed is streamed one feature at a time (geojson_stream.py), and a local
+GeoJSON file (see fixtures/) can stand in for the live feed.
+"""
+
+import argparse
+import json
+import math
+import os
+
+from build_reproducibility import build_time_utc
+from geojson_stream import iter_features
+
+CAL_FIRE_BASE = 'https://incidents.fire.ca.gov/umbraco/api/IncidentApi/GeoJsonList'
+CAL_FIRE_GEOJSON_ACTIVE = f'{CAL_FIRE_BASE}?inactive=false'
+
+MODULE_PATH = 'app/lib/embeddedFireData.ts'
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+
+URBAN_KEYWORDS = ['City', 'Town', 'Community', 'Residential']
+
+# Field order of the FireIncident interface, used for stable output
+INCIDENT_FIELDS = [
+    'id', 'name', 'county', 'lat', 'lng', 'acres', 'containment', 'status',
+    'personnel', 'structures_threatened', 'evacuation_orders', 'started_date',
+    'cause', 'timestamp', 'location', 'adminUnit', 'url'
+]
+
+
+def estimate_personnel(acres):
+    """Estimate personnel based on fire size (mirrors estimatePersonnel)"""
+    if acres < 100:
+        return 50
+    if acres < 500:
+        return 150
+    if acres < 1000:
+        return 300
+    if acres < 5000:
+        return 500
+    if acres < 10000:
+        return 800
+    if acres < 50000:
+        return 1500
+    return 2000
+
+
+def _js_round(value):
+    """Math.round semantics: halves round towards +infinity"""
+    return math.floor(value + 0.5)
+
+
+def estimate_structures(acres, location):
+    """Estimate structures threatened (mirrors estimateStructures)"""
+    location = (location or '').lower()
+    is_near_urban = any(keyword.lower() in location for keyword in URBAN_KEYWORDS)
+    base_threat = _js_round(acres / 100)
+    return base_threat * 3 if is_near_urban else base_threat
+
+
+def incident_status(props):
+    """CAL FIRE IsActive flag is the source of truth (mirrors convertToFireIncident)"""
+    if props.get('ExtinguishedDate'):
+        return 'Controlled'
+    if props.get('IsActive') is True:
+        return 'Contained' if (props.get('PercentContained') or 0) >= 98 else 'Active'
+    return 'Controlled'
+
+
+def convert_to_fire_incident(feature):
+    """Convert one CAL FIRE GeoJSON feature to the FireIncident shape"""
+    props = feature.get('properties') or {}
+    acres_burned = props.get('AcresBurned') or 0
+    containment = props.get('PercentContained') or 0
+    location = props.get('Location') or ''
+
+    incident = {
+        'id': props.get('UniqueId'),
+        'name': (props.get('Name') or '').strip(),
+        'county': (props.get('County') or '').split(',')[0].strip(),
+        'lat': props.get('Latitude'),
+        'lng': props.get('Longitude'),
+        'acres': _js_round(acres_burned),
+        'containment': containment,
+        'status': incident_status(props),
+        'started_date': props.get('StartedDateOnly'),
+        'cause': (props.get('Cause') or '').strip() or None,
+        'timestamp': props.get('Updated'),
+        'location': location,
+        'adminUnit': props.get('AdminUnit'),
+        'url': props.get('Url'),
+        'personnel': estimate_personnel(acres_burned),
+        'structures_threatened': estimate_structures(acres_burned, location),
+        'evacuation_orders': acres_burned > 1000 and containment < 50
+    }
+
+    return {
+        field: incident[field]
+        for field in INCIDENT_FIELDS
+        if incident.get(field) is not None
+    }
+
+
+def sort_incidents(incidents):
+    """Largest fires first, ties broken by id for a stable snapshot"""
+    return sorted(incidents, key=lambda incident: (-incident['acres'], incident['id']))
+
+
+def iter_incidents(source):
+    """Stream a GeoJSON feed (URL, file or open stream) as FireIncident dicts"""
+    for feature in iter_features(source):
+        if (feature.get('properties') or {}).get('UniqueId'):
+            yield convert_to_fire_incident(feature)
+
+
+def render_module(incidents, last_updated):
+    """Render the embedded snapshot as a compact TypeScript module"""
+    rows = ",\n".join(
+        "  " + json.dumps(incident, separators=(',', ':'), ensure_ascii=False)
+        for incident in incidents
+    )
+    return f"""/**
+ * Embedded fire data for fast initial loading
+ * Generated at build time by fire_snapshot_compiler.py - do not edit by hand
+ * Background updates via CORS proxy refresh this data
+ */
+import type {{ FireIncident }} from './calFireGeoJson';
+
+export const LAST_UPDATED = {json.dumps(last_updated)};
+
+export const EMBEDDED_FIRE_DATA: FireIncident[] = [
+{rows}
+];
+"""
+
+
+class FireSnapshotCompiler:
+    """Build the embedded fire snapshot from a CAL FIRE feed"""
+
+    def __init__(self, source=CAL_FIRE_GEOJSON_ACTIVE, module_path=MODULE_PATH,
+                 snapshot_path=SNAPSHOT_PATH):
+        self.source = source
+        self.module_path = module_path
+        self.snapshot_path = snapshot_path
+        self.compiler_id = "Fire-Snapshot-Compiler-v1"
+
+    def build_snapshot(self, incidents):
+        """Sort normalized incidents into a snapshot"""
+        incidents = list(incidents)
+        return {
+            "generated": build_time_utc().isoformat(timespec='seconds'),
+            "source": self.source,
+            "count": len(incidents),
+            "incidents": sort_incidents(incidents)
+        }
+
+    def write_snapshot(self, snapshot):
+        """Write the TS module and the JSON data file"""
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        with open(self.snapshot_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'), ensure_ascii=False)
+
+        with open(self.module_path, 'w') as f:
+            f.write(render_module(snapshot["incidents"], snapshot["generated"]))
+
+    def compile(self):
+        """Fetch, normalize and emit the snapshot"""
+        print(f"[{self.compiler_id}] Loading feed from {self.source}...")
+
+        snapshot = self.build_snapshot(iter_incidents(self.source))
+        self.write_snapshot(snapshot)
+
+        print(f"[SNAPSHOT] {snapshot['count']} incidents written to "
+              f"{self.module_path} and {self.snapshot_path}")
+
+        return {
+            "status": "complete",
+            "incidents": snapshot["count"],
+            "generated": snapshot["generated"],
+            "module": self.module_path,
+            "snapshot": self.snapshot_path
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the embedded fire snapshot")
+    parser.add_argument("--source", default=CAL_FIRE_GEOJSON_ACTIVE,
+                        help="Feed URL or local GeoJSON fixture")
+    parser.add_argument("--module", default=MODULE_PATH)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    compiler = FireSnapshotCompiler(args.source, args.module, args.snapshot)
+    result = compiler.compile()
+    print(json.dumps(result, indent=2))
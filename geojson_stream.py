@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+GEOJSON STREAM
+Incremental FeatureCollection reader for the multi-year all-fires feed
+
+fetchAllFiresGeoJson holds the whole historical response in memory before
+mapping features. iter_features() instead yields one feature at a time from a
+file or URL: through ijson when it is installed, otherwise through a built-in
+reader that walks the top-level object over a bounded sliding buffer. It finds
+where each value ends with a structural scan whose state survives buffer
+refills, then decodes the value once with json.JSONDecoder.raw_decode, so a
+feature spanning many chunks costs linear rather than quadratic time. Peak
+memory stays at roughly one chunk plus one feature regardless of feed size. fire_snapshot_compiler.iter_incidents() normalizes the
+stream for the snapshot and archive stages.
+"""
+
+import argparse
+import io
+import json
+import re
+import time
+import tracemalloc
+import urllib.request
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+
+_STRUCTURAL_RE = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_SCALAR_END_RE = re.compile(r'[,\]}\s]')
+
+
+def open_source(source, binary=False):
+    """Open a feed URL or local file for streaming reads"""
+    if source.startswith(('http://', 'https://')):
+        request = urllib.request.Request(source, headers={'Accept': 'application/json'})
+        response = urllib.request.urlopen(request, timeout=30)
+        return response if binary else io.TextIOWrapper(response, encoding='utf-8')
+    return open(source, 'rb') if binary else open(source, 'r', encoding='utf-8')
+
+
+class _FeatureReader:
+    """Pull parser over the top level of a FeatureCollection"""
+
+    def __init__(self, stream, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        # Grow reads with a value in progress, so appending to the buffer stays amortized linear
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+        self.buffer += chunk
+
+    def _peek(self):
+        """Next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError("unexpected end of GeoJSON stream")
+            self._fill()
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, got {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def _value_end(self):
+        """Offset just past the value starting at pos, reading more input as needed
+
+        Offsets are kept relative to pos because _fill() may drop the consumed
+        prefix; the scan resumes where it stopped instead of starting over.
+        """
+        first = self._peek()
+        if first not in '{["':
+            # Scalar: runs until a delimiter (a number may continue in the next chunk)
+            offset = 0
+            while True:
+                match = _SCALAR_END_RE.search(self.buffer, self.pos + offset)
+                if match:
+                    return match.start() - self.pos
+                offset = len(self.buffer) - self.pos
+                if self.eof:
+                    return offset
+                self._fill()
+
+        offset = 0
+        depth = 0
+        in_string = False
+        while True:
+            if in_string:
+                match = _STRING_SPECIAL_RE.search(self.buffer, self.pos + offset)
+            else:
+                match = _STRUCTURAL_RE.search(self.buffer, self.pos + offset)
+            if match is None or (match.group() == '\\' and match.end() >= len(self.buffer)):
+                # Rescan a trailing backslash once its escaped character has arrived
+                offset = (match.start() if match else len(self.buffer)) - self.pos
+                if self.eof:
+                    raise ValueError("unexpected end of GeoJSON stream")
+                self._fill()
+                continue
+            char = match.group()
+            offset = match.end() - self.pos
+            if char == '\\':
+                offset += 1
+            elif char == '"':
+                in_string = not in_string
+                if not in_string and depth == 0:
+                    return offset
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return offset
+
+    def _value(self):
+        """Decode one complete JSON value, reading more input as needed"""
+        # _value_end() may shift the buffer, so read pos only afterwards
+        offset = self._value_end()
+        end = self.pos + offset
+        value, decoded_end = self.decoder.raw_decode(self.buffer[:end], self.pos)
+        self.pos = decoded_end
+        return value
+
+    def features(self):
+        self._expect('{')
+        while self._peek() != '}':
+            if self._peek() == ',':
+                self.pos += 1
+            key = self._value()
+            self._expect(':')
+            if key != 'features':
+                self._value()
+                continue
+
+            self._expect('[')
+            while self._peek() != ']':
+                if self._peek() == ',':
+                    self.pos += 1
+                    continue
+                yield self._value()
+            self.pos += 1
+
+
+def iter_features(source, chunk_size=DEFAULT_CHUNK_SIZE, backend=None):
+    """Yield GeoJSON features one at a time from a path, URL or open stream"""
+    backend = backend or ('ijson' if ijson is not None else 'builtin')
+    owned = isinstance(source, str)
+    stream = open_source(source, binary=backend == 'ijson') if owned else source
+    try:
+        if backend == 'ijson':
+            yield from ijson.items(stream, 'features.item', use_float=True)
+        else:
+            yield from _FeatureReader(stream, chunk_size).features()
+    finally:
+        if owned:
+            stream.close()
+
+
+def measure(source, backend=None):
+    """Feature count, seconds and peak traced memory for streaming vs json.load"""
+    results = {}
+    for mode in ('stream', 'json.load'):
+        tracemalloc.start()
+        started = time.perf_counter()
+        if mode == 'stream':
+            count = sum(1 for _ in iter_features(source, backend=backend))
+        else:
+            with open_source(source) as f:
+                count = len(json.load(f).get('features', []))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[mode] = {"features": count, "seconds": round(elapsed, 3), "peak_bytes": peak}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream features from a GeoJSON feed")
+    parser.add_argument("source", help="Feed URL or local GeoJSON file")
+    parser.add_argument("--backend", choices=["ijson", "builtin"], default=None)
+    args = parser.parse_args()
+
+    print(f"[STREAM] Backend: {args.backend or ('ijson' if ijson is not None else 'builtin')}")
+    print(json.dumps(measure(args.source, args.backend), indent=2))
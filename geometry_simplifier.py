@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+GEOMETRY SIMPLIFIER
+Per-zoom levels of detail for the county polygons and fire perimeter layers
+
+Lines are simplified with Douglas-Peucker (NumPy distance per split) or
+Visvalingam-Whyatt (NumPy triangle areas, heap-ordered removal) at a tolerance
+of --pixels screen pixels for each zoom in --zooms. Points are measured in Web
+Mercator, so the tolerance shrinks in latitude by cos(lat) like the map does.
+The counties come from the TopoJSON written by county_geometry_encoder.py:
+each shared arc is simplified once, so neighbouring counties keep an identical
+border with no slivers or gaps. Other assets are simplified ring by ring.
+Each level is written as public/data/<asset>.z<zoom>.geojson, and
+public/data/geometry-lod.json lists the levels with their vertex counts, so
+the map loads the coarsest level that still looks exact at the current zoom.
+"""
+
+import argparse
+import heapq
+import json
+import os
+
+import numpy as np
+
+ASSETS = {
+    "california-counties": 'public/data/california-counties.topo.json',
+    "fire-perimeters": 'public/data/fire-perimeters.geojson'
+}
+OUTPUT_DIR = 'public/data'
+INDEX_PATH = 'public/data/geometry-lod.json'
+DEFAULT_ZOOMS = [5, 7, 9]
+DEFAULT_PIXELS = 1.0
+TILE_SIZE = 256
+
+
+def zoom_tolerance(zoom, pixels=DEFAULT_PIXELS):
+    """Degrees covered by `pixels` screen pixels at a Web Mercator zoom"""
+    return pixels * 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def mercator(points):
+    """Longitude and Web Mercator y, both in degrees of longitude at the equator"""
+    projected = np.array(points, dtype=np.float64)
+    latitude = np.radians(np.clip(projected[:, 1], -85.0511, 85.0511))
+    projected[:, 1] = np.degrees(np.log(np.tan(np.pi / 4 + latitude / 2)))
+    return projected
+
+
+def _segment_distances(points, start, end):
+    """Distance of every point to the segment start-end"""
+    direction = end - start
+    length_sq = float(direction @ direction)
+    if length_sq == 0:
+        return np.hypot(*(points - start).T)
+    t = np.clip((points - start) @ direction / length_sq, 0, 1)
+    projection = start + t[:, None] * direction
+    return np.hypot(*(points - projection).T)
+
+
+def douglas_peucker(points, tolerance):
+    """Keep-mask for an open polyline"""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distances(points[first + 1:last], points[first], points[last])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.extend([(first, split), (split, last)])
+    return keep
+
+
+def _triangle_areas(points):
+    a, b, c = points[:-2], points[1:-1], points[2:]
+    return 0.5 * np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1])
+                        - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1]))
+
+
+def visvalingam(points, tolerance):
+    """Keep-mask for an open polyline, dropping the smallest effective areas first"""
+    count = len(points)
+    keep = np.ones(count, dtype=bool)
+    if count < 3:
+        return keep
+
+    threshold = tolerance * tolerance
+    areas = np.full(count, np.inf)
+    areas[1:-1] = _triangle_areas(points)
+    previous = np.arange(-1, count - 1)
+    following = np.arange(1, count + 1)
+    heap = [(area, index) for index, area in enumerate(areas[1:-1].tolist(), start=1)]
+    heapq.heapify(heap)
+
+    def area(index):
+        a, b, c = points[previous[index]], points[index], points[following[index]]
+        return 0.5 * abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1]))
+
+    while heap:
+        value, index = heapq.heappop(heap)
+        if not keep[index] or value != areas[index]:
+            continue
+        if value >= threshold:
+            break
+        keep[index] = False
+        before, after = previous[index], following[index]
+        following[before], previous[after] = after, before
+        for neighbour in (before, after):
+            if 0 < neighbour < count - 1:
+                # An effective area never shrinks below the point just removed
+                areas[neighbour] = max(area(neighbour), value)
+                heapq.heappush(heap, (areas[neighbour], neighbour))
+    return keep
+
+
+METHODS = {"douglas-peucker": douglas_peucker, "visvalingam": visvalingam}
+
+
+def line_mask(points, tolerance, method="douglas-peucker"):
+    """Keep-mask for an open or closed line, measured in Web Mercator"""
+    projected = mercator(points)
+    simplify = METHODS[method]
+    if len(projected) < 3 or not np.array_equal(projected[0], projected[-1]):
+        return simplify(projected, tolerance)
+
+    # Split closed lines at the vertex farthest from the start so neither half is degenerate
+    split = int(np.argmax(np.hypot(*(projected - projected[0]).T)))
+    keep = np.zeros(len(projected), dtype=bool)
+    keep[:split + 1] |= simplify(projected[:split + 1], tolerance)
+    keep[split:] |= simplify(projected[split:], tolerance)
+    return keep
+
+
+def simplify_ring(ring, tolerance, method="douglas-peucker"):
+    """Simplify a closed ring, keeping it a valid ring of at least 4 positions"""
+    points = np.asarray(ring, dtype=np.float64)
+    if len(points) <= 4:
+        return points
+
+    simplified = points[line_mask(points, tolerance, method)]
+    if len(simplified) < 4:
+        simplified = points[[0, len(points) // 3, 2 * len(points) // 3, -1]]
+    return simplified
+
+
+def simplify_geometry(geometry, tolerance, method):
+    """Simplified copy of a Polygon or MultiPolygon and its vertex count"""
+    def polygon(rings):
+        simplified = [simplify_ring(ring, tolerance, method) for ring in rings]
+        return [np.round(ring, 6).tolist() for ring in simplified], sum(len(r) for r in simplified)
+
+    if geometry['type'] == 'Polygon':
+        coordinates, vertices = polygon(geometry['coordinates'])
+    elif geometry['type'] == 'MultiPolygon':
+        parts = [polygon(rings) for rings in geometry['coordinates']]
+        coordinates, vertices = [p[0] for p in parts], sum(p[1] for p in parts)
+    else:
+        return geometry, 0
+    return {"type": geometry['type'], "coordinates": coordinates}, vertices
+
+
+def decode_arcs(topology):
+    """Absolute coordinates of every quantized, delta-encoded topology arc"""
+    scale = np.asarray(topology['transform']['scale'], dtype=np.float64)
+    translate = np.asarray(topology['transform']['translate'], dtype=np.float64)
+    return [np.cumsum(np.asarray(arc, dtype=np.float64), axis=0) * scale + translate
+            for arc in topology['arcs']]
+
+
+def _ring_length(ring, masks):
+    """Positions in a ring stitched from the kept points of its arcs"""
+    return 1 + sum(int(masks[index if index >= 0 else ~index].sum()) - 1 for index in ring)
+
+
+def _restore_ring(ring, masks, arcs):
+    """Keep one more point on the ring's longest arc; False when none is left"""
+    best = None
+    for index in ring:
+        arc = index if index >= 0 else ~index
+        dropped = np.flatnonzero(~masks[arc])
+        if len(dropped) and (best is None or len(arcs[arc]) > len(arcs[best[0]])):
+            best = (arc, dropped)
+    if best is None:
+        return False
+    arc, dropped = best
+    masks[arc][dropped[len(dropped) // 2]] = True
+    return True
+
+
+def stitch_ring(ring, arcs):
+    """Closed ring from arc references (~i means arc i reversed)"""
+    positions = []
+    for i, index in enumerate(ring):
+        arc = arcs[index] if index >= 0 else arcs[~index][::-1]
+        positions.extend(arc if i == 0 else arc[1:])
+    return positions
+
+
+def topology_rings(geometry):
+    """Rings of arc references for each polygon of a topology geometry"""
+    if geometry['type'] == 'Polygon':
+        return [geometry['arcs']]
+    return geometry['arcs']
+
+
+def count_vertices(geometry):
+    if geometry['type'] == 'Polygon':
+        return sum(len(ring) for ring in geometry['coordinates'])
+    if geometry['type'] == 'MultiPolygon':
+        return sum(len(ring) for polygon in geometry['coordinates'] for ring in polygon)
+    return 0
+
+
+class GeometrySimplifier:
+    """Write per-zoom simplified copies of GeoJSON polygon assets"""
+
+    def __init__(self, zooms=None, pixels=DEFAULT_PIXELS, method="douglas-peucker",
+                 output_dir=OUTPUT_DIR):
+        self.zooms = sorted(zooms or DEFAULT_ZOOMS)
+        self.pixels = pixels
+        self.method = method
+        self.output_dir = output_dir
+        self.simplifier_id = "Geometry-Simplifier-v1"
+
+    def _write_level(self, name, zoom, tolerance, features, vertices):
+        path = os.path.join(self.output_dir, f"{name}.z{zoom}.geojson")
+        with open(path, 'w') as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f,
+                      separators=(',', ':'))
+        return {
+            "maxZoom": zoom,
+            "tolerance": round(tolerance, 8),
+            "file": '/' + os.path.relpath(path, 'public').replace(os.sep, '/'),
+            "vertices": vertices,
+            "bytes": os.path.getsize(path)
+        }
+
+    def simplify_topology(self, name, source_path, topology):
+        """Simplify every shared arc once per zoom and stitch the counties from them"""
+        arcs = decode_arcs(topology)
+        geometries = topology['objects']['counties']['geometries']
+        rings = [ring for geometry in geometries
+                 for polygon in topology_rings(geometry) for ring in polygon]
+
+        full = [np.ones(len(arc), dtype=bool) for arc in arcs]
+        asset = {
+            "source": source_path,
+            "vertices": sum(_ring_length(ring, full) for ring in rings),
+            "levels": []
+        }
+        for zoom in self.zooms:
+            tolerance = zoom_tolerance(zoom, self.pixels)
+            masks = [line_mask(arc, tolerance, self.method) for arc in arcs]
+            for ring in rings:
+                while _ring_length(ring, masks) < 4 and _restore_ring(ring, masks, arcs):
+                    pass
+            simplified = [np.round(arc[mask], 6).tolist() for arc, mask in zip(arcs, masks)]
+
+            features = []
+            vertices = 0
+            for geometry in geometries:
+                polygons = [[stitch_ring(ring, simplified) for ring in polygon]
+                            for polygon in topology_rings(geometry)]
+                vertices += sum(len(ring) for polygon in polygons for ring in polygon)
+                features.append({
+                    "type": "Feature",
+                    "geometry": {
+                        "type": geometry['type'],
+                        "coordinates": polygons[0] if geometry['type'] == 'Polygon' else polygons
+                    },
+                    "properties": geometry.get('properties', {})
+                })
+            asset["levels"].append(self._write_level(name, zoom, tolerance, features, vertices))
+        return asset
+
+    def simplify_asset(self, name, source_path):
+        with open(source_path, 'r') as f:
+            collection = json.load(f)
+        if collection.get('type') == 'Topology':
+            return self.simplify_topology(name, source_path, collection)
+        features = collection.get('features', [])
+
+        asset = {
+            "source": source_path,
+            "vertices": sum(count_vertices(f['geometry']) for f in features if f.get('geometry')),
+            "levels": []
+        }
+        for zoom in self.zooms:
+            tolerance = zoom_tolerance(zoom, self.pixels)
+            simplified = []
+            vertices = 0
+            for feature in features:
+                if not feature.get('geometry'):
+                    continue
+                geometry, count = simplify_geometry(feature['geometry'], tolerance, self.method)
+                simplified.append({"type": "Feature", "geometry": geometry,
+                                   "properties": feature.get('properties', {})})
+                vertices += count
+            asset["levels"].append(self._write_level(name, zoom, tolerance, simplified, vertices))
+        return asset
+
+    def simplify_all(self, assets=None, index_path=INDEX_PATH):
+        print(f"[{self.simplifier_id}] {self.method} levels for zooms {self.zooms}...")
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        index = {"method": self.method, "pixels": self.pixels, "assets": {}}
+        for name, source_path in (assets or ASSETS).items():
+            if not os.path.exists(source_path):
+                print(f"[LOD] {source_path} not found, skipping")
+                continue
+            asset = self.simplify_asset(name, source_path)
+            index["assets"][name] = asset
+            levels = ", ".join(f"z{level['maxZoom']}: {level['vertices']}" for level in asset["levels"])
+            print(f"[LOD] {name}: {asset['vertices']} vertices -> {levels}")
+
+        with open(index_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate per-zoom simplified geometry")
+    parser.add_argument("--zooms", type=int, nargs="+", default=DEFAULT_ZOOMS)
+    parser.add_argument("--pixels", type=float, default=DEFAULT_PIXELS,
+                        help="Tolerance in screen pixels at each zoom")
+    parser.add_argument("--method", choices=sorted(METHODS), default="douglas-peucker")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--index", default=INDEX_PATH)
+    args = parser.parse_args()
+
+    simplifier = GeometrySimplifier(args.zooms, args.pixels, args.method, args.output_dir)
+    print(json.dumps(simplifier.simplify_all(index_path=args.index), indent=2))
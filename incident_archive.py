@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+INCIDENT ARCHIVE
+Columnar historical store for normalized fire snapshots
+
+Every appended snapshot becomes one row per incident, partitioned by the month
+the incident started (archive/YYYY-MM/). Each flush adds a new part directory
+to its month rather than rewriting it, with NumPy .npy columns, or a single
+Parquet file when pyarrow is installed. Strings are dictionary-encoded, each
+part carries sorted id and county indexes, and catalog.json records the parts
+and counties of every partition, so time-range and county queries only open
+the parts and rows they need. A month that reaches --max-parts parts is
+compacted back into one, so refreshes do not grow the file count without
+bound. The dictionary is saved before any part that uses its codes, and the
+catalog is replaced once the whole snapshot is on disk, so an interrupted
+append leaves only unreferenced parts behind. Precomputed
+aggregates for the Fire Lore views are exported as JSON. --feed streams a raw
+multi-year GeoJSON feed straight into the archive in bounded row batches.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+
+from build_reproducibility import build_time_utc
+from fire_snapshot_compiler import iter_incidents
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+ARCHIVE_DIR = 'archive'
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+AGGREGATES_PATH = 'public/data/fire-lore-aggregates.json'
+
+STATUSES = ['Active', 'Contained', 'Controlled']
+SEASON_NAMES = ['Winter', 'Spring', 'Summer', 'Fall']
+# Season code per calendar month (index 1-12; December counts as Winter)
+MONTH_SEASON = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+
+COLUMNS = {
+    'snapshot_ts': np.int64,
+    'started_day': np.int32,
+    'id_code': np.int32,
+    'county_code': np.int32,
+    'lat': np.float32,
+    'lng': np.float32,
+    'acres': np.float64,
+    'containment': np.float32,
+    'status': np.uint8
+}
+INDEXED_COLUMNS = ['id_code', 'county_code']
+DEFAULT_FLUSH_ROWS = 50000
+DEFAULT_MAX_PARTS = 8
+
+_EPOCH_DAY = datetime(1970, 1, 1).date()
+
+
+def _parse_timestamp(value):
+    """ISO timestamp to epoch seconds (UTC)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _parse_day(value):
+    """YYYY-MM-DD to days since epoch, or None"""
+    try:
+        return (datetime.strptime(value[:10], '%Y-%m-%d').date() - _EPOCH_DAY).days
+    except (TypeError, ValueError):
+        return None
+
+
+def _day_to_month(day):
+    return datetime.fromordinal(_EPOCH_DAY.toordinal() + int(day)).strftime('%Y-%m')
+
+
+class IncidentArchive:
+    """Append-only, month-partitioned columnar incident history"""
+
+    def __init__(self, root=ARCHIVE_DIR, use_parquet=None, max_parts=DEFAULT_MAX_PARTS):
+        self.root = root
+        self.max_parts = max_parts
+        self.use_parquet = (pyarrow is not None) if use_parquet is None else use_parquet
+        self.archive_id = "Incident-Archive-v1"
+        self.catalog = self._read_json('catalog.json', {"partitions": {}, "snapshots": []})
+        self.dictionary = self._read_json('dictionary.json', {"ids": [], "names": [], "counties": []})
+        self._id_codes = {value: code for code, value in enumerate(self.dictionary["ids"])}
+        self._county_codes = {value: code for code, value in enumerate(self.dictionary["counties"])}
+        self._array_cache = {}
+
+    def _read_json(self, name, default):
+        try:
+            with open(os.path.join(self.root, name), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def _write_json(self, name, data):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, name)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+    def _encode(self, codes, table, value, names=None, name=None):
+        """Dictionary-encode a string, growing the table on first sight"""
+        if value not in codes:
+            codes[value] = len(table)
+            table.append(value)
+            if names is not None:
+                names.append(name)
+        return codes[value]
+
+    # Partition storage
+
+    def _part_dir(self, month, part):
+        return os.path.join(self.root, month, part)
+
+    def _parts(self, month):
+        return self.catalog["partitions"][month]["parts"]
+
+    def _save_part(self, month, part, columns):
+        partition_dir = self._part_dir(month, part)
+        os.makedirs(partition_dir, exist_ok=True)
+        parquet_path = os.path.join(partition_dir, 'columns.parquet')
+        if self.use_parquet:
+            table = pyarrow.table({name: columns[name] for name in COLUMNS})
+            parquet.write_table(table, parquet_path)
+        else:
+            for name in COLUMNS:
+                np.save(os.path.join(partition_dir, f'{name}.npy'), columns[name])
+            # A stale Parquet file would shadow the fresh .npy columns
+            if os.path.exists(parquet_path):
+                os.remove(parquet_path)
+
+        # Sorted indexes: row order plus the sorted keys for searchsorted
+        for name in INDEXED_COLUMNS:
+            order = np.argsort(columns[name], kind='stable').astype(np.int32)
+            np.save(os.path.join(partition_dir, f'{name}.order.npy'), order)
+            np.save(os.path.join(partition_dir, f'{name}.sorted.npy'), columns[name][order])
+
+    def _load_part(self, month, part, names=None):
+        partition_dir = self._part_dir(month, part)
+        names = names or list(COLUMNS)
+        parquet_path = os.path.join(partition_dir, 'columns.parquet')
+        if os.path.exists(parquet_path):
+            table = parquet.read_table(parquet_path, columns=names)
+            return {name: table.column(name).to_numpy() for name in names}
+        return {name: self._cached_array(month, part, f'{name}.npy') for name in names}
+
+    def _cached_array(self, month, part, filename):
+        """Memory-map a part file once per archive instance"""
+        key = (month, part, filename)
+        if key not in self._array_cache:
+            path = os.path.join(self._part_dir(month, part), filename)
+            self._array_cache[key] = np.load(path, mmap_mode='r')
+        return self._array_cache[key]
+
+    def _index_rows(self, month, part, column, code):
+        """Row numbers in a part whose indexed column equals code"""
+        sorted_keys = self._cached_array(month, part, f'{column}.sorted.npy')
+        left = np.searchsorted(sorted_keys, code, side='left')
+        right = np.searchsorted(sorted_keys, code, side='right')
+        if left == right:
+            return np.empty(0, dtype=np.int32)
+        order = self._cached_array(month, part, f'{column}.order.npy')
+        return np.sort(order[left:right])
+
+    # Appending
+
+    def append_snapshot(self, snapshot):
+        """Append one normalized snapshot as new parts of the touched partitions"""
+        return self.append_incidents(snapshot.get('incidents', []), snapshot.get('generated'))
+
+    def append_incidents(self, incidents, generated=None, flush_rows=DEFAULT_FLUSH_ROWS):
+        """Append an incident iterable (e.g. a feed stream) as one snapshot
+
+        Rows are buffered per month and flushed every flush_rows incidents, so
+        a multi-year stream never has to fit in memory at once. Parts only
+        become visible when the catalog is written at the end.
+        """
+        snapshot_ts = _parse_timestamp(generated or build_time_utc().isoformat())
+        if snapshot_ts in self.catalog["snapshots"]:
+            return {"status": "ALREADY_ARCHIVED", "snapshot_ts": snapshot_ts}
+
+        fallback_day = snapshot_ts // 86400
+        partitions = json.loads(json.dumps(self.catalog["partitions"]))
+        rows_by_month = {}
+        buffered = 0
+        total_rows = 0
+        flushes = 0
+        touched = set()
+        for incident in incidents:
+            day = _parse_day(incident.get('started_date'))
+            day = fallback_day if day is None else day
+            row = (
+                snapshot_ts,
+                day,
+                self._encode(self._id_codes, self.dictionary["ids"], incident['id'],
+                             self.dictionary["names"], incident.get('name')),
+                self._encode(self._county_codes, self.dictionary["counties"],
+                             incident.get('county') or ''),
+                incident.get('lat') or 0.0,
+                incident.get('lng') or 0.0,
+                incident.get('acres') or 0,
+                incident.get('containment') or 0,
+                STATUSES.index(incident['status']) if incident.get('status') in STATUSES else 255
+            )
+            rows_by_month.setdefault(_day_to_month(day), []).append(row)
+            buffered += 1
+            if buffered >= flush_rows:
+                self._flush_rows(rows_by_month, partitions, f'part-{snapshot_ts}-{flushes:04d}')
+                touched.update(rows_by_month)
+                total_rows += buffered
+                flushes += 1
+                rows_by_month, buffered = {}, 0
+
+        self._flush_rows(rows_by_month, partitions, f'part-{snapshot_ts}-{flushes:04d}')
+        touched.update(rows_by_month)
+        total_rows += buffered
+
+        self.catalog = {"partitions": partitions, "snapshots": self.catalog["snapshots"] + [snapshot_ts]}
+        self._write_json('catalog.json', self.catalog)
+        compacted = [month for month in sorted(touched) if self.compact_month(month, snapshot_ts)]
+
+        return {
+            "status": "APPENDED",
+            "snapshot_ts": snapshot_ts,
+            "rows": total_rows,
+            "partitions": sorted(touched),
+            "compacted": compacted
+        }
+
+    def _flush_rows(self, rows_by_month, partitions, part):
+        """Write buffered rows as a new part of each month, recording it in partitions"""
+        if not rows_by_month:
+            return
+        # Codes first: a part on disk never references an unsaved dictionary entry
+        self._write_json('dictionary.json', self.dictionary)
+        for month, rows in rows_by_month.items():
+            columns = {
+                name: np.array([row[i] for row in rows], dtype=dtype)
+                for i, (name, dtype) in enumerate(COLUMNS.items())
+            }
+            self._save_part(month, part, columns)
+            info = partitions.get(month)
+            if info is None:
+                info = partitions[month] = {"rows": 0, "counties": [], "parts": [],
+                                            "min_day": int(columns['started_day'].min()),
+                                            "max_day": int(columns['started_day'].max())}
+            info["parts"].append(part)
+            info["rows"] += len(rows)
+            info["counties"] = sorted(set(info["counties"]) | set(columns['county_code'].tolist()))
+            info["min_day"] = min(info["min_day"], int(columns['started_day'].min()))
+            info["max_day"] = max(info["max_day"], int(columns['started_day'].max()))
+
+    def compact_month(self, month, snapshot_ts, force=False):
+        """Rewrite a month's parts as one once it holds more than max_parts"""
+        parts = self._parts(month)
+        if len(parts) <= 1 or (len(parts) <= self.max_parts and not force):
+            return False
+        loaded = [self._load_part(month, part) for part in parts]
+        columns = {name: np.concatenate([part[name] for part in loaded]) for name in COLUMNS}
+        compacted = f'part-{snapshot_ts}-compact'
+        self._save_part(month, compacted, columns)
+
+        # Switch the catalog first; the old parts are unreferenced from then on
+        self.catalog["partitions"][month]["parts"] = [compacted]
+        self._write_json('catalog.json', self.catalog)
+        self._array_cache = {key: value for key, value in self._array_cache.items() if key[0] != month}
+        for part in parts:
+            if part != compacted:
+                shutil.rmtree(self._part_dir(month, part), ignore_errors=True)
+        return True
+
+    # Queries
+
+    def _partitions(self, start=None, end=None, county_code=None):
+        """Partitions overlapping [start, end] months that hold the county"""
+        for month, info in sorted(self.catalog["partitions"].items()):
+            if start and month < start[:7]:
+                continue
+            if end and month > end[:7]:
+                continue
+            if county_code is not None and county_code not in info["counties"]:
+                continue
+            yield month
+
+    def query(self, start=None, end=None, county=None, incident_id=None, columns=None):
+        """Rows matching a month range and optional county / incident id"""
+        names = columns or list(COLUMNS)
+        county_code = self._county_codes.get(county) if county is not None else None
+        id_code = self._id_codes.get(incident_id) if incident_id is not None else None
+        if (county is not None and county_code is None) or (incident_id is not None and id_code is None):
+            return {name: np.empty(0, dtype=COLUMNS[name]) for name in names}
+
+        pieces = {name: [] for name in names}
+        for month in self._partitions(start, end, county_code):
+            for part in self._parts(month):
+                rows = None
+                if id_code is not None:
+                    rows = self._index_rows(month, part, 'id_code', id_code)
+                if county_code is not None:
+                    county_rows = self._index_rows(month, part, 'county_code', county_code)
+                    rows = county_rows if rows is None else np.intersect1d(rows, county_rows)
+                if rows is not None and not len(rows):
+                    continue
+                loaded = self._load_part(month, part, names)
+                for name in names:
+                    pieces[name].append(loaded[name] if rows is None else loaded[name][rows])
+
+        return {
+            name: np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[name])
+            for name, arrays in pieces.items()
+        }
+
+    def latest_observations(self, rows):
+        """Keep the most recent snapshot row of each incident"""
+        if not len(rows['id_code']):
+            return rows
+        order = np.lexsort((-rows['snapshot_ts'], rows['id_code']))
+        ids = rows['id_code'][order]
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = ids[1:] != ids[:-1]
+        keep = order[first]
+        return {name: values[keep] for name, values in rows.items()}
+
+    def seasonal_acreage(self, start=None, end=None, county=None):
+        """Acres burned per (year, season, county), one observation per incident"""
+        rows = self.latest_observations(self.query(
+            start, end, county,
+            columns=['snapshot_ts', 'started_day', 'id_code', 'county_code', 'acres']
+        ))
+        days = rows['started_day'].astype('datetime64[D]')
+        years = days.astype('datetime64[Y]').astype(np.int64) + 1970
+        months = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        season_codes = MONTH_SEASON[months]
+
+        # Group on (year, season, county) in one pass
+        keys = np.stack([years, season_codes, rows['county_code'].astype(np.int64)], axis=1)
+        if not len(keys):
+            return []
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        acres = np.bincount(inverse, weights=rows['acres'])
+        counts = np.bincount(inverse)
+
+        return [
+            {"year": int(year), "season": SEASON_NAMES[season],
+             "county": self.dictionary["counties"][county_code],
+             "acres": round(float(total), 1), "incidents": int(count)}
+            for (year, season, county_code), total, count in zip(groups.tolist(), acres, counts)
+        ]
+
+    def export_aggregates(self, path=AGGREGATES_PATH):
+        """Precomputed Fire Lore aggregates for the static export"""
+        seasonal = self.seasonal_acreage()
+        by_year = {}
+        for entry in seasonal:
+            year = by_year.setdefault(str(entry["year"]), {"acres": 0.0, "incidents": 0})
+            year["acres"] = round(year["acres"] + entry["acres"], 1)
+            year["incidents"] += entry["incidents"]
+
+        aggregates = {
+            "snapshots": len(self.catalog["snapshots"]),
+            "by_year": by_year,
+            "seasonal_by_county": seasonal
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(aggregates, f, separators=(',', ':'))
+        return aggregates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive snapshots and export Fire Lore aggregates")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--aggregates", default=AGGREGATES_PATH)
+    parser.add_argument("--feed", help="Stream a raw CAL FIRE GeoJSON feed (URL or file) instead of the snapshot")
+    parser.add_argument("--max-parts", type=int, default=DEFAULT_MAX_PARTS,
+                        help="Compact a month back into one part once it has more parts than this")
+    parser.add_argument("--county", help="Print seasonal acreage for one county")
+    parser.add_argument("--start", help="YYYY-MM range start")
+    parser.add_argument("--end", help="YYYY-MM range end")
+    args = parser.parse_args()
+
+    archive = IncidentArchive(args.archive, max_parts=args.max_parts)
+    print(f"[{archive.archive_id}] Using {'Parquet' if archive.use_parquet else 'NumPy'} columns in {args.archive}")
+
+    if args.feed:
+        print(f"[ARCHIVE] Streaming {args.feed}...")
+        print(f"[ARCHIVE] {json.dumps(archive.append_incidents(iter_incidents(args.feed)))}")
+    elif os.path.exists(args.snapshot):
+        with open(args.snapshot, 'r') as f:
+            print(f"[ARCHIVE] {json.dumps(archive.append_snapshot(json.load(f)))}")
+
+    if args.county or args.start or args.end:
+        result = archive.seasonal_acreage(args.start, args.end, args.county)
+    else:
+        result = archive.export_aggregates(args.aggregates)
+        print(f"[ARCHIVE] Aggregates written to {args.aggregates}")
+    print(json.dumps(result, indent=2))
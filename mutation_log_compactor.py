@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+MUTATION LOG COMPACTOR
+Folds every mutation log into one bounded rolling summary for the forensic view
+
+Sources are the curated logs (MUTATION_LOG.json, SSR_PERSISTENCE_MUTATION_LOG.json,
+CRITICAL_CONTRADICTION_LOG.json), the per-run logs written by the bypass, wrapper
+and scaffolding (mutation_log_*, scaffold_log_*, contradiction_*) and optional
+browser exports of the logMutation / logApiCall / logPerimeterMutation arrays.
+Events are merged in time order and consecutive identical events become counted
+runs. Runs older than --recent-hours, or beyond --max-recent, are downsampled
+into per-bucket counts by source and action, and at most --max-buckets buckets
+are kept. MUTATION_SUMMARY.json records which files were already folded and
+how many events each held, so each run only reads new or grown logs and only
+folds the entries appended since; --prune then deletes folded per-run files.
+"""
+
+import argparse
+import fnmatch
+import glob
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from build_reproducibility import build_time_utc
+
+SUMMARY_PATH = 'MUTATION_SUMMARY.json'
+CURATED_LOGS = ['MUTATION_LOG.json', 'SSR_PERSISTENCE_MUTATION_LOG.json', 'CRITICAL_CONTRADICTION_LOG.json']
+RUN_LOG_PATTERNS = ['mutation_log_*.json', 'scaffold_log_*.json', 'contradiction_*.json']
+EVENT_LIST_KEYS = ('mutations', 'mutation_log', 'violations')
+
+DEFAULT_RECENT_HOURS = 24
+DEFAULT_MAX_RECENT = 200
+DEFAULT_BUCKET_HOURS = 24
+DEFAULT_MAX_BUCKETS = 365
+MAX_BUCKET_TARGETS = 5
+
+
+def _parse_time(value):
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+def normalize_event(event, default_source, default_time):
+    """Common shape for Python and browser log entries"""
+    data = event.get('data') if isinstance(event.get('data'), dict) else {}
+    moment = _parse_time(event.get('timestamp')) or default_time
+    return {
+        "time": moment,
+        "source": str(event.get('source') or event.get('bypass_id') or event.get('component')
+                      or event.get('dataSource') or default_source),
+        "action": str(event.get('action') or event.get('type') or event.get('failure_mode')
+                      or event.get('contradiction_id') or event.get('mutation_id') or 'EVENT'),
+        "target": str(event.get('target') or event.get('file') or event.get('fireId')
+                      or event.get('id') or data.get('url') or '')
+    }
+
+
+def read_events(path):
+    """Normalized events from one log file, in whichever layout it uses"""
+    with open(path, 'r') as f:
+        content = json.load(f)
+
+    default_time = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    default_source = os.path.splitext(os.path.basename(path))[0]
+    if isinstance(content, list):
+        entries = content
+    else:
+        default_time = _parse_time(content.get('timestamp')) or default_time
+        default_source = (content.get('bypass_id') or content.get('scaffold_id')
+                          or content.get('wrapper_id') or default_source)
+        entries = next((content[key] for key in EVENT_LIST_KEYS if isinstance(content.get(key), list)),
+                       [content])
+    return [normalize_event(entry, default_source, default_time)
+            for entry in entries if isinstance(entry, dict)]
+
+
+def _signature(record):
+    return (record["source"], record["action"], record["target"])
+
+
+def collapse_runs(runs):
+    """Merge time-adjacent records with the same source, action and target"""
+    collapsed = []
+    for run in sorted(runs, key=lambda r: r["first"]):
+        if collapsed and _signature(collapsed[-1]) == _signature(run):
+            collapsed[-1]["count"] += run["count"]
+            collapsed[-1]["last"] = max(collapsed[-1]["last"], run["last"])
+        else:
+            collapsed.append(dict(run))
+    return collapsed
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class MutationLogCompactor:
+    """Maintain the bounded rolling mutation summary"""
+
+    def __init__(self, summary_path=SUMMARY_PATH, recent_hours=DEFAULT_RECENT_HOURS,
+                 max_recent=DEFAULT_MAX_RECENT, bucket_hours=DEFAULT_BUCKET_HOURS,
+                 max_buckets=DEFAULT_MAX_BUCKETS):
+        self.summary_path = summary_path
+        self.recent_window = timedelta(hours=recent_hours)
+        self.max_recent = max_recent
+        self.bucket_seconds = int(bucket_hours * 3600)
+        self.max_buckets = max_buckets
+        self.compactor_id = "Mutation-Log-Compactor-v1"
+
+    def discover_sources(self, extra=()):
+        paths = [p for p in CURATED_LOGS if os.path.exists(p)]
+        for pattern in RUN_LOG_PATTERNS:
+            paths.extend(sorted(glob.glob(pattern)))
+        return paths + [p for p in extra if os.path.exists(p)]
+
+    def _load_summary(self):
+        try:
+            with open(self.summary_path, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return {"folded_files": {}, "totals": {"events": 0, "by_action": {}},
+                    "recent": [], "history": [], "dropped": {"buckets": 0, "events": 0}}
+        for run in summary["recent"]:
+            run["first"], run["last"] = _parse_time(run["first"]), _parse_time(run["last"])
+        return summary
+
+    def _bucket_start(self, moment):
+        seconds = int(moment.timestamp()) // self.bucket_seconds * self.bucket_seconds
+        return _iso(datetime.fromtimestamp(seconds, timezone.utc))
+
+    def _downsample(self, history, runs):
+        """Fold runs into per-bucket counts by source and action"""
+        buckets = {(b["bucket"], b["source"], b["action"]): b for b in history}
+        for run in runs:
+            key = (self._bucket_start(run["first"]), run["source"], run["action"])
+            bucket = buckets.setdefault(key, {
+                "bucket": key[0], "source": key[1], "action": key[2],
+                "count": 0, "runs": 0, "targets": []
+            })
+            bucket["count"] += run["count"]
+            bucket["runs"] += 1
+            if run["target"] and run["target"] not in bucket["targets"] \
+                    and len(bucket["targets"]) < MAX_BUCKET_TARGETS:
+                bucket["targets"].append(run["target"])
+        return sorted(buckets.values(), key=lambda b: (b["bucket"], b["source"], b["action"]))
+
+    def compact(self, extra_sources=(), prune=False):
+        print(f"[{self.compactor_id}] Compacting mutation logs into {self.summary_path}...")
+        summary = self._load_summary()
+        folded = dict(summary["folded_files"])
+
+        new_files = [p for p in self.discover_sources(extra_sources)
+                     if folded.get(p, {}).get("key") != _file_key(p)]
+        events = []
+        for path in new_files:
+            try:
+                file_events = read_events(path)
+            except (OSError, ValueError) as error:
+                print(f"[COMPACT] Skipping unreadable {path}: {error}")
+                continue
+            # Logs grow by appending; a file with fewer events than folded was replaced
+            already = folded.get(path, {}).get("events", 0)
+            events.extend(file_events[already:] if already <= len(file_events) else file_events)
+            folded[path] = {"key": _file_key(path), "events": len(file_events)}
+
+        for event in events:
+            summary["totals"]["events"] += 1
+            by_action = summary["totals"]["by_action"]
+            by_action[event["action"]] = by_action.get(event["action"], 0) + 1
+
+        runs = collapse_runs(summary["recent"] + [
+            {"source": e["source"], "action": e["action"], "target": e["target"],
+             "count": 1, "first": e["time"], "last": e["time"]}
+            for e in events
+        ])
+
+        # Old runs, and any overflow beyond the recent cap, become bucket counts
+        newest = max((run["last"] for run in runs), default=None)
+        cutoff = newest - self.recent_window if newest else None
+        recent = [run for run in runs if run["last"] >= cutoff] if cutoff else []
+        overflow = len(recent) - self.max_recent
+        if overflow > 0:
+            recent = recent[overflow:]
+        kept = {id(run) for run in recent}
+        aged = [run for run in runs if id(run) not in kept]
+        history = self._downsample(summary["history"], aged)
+
+        if len(history) > self.max_buckets:
+            dropped = history[:len(history) - self.max_buckets]
+            history = history[len(history) - self.max_buckets:]
+            summary["dropped"]["buckets"] += len(dropped)
+            summary["dropped"]["events"] += sum(b["count"] for b in dropped)
+
+        # Forget files that were pruned or rotated away so the record stays bounded
+        summary["folded_files"] = {path: entry for path, entry in folded.items() if os.path.exists(path)}
+        summary.update({
+            "generated": _iso(build_time_utc()),
+            "recent": [{**run, "first": _iso(run["first"]), "last": _iso(run["last"])} for run in recent],
+            "history": history
+        })
+        with open(self.summary_path + '.tmp', 'w') as f:
+            json.dump(summary, f, indent=1)
+        os.replace(self.summary_path + '.tmp', self.summary_path)
+
+        pruned = []
+        if prune:
+            # Curated logs and browser exports are kept; only per-run output is disposable
+            for path in sorted(summary["folded_files"]):
+                if any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in RUN_LOG_PATTERNS):
+                    os.remove(path)
+                    pruned.append(path)
+
+        print(f"[COMPACT] {len(events)} new events from {len(new_files)} files -> "
+              f"{len(recent)} recent runs, {len(history)} history buckets")
+        return {
+            "new_files": len(new_files),
+            "new_events": len(events),
+            "total_events": summary["totals"]["events"],
+            "recent_runs": len(recent),
+            "history_buckets": len(history),
+            "dropped": summary["dropped"],
+            "pruned": pruned,
+            "summary_bytes": os.path.getsize(self.summary_path)
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact mutation logs into a rolling summary")
+    parser.add_argument("--summary", default=SUMMARY_PATH)
+    parser.add_argument("--browser", nargs="*", default=[],
+                        help="Exported getMutationLogs()/localStorage arrays to merge")
+    parser.add_argument("--recent-hours", type=float, default=DEFAULT_RECENT_HOURS)
+    parser.add_argument("--max-recent", type=int, default=DEFAULT_MAX_RECENT)
+    parser.add_argument("--bucket-hours", type=float, default=DEFAULT_BUCKET_HOURS)
+    parser.add_argument("--max-buckets", type=int, default=DEFAULT_MAX_BUCKETS)
+    parser.add_argument("--prune", action="store_true", help="Delete per-run logs once folded")
+    args = parser.parse_args()
+
+    compactor = MutationLogCompactor(args.summary, args.recent_hours, args.max_recent,
+                                     args.bucket_hours, args.max_buckets)
+    print(json.dumps(compactor.compact(args.browser, args.prune), indent=2))
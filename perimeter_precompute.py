@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+PERIMETER PRECOMPUTE
+Batch-computes fire perimeters, direction cones and threat areas with NumPy
+
+Vectorized port of generateFirePerimeter, generateDirectionCone and
+generateThreatArea from app/lib/firePerimeterGenerator.ts: every layer for
+every fire in the snapshot is evaluated as one (fires x angles) array
+expression and written as a GeoJSON FeatureCollection the client only draws.
+Wind follows calculateWindData, with the random component drawn from a
+generator seeded by the snapshot so rebuilds of the same data match. The
+browser applies the diurnal adjustment in the viewer's local time; here the
+hour is the snapshot's `generated` time in California (America/Los_Angeles),
+so it is tied to the data rather than to the build machine's clock.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from build_reproducibility import build_time_utc
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        FIRE_TIMEZONE = ZoneInfo('America/Los_Angeles')
+    except ZoneInfoNotFoundError:
+        FIRE_TIMEZONE = timezone(timedelta(hours=-8))
+except ImportError:
+    FIRE_TIMEZONE = timezone(timedelta(hours=-8))
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+OUTPUT_PATH = 'public/data/fire-perimeters.geojson'
+
+PERIMETER_POINTS = 64
+CONE_ARC_POINTS = 30
+CONE_SPREAD = np.pi / 3
+COORDINATE_PRECISION = 6
+
+
+def base_radius(acres):
+    """Acres to an approximate radius in degrees"""
+    area_sq_meters = np.asarray(acres, dtype=np.float64) * 4047
+    return np.sqrt(area_sq_meters / np.pi) / 111000
+
+
+def calculate_wind_data(lat, hour, rng):
+    """Vectorized calculateWindData for an array of latitudes"""
+    lat = np.asarray(lat, dtype=np.float64)
+    speed = 10 + rng.random(lat.shape) * 20
+    direction = rng.random(lat.shape) * 360
+
+    if 14 <= hour <= 18:
+        speed = speed * 1.5
+
+    northern = (lat > 37) & (lat < 39)
+    southern = lat < 34
+    direction = np.where(northern, 315.0, direction)
+    direction = np.where(southern, 270.0, direction)
+    if hour >= 20 or hour <= 6:
+        speed = np.where(southern, speed * 1.3, speed)
+
+    return speed, direction
+
+
+def calculate_confidence(acres, wind_speed):
+    """Vectorized calculateConfidence"""
+    confidence = np.full(np.shape(acres), 85.0)
+    confidence -= np.where(acres > 10000, 10, 0)
+    confidence -= np.where(acres > 50000, 10, 0)
+    confidence -= np.where(wind_speed > 25, 15, 0)
+    confidence -= np.where(wind_speed > 40, 15, 0)
+    return np.clip(confidence, 30, 95)
+
+
+def _to_lng_lat(center_lat, center_lng, radius, angle):
+    """Offset centers by radius along angle, correcting longitude for latitude"""
+    lat = center_lat[:, None] + radius * np.sin(angle)
+    lng = center_lng[:, None] + radius * np.cos(angle) / np.cos(center_lat[:, None] * np.pi / 180)
+    return np.stack([lng, lat], axis=-1)
+
+
+def generate_fire_perimeters(center_lat, center_lng, acres, wind_direction):
+    """(fires, 65, 2) perimeter rings matching generateFirePerimeter"""
+    angle = np.arange(PERIMETER_POINTS + 1) / PERIMETER_POINTS * 2 * np.pi
+    radius_variation = (
+        1.0
+        + 0.15 * np.sin(angle * 2 + np.pi / 4)
+        + 0.10 * np.cos(angle * 3)
+        + 0.05 * np.sin(angle * 5)
+        + 0.03 * np.cos(angle * 7)
+    )
+
+    wind_rad = (wind_direction * np.pi / 180)[:, None]
+    wind_alignment = np.cos(angle - wind_rad)
+    wind_effect = 1 + 0.3 * wind_alignment * np.maximum(0, wind_alignment)
+
+    radius = base_radius(acres)[:, None] * radius_variation * wind_effect
+    return _to_lng_lat(center_lat, center_lng, radius, angle)
+
+
+def generate_direction_cones(center_lat, center_lng, acres, wind_direction, wind_speed):
+    """(fires, 33, 2) cone polygons matching generateDirectionCone"""
+    cone_length = (base_radius(acres) * (0.6 + wind_speed / 50))[:, None]
+    wind_rad = (wind_direction * np.pi / 180)[:, None]
+
+    t = np.arange(CONE_ARC_POINTS + 1) / CONE_ARC_POINTS
+    arc_angle = wind_rad - CONE_SPREAD / 2 + t * CONE_SPREAD
+    centeredness = 1 - np.abs(t - 0.5) * 2
+    distance = cone_length * (0.7 + 0.3 * centeredness * centeredness)
+
+    arc = _to_lng_lat(center_lat, center_lng, distance, arc_angle)
+    center = np.stack([center_lng, center_lat], axis=-1)[:, None, :]
+    return np.concatenate([center, arc, center], axis=1)
+
+
+def generate_threat_areas(center_lat, center_lng, acres, wind_direction, wind_speed):
+    """(fires, 65, 2) threat ellipses matching generateThreatArea"""
+    radius0 = base_radius(acres)[:, None]
+    wind_rad = (wind_direction * np.pi / 180)[:, None]
+    threat_extension = radius0 * (0.4 + wind_speed[:, None] / 40)
+
+    angle = np.arange(PERIMETER_POINTS + 1) / PERIMETER_POINTS * 2 * np.pi
+    wind_alignment = np.cos(angle - wind_rad)
+    along_wind = radius0 * 1.5 + threat_extension * np.maximum(0, wind_alignment)
+    across_wind = radius0 * 1.2
+
+    angle_from_wind = angle - wind_rad
+    x = along_wind * np.cos(angle_from_wind)
+    y = across_wind * np.sin(angle_from_wind)
+    radius = np.sqrt(x * x + y * y) * (1 + 0.05 * np.sin(angle * 4))
+
+    return _to_lng_lat(center_lat, center_lng, radius, angle)
+
+
+def _close_rings(rings):
+    """Append the first vertex where the TS generators would (inexact closure)"""
+    open_mask = np.any(rings[:, 0, :] != rings[:, -1, :], axis=1)
+    return [
+        np.concatenate([ring, ring[:1]]) if is_open else ring
+        for ring, is_open in zip(rings, open_mask)
+    ]
+
+
+def _snapshot_seed(incidents):
+    """Stable RNG seed derived from the snapshot contents"""
+    digest = hashlib.md5(json.dumps(incidents, sort_keys=True).encode()).hexdigest()
+    return int(digest[:16], 16)
+
+
+def snapshot_hour(generated):
+    """California local hour of the snapshot time (build time if unknown)"""
+    moment = None
+    if generated:
+        try:
+            moment = datetime.fromisoformat(str(generated).replace('Z', '+00:00'))
+        except ValueError:
+            moment = None
+    if moment is None:
+        moment = build_time_utc()
+    elif moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(FIRE_TIMEZONE).hour
+
+
+class PerimeterPrecompute:
+    """Precompute every perimeter layer for a fire snapshot"""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, output_path=OUTPUT_PATH, hour=None):
+        self.snapshot_path = snapshot_path
+        self.output_path = output_path
+        # None: derived from the snapshot's generated time in precompute()
+        self.hour = hour
+        self.precompute_id = "Perimeter-Precompute-v1"
+
+    def compute(self, incidents):
+        """Build the FeatureCollection for a list of normalized incidents"""
+        incidents = [i for i in incidents if i.get('lat') is not None and i.get('lng') is not None]
+        if not incidents:
+            return {"type": "FeatureCollection", "features": []}
+
+        center_lat = np.array([i['lat'] for i in incidents], dtype=np.float64)
+        center_lng = np.array([i['lng'] for i in incidents], dtype=np.float64)
+        acres = np.array([i.get('acres') or 0 for i in incidents], dtype=np.float64)
+
+        rng = np.random.default_rng(_snapshot_seed(incidents))
+        hour = self.hour if self.hour is not None else snapshot_hour(None)
+        wind_speed, wind_direction = calculate_wind_data(center_lat, hour, rng)
+        confidence = calculate_confidence(acres, wind_speed)
+
+        layers = {
+            "perimeter": _close_rings(
+                generate_fire_perimeters(center_lat, center_lng, acres, wind_direction)),
+            "directionCone": list(
+                generate_direction_cones(center_lat, center_lng, acres, wind_direction, wind_speed)),
+            "threatArea": _close_rings(
+                generate_threat_areas(center_lat, center_lng, acres, wind_direction, wind_speed))
+        }
+
+        features = []
+        for index, incident in enumerate(incidents):
+            for layer, rings in layers.items():
+                ring = np.round(rings[index], COORDINATE_PRECISION)
+                features.append({
+                    "type": "Feature",
+                    "geometry": {"type": "Polygon", "coordinates": [ring.tolist()]},
+                    "properties": {
+                        "fireId": incident['id'],
+                        "layer": layer,
+                        "windSpeed": round(float(wind_speed[index]), 2),
+                        "windDirection": round(float(wind_direction[index]), 2),
+                        "confidence": int(confidence[index])
+                    }
+                })
+
+        return {"type": "FeatureCollection", "features": features}
+
+    def precompute(self):
+        """Read the snapshot, compute all layers and write the GeoJSON"""
+        print(f"[{self.precompute_id}] Precomputing perimeters from {self.snapshot_path}...")
+
+        with open(self.snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+        incidents = snapshot.get('incidents', [])
+        if self.hour is None:
+            self.hour = snapshot_hour(snapshot.get('generated'))
+
+        collection = self.compute(incidents)
+
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with open(self.output_path, 'w') as f:
+            json.dump(collection, f, separators=(',', ':'))
+
+        print(f"[PERIMETER] {len(collection['features'])} polygons for "
+              f"{len(incidents)} fires written to {self.output_path}")
+
+        return {
+            "status": "complete",
+            "fires": len(incidents),
+            "features": len(collection['features']),
+            "hour": self.hour,
+            "output": self.output_path
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute fire perimeter layers")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--hour", type=int, default=None,
+                        help="California hour for the diurnal wind adjustment "
+                             "(default: the snapshot's generated time)")
+    args = parser.parse_args()
+
+    precompute = PerimeterPrecompute(args.snapshot, args.output, args.hour)
+    result = precompute.precompute()
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+POST BUILD WATCHER
+Reruns only the affected post-build stages for files that change in the export
+
+During local iteration every `next build` is followed by the whole amplify.yml
+chain, which rescans and rewrites the entire tree. This watcher follows out/
+instead, through inotify on Linux or scandir snapshots everywhere else, and
+debounces bursts of events into one batch. Each changed file goes through only
+the stages that apply to it: SSR revalidation (and stripping) for JS chunks,
+a .gz/.br refresh for compressible files, its routes-manifest header entries
+(ETag and Cache-Control) for public assets and HTML, and a copy of just that
+file into .next/ in place of `cp -r out/* .next/`.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import shutil
+import struct
+import time
+
+from artifact_validity_wrapper import ArtifactValidityWrapper
+from asset_fingerprinter import (AssetFingerprinter, FINGERPRINT_EXTENSIONS, HTML_EXTENSIONS,
+                                 PATTERN_HEADER_RULES, PATTERN_RULE_DIRS, SKIP_EXTENSIONS, content_hash)
+from asset_precompressor import COMPRESSIBLE_EXTENSIONS, DEFAULT_MIN_SIZE, compress_file
+from build_reproducibility import json_options
+
+SCRIPT_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs')
+IGNORED_SUFFIXES = SKIP_EXTENSIONS + ('.ssr-backup', '.tmp')
+MANIFEST_FILES = ('routes-manifest.json',)
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+MAX_DEBOUNCE_WINDOWS = 10
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+def _replace_copy(source, target):
+    """Copy through a temp file and rename, so a target hardlinked elsewhere is never written through"""
+    shutil.copy2(source, target + '.tmp')
+    os.replace(target + '.tmp', target)
+
+
+def _load_libc():
+    name = ctypes.util.find_library('c')
+    if not name:
+        return None
+    libc = ctypes.CDLL(name, use_errno=True)
+    return libc if hasattr(libc, 'inotify_init1') else None
+
+
+def _walk_dirs(root):
+    """Every directory under root except hidden top-level scaffolding"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        yield directory
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not (
+                            directory == root and entry.name.startswith('.')):
+                        pending.append(entry.path)
+        except OSError:
+            continue
+
+
+class PollingBackend:
+    """Diff scandir snapshots of (mtime, size) per file"""
+
+    name = "polling"
+
+    def __init__(self, root, interval=DEFAULT_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for directory in _walk_dirs(self.root):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def changes(self, timeout):
+        """Paths added, modified or removed since the previous call"""
+        time.sleep(timeout)
+        current = self._scan()
+        changed = {path for path, key in current.items() if self.snapshot.get(path) != key}
+        changed |= self.snapshot.keys() - current.keys()
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyBackend:
+    """Recursive inotify watches through libc; no third-party binding needed"""
+
+    name = "inotify"
+
+    def __init__(self, root, libc):
+        self.root = root
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        for directory in _walk_dirs(root):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = directory
+
+    def _existing_files(self, directory):
+        files = set()
+        for subdirectory in _walk_dirs(directory):
+            self._add_watch(subdirectory)
+            try:
+                files.update(entry.path for entry in os.scandir(subdirectory)
+                             if entry.is_file(follow_symlinks=False))
+            except OSError:
+                continue
+        return files
+
+    def changes(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; treat the whole tree as changed
+                changed |= self._existing_files(self.root)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                # Files can land in a new directory before its watch exists
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._existing_files(path)
+            else:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PostBuildWatcher:
+    """Incremental validate / precompress / manifest / resync for changed files"""
+
+    def __init__(self, root="out", mirror=".next", interval=DEFAULT_INTERVAL,
+                 debounce=DEFAULT_DEBOUNCE, backend="auto", min_size=DEFAULT_MIN_SIZE):
+        self.root = root
+        self.mirror = mirror
+        self.interval = interval
+        self.debounce = debounce
+        self.backend_name = backend
+        self.min_size = min_size
+        self.wrapper = ArtifactValidityWrapper()
+        self.signatures = {}
+        self.routes_manifests = None
+        self.watcher_id = "Post-Build-Watcher-v1"
+
+    def open_backend(self):
+        libc = _load_libc() if self.backend_name in ("auto", "inotify") else None
+        if libc is not None:
+            try:
+                return InotifyBackend(self.root, libc)
+            except OSError as error:
+                print(f"[WATCH] inotify unavailable ({error}), polling instead")
+        return PollingBackend(self.root, self.interval)
+
+    def watched(self, rel_path):
+        """Source files only: not scaffolding, siblings, backups or our own manifests"""
+        parts = rel_path.split(os.sep)
+        name = parts[-1]
+        if parts[0].startswith('.') or name.endswith(IGNORED_SUFFIXES):
+            return False
+        if len(parts) == 1 and name in MANIFEST_FILES:
+            return False
+        return True
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_manifests(self):
+        if self.routes_manifests is not None:
+            return
+        self.routes_manifests = {}
+        for location in (os.path.join(self.root, "routes-manifest.json"),
+                         os.path.join(self.root, ".next", "routes-manifest.json"),
+                         os.path.join(self.mirror, "routes-manifest.json")):
+            try:
+                with open(location, 'r') as f:
+                    self.routes_manifests[location] = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def _header_rules(self, rel_path, digest):
+        """The routes-manifest entries asset_fingerprinter emits for one file"""
+        fingerprinter = AssetFingerprinter(self.root)
+        fingerprinter.fingerprints = {rel_path: digest}
+        rules = fingerprinter.header_rules()
+        for pattern in PATTERN_HEADER_RULES:
+            rules.pop(pattern)
+        return rules
+
+    def _refresh_manifests(self, rel_path, deleted):
+        self._load_manifests()
+        stale = self._header_rules(rel_path, "")
+        fresh = {}
+        if not deleted:
+            fresh = self._header_rules(rel_path, content_hash(os.path.join(self.root, rel_path)))
+
+        for manifest in self.routes_manifests.values():
+            headers = manifest.setdefault("headers", {})
+            for pattern in stale:
+                headers.pop(pattern, None)
+            headers.update(fresh)
+
+    def _write_manifests(self):
+        for location, manifest in self.routes_manifests.items():
+            with open(location + '.tmp', 'w') as f:
+                json.dump(manifest, f, **json_options(indent=2))
+            os.replace(location + '.tmp', location)
+        return sorted(self.routes_manifests)
+
+    def _resync(self, rel_path):
+        """Mirror one file (and its compressed siblings) into .next/"""
+        for name in (rel_path, rel_path + '.gz', rel_path + '.br'):
+            source = os.path.join(self.root, name)
+            target = os.path.join(self.mirror, name)
+            if os.path.isfile(source):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _replace_copy(source, target)
+            elif os.path.exists(target):
+                os.remove(target)
+
+    def process_file(self, rel_path):
+        """Run the stages that apply to one changed or removed file"""
+        path = os.path.join(self.root, rel_path)
+        deleted = not os.path.isfile(path)
+        stages = []
+        has_rules = rel_path.split(os.sep)[0] not in PATTERN_RULE_DIRS and \
+            rel_path.endswith(FINGERPRINT_EXTENSIONS + HTML_EXTENSIONS)
+
+        if not deleted and (rel_path.endswith(SCRIPT_EXTENSIONS)
+                            or os.path.basename(path) in self.wrapper.ssr_free_schema['forbidden_files']):
+            violations = self.wrapper.validate_artifact(path)
+            if violations:
+                self.wrapper.violation_log.extend(violations)
+                self.wrapper.strip_ssr_logic(path)
+            stages.append("validate")
+
+        if rel_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            if not deleted and os.path.getsize(path) >= self.min_size:
+                compress_file(path)
+            else:
+                for suffix in SKIP_EXTENSIONS:
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+            stages.append("precompress")
+
+        if has_rules:
+            self._refresh_manifests(rel_path, deleted)
+            stages.append("manifest")
+
+        self._resync(rel_path)
+        stages.append("resync")
+
+        # Our own rewrites (e.g. SSR stripping) must not trigger another pass
+        self.signatures[rel_path] = self._signature(path)
+        return stages, has_rules
+
+    def process_batch(self, paths):
+        started = time.time()
+        report = {"files": 0, "deleted": 0, "stages": {}, "manifests": []}
+        manifests_dirty = False
+        for path in sorted(paths):
+            rel_path = os.path.relpath(path, self.root)
+            if rel_path.startswith('..') or not self.watched(rel_path):
+                continue
+            if rel_path in self.signatures and self.signatures[rel_path] == self._signature(path):
+                continue
+            try:
+                stages, touched_manifest = self.process_file(rel_path)
+            except OSError as error:
+                print(f"[WATCH] Skipping {rel_path}: {error}")
+                continue
+            manifests_dirty |= touched_manifest
+            report["files"] += 1
+            report["deleted"] += not os.path.exists(path)
+            for stage in stages:
+                report["stages"][stage] = report["stages"].get(stage, 0) + 1
+
+        if manifests_dirty:
+            report["manifests"] = self._write_manifests()
+        report["violations"] = len(self.wrapper.violation_log)
+        report["seconds"] = round(time.time() - started, 3)
+        return report
+
+    def collect(self, backend):
+        """Wait for a change, then keep collecting until the tree is quiet"""
+        paths = backend.changes(self.interval)
+        windows = 0
+        while paths and windows < MAX_DEBOUNCE_WINDOWS:
+            more = backend.changes(self.debounce)
+            if not more:
+                break
+            paths |= more
+            windows += 1
+        return paths
+
+    def watch(self, max_batches=None):
+        backend = self.open_backend()
+        print(f"[{self.watcher_id}] Watching {self.root} -> {self.mirror} ({backend.name})...")
+        totals = {"backend": backend.name, "batches": 0, "files": 0, "stages": {}}
+        try:
+            while max_batches is None or totals["batches"] < max_batches:
+                paths = self.collect(backend)
+                if not paths:
+                    continue
+                report = self.process_batch(paths)
+                if not report["files"]:
+                    continue
+                totals["batches"] += 1
+                totals["files"] += report["files"]
+                for stage, count in report["stages"].items():
+                    totals["stages"][stage] = totals["stages"].get(stage, 0) + count
+                print(f"[WATCH] {report['files']} files ({report['deleted']} removed) "
+                      f"{report['stages']} in {report['seconds']}s")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            backend.close()
+        return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally post-process the export on change")
+    parser.add_argument("--root", default="out")
+    parser.add_argument("--mirror", default=".next")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Polling interval, or idle wait with inotify (seconds)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Quiet period that ends a burst of events (seconds)")
+    parser.add_argument("--poll", action="store_true", help="Use scandir polling even if inotify works")
+    parser.add_argument("--batches", type=int, help="Exit after this many processed batches")
+    args = parser.parse_args()
+
+    watcher = PostBuildWatcher(args.root, args.mirror, args.interval, args.debounce,
+                               "polling" if args.poll else "auto")
+    print(json.dumps(watcher.watch(args.batches), indent=2))
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+REFRESH LOAD GENERATOR
+Replays page.tsx refresh traffic against the CAL FIRE stand-in server
+
+Each simulated client repeats the 30-minute refresh cycle (fetch the active
+GeoJSON, parse it, normalize every feature as convertToFireIncident does and
+sort) with the wall-clock interval compressed to --interval seconds. For every
+--scales multiple of the recorded incident volume an in-process stand-in is
+started, and ingest throughput, latency percentiles and the per-cycle byte and
+CPU cost are reported.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from calfire_standin_server import FIXTURE_PATH, GEOJSON_PATH, CalFireStandInServer
+from fire_snapshot_compiler import convert_to_fire_incident, sort_incidents
+
+REFRESH_PERIOD_SECONDS = 30 * 60
+CYCLES_PER_DAY = 24 * 3600 // REFRESH_PERIOD_SECONDS
+
+
+async def http_get(host, port, path, headers=None):
+    """Minimal HTTP/1.1 GET; returns (status, headers, body)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}",
+                 "Accept: application/json", "Connection: close"]
+        lines.extend(f"{key}: {value}" for key, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+        length = int(response_headers.get('content-length', 0))
+        body = await reader.readexactly(length) if length else b''
+        return status, response_headers, body
+    finally:
+        writer.close()
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RefreshLoadGenerator:
+    """Drive concurrent refresh cycles and collect ingest metrics"""
+
+    def __init__(self, host, port, path=GEOJSON_PATH, clients=10, cycles=5, interval=0.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.clients = clients
+        self.cycles = cycles
+        self.interval = interval
+        self.latencies = []
+        self.ingest_seconds = []
+        self.bytes_received = 0
+        self.incidents_ingested = 0
+        self.errors = 0
+
+    async def refresh(self):
+        """One refresh: fetch, parse, normalize, sort"""
+        started = time.perf_counter()
+        try:
+            status, _, body = await http_get(self.host, self.port, f"{self.path}?inactive=false")
+        except (OSError, asyncio.IncompleteReadError):
+            self.errors += 1
+            return
+        self.latencies.append(time.perf_counter() - started)
+
+        if status != 200:
+            self.errors += 1
+            return
+
+        ingest_started = time.process_time()
+        incidents = sort_incidents([convert_to_fire_incident(f) for f in json.loads(body)['features']])
+        self.ingest_seconds.append(time.process_time() - ingest_started)
+        self.bytes_received += len(body)
+        self.incidents_ingested += len(incidents)
+
+    async def client(self):
+        for cycle in range(self.cycles):
+            await self.refresh()
+            if self.interval and cycle < self.cycles - 1:
+                await asyncio.sleep(self.interval)
+
+    async def run(self):
+        started = time.perf_counter()
+        await asyncio.gather(*(self.client() for _ in range(self.clients)))
+        elapsed = time.perf_counter() - started
+
+        refreshes = len(self.ingest_seconds)
+        bytes_per_cycle = self.bytes_received / refreshes if refreshes else 0
+        cpu_ms_per_cycle = sum(self.ingest_seconds) / refreshes * 1000 if refreshes else 0
+        return {
+            "requests": self.clients * self.cycles,
+            "successful_refreshes": refreshes,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "requests_per_second": round(self.clients * self.cycles / elapsed, 1) if elapsed else 0,
+            "incidents_per_second": round(self.incidents_ingested / elapsed, 1) if elapsed else 0,
+            "latency_ms_p50": round(_percentile(self.latencies, 0.50) * 1000, 2),
+            "latency_ms_p95": round(_percentile(self.latencies, 0.95) * 1000, 2),
+            "cycle_cost": {
+                "bytes_per_client": int(bytes_per_cycle),
+                "ingest_cpu_ms_per_client": round(cpu_ms_per_cycle, 3),
+                "bytes_per_client_per_day": int(bytes_per_cycle * CYCLES_PER_DAY),
+                "ingest_cpu_ms_per_client_per_day": round(cpu_ms_per_cycle * CYCLES_PER_DAY, 1)
+            }
+        }
+
+
+async def run_scales(args):
+    results = {}
+    for scale in args.scales:
+        server = CalFireStandInServer(args.fixture, scale=scale, latency_ms=args.latency_ms,
+                                      jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                                      update_interval=args.update_interval)
+        port = await server.start()
+        try:
+            generator = RefreshLoadGenerator('127.0.0.1', port, clients=args.clients,
+                                             cycles=args.cycles, interval=args.interval)
+            result = await generator.run()
+        finally:
+            await server.stop()
+
+        result["incidents"] = server.incident_count
+        results[f"{scale:g}x"] = result
+        print(f"[LOAD] {scale:g}x ({server.incident_count} incidents): "
+              f"{result['requests_per_second']} req/s, {result['incidents_per_second']} incidents/s, "
+              f"p95 {result['latency_ms_p95']} ms, "
+              f"{result['cycle_cost']['bytes_per_client']} B + "
+              f"{result['cycle_cost']['ingest_cpu_ms_per_client']} ms CPU per 30-min cycle")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay refresh traffic against the stand-in server")
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="Seconds standing in for each 30-minute refresh period")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--update-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_scales(args)), indent=2))
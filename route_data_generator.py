@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+ROUTE DATA GENERATOR
+Writes small per-county and per-incident JSON files into the static export
+
+FireDetailModal and the county cards currently derive everything from the full
+incident list. This stage splits the snapshot into out/data/incidents/<id>.json
+(the incident plus its precomputed perimeter layers) and
+out/data/counties/<county>.json (county totals plus incident summaries), with
+out/data/index.json listing both. Ids whose slugs collide get a short hash
+of the raw id appended, so no incident file overwrites another; the index maps
+every id to its file. These are plain static files fetched by app/lib/routeData.ts,
+not pages, so nothing is registered in the routes or prerender manifests.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import Counter
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+PERIMETERS_PATH = 'public/data/fire-perimeters.geojson'
+COUNTY_AGGREGATES_PATH = 'public/data/county-aggregates.json'
+OUTPUT_DIR = 'out/data'
+
+SUMMARY_FIELDS = ['id', 'name', 'acres', 'containment', 'status', 'started_date']
+
+
+def slugify(value):
+    """URL-safe file stem (mirrors routeDataSlug in app/lib/routeData.ts)"""
+    return re.sub(r'[^a-z0-9]+', '-', (value or '').lower()).strip('-') or 'unknown'
+
+
+def unique_slug(value, taken):
+    """slugify(value), suffixed with a hash of value when another value already took it"""
+    slug = slugify(value)
+    if taken.setdefault(slug, value) != value:
+        slug = f"{slug}-{hashlib.sha1(value.encode()).hexdigest()[:8]}"
+        taken.setdefault(slug, value)
+    return slug
+
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+class RouteDataGenerator:
+    """Split the snapshot into per-county and per-incident data routes"""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, perimeters_path=PERIMETERS_PATH,
+                 aggregates_path=COUNTY_AGGREGATES_PATH, output_dir=OUTPUT_DIR):
+        self.snapshot_path = snapshot_path
+        self.perimeters_path = perimeters_path
+        self.aggregates_path = aggregates_path
+        self.output_dir = output_dir
+        self.generator_id = "Route-Data-Generator-v1"
+
+    def _url(self, path):
+        return '/' + os.path.relpath(path, os.path.dirname(self.output_dir)).replace(os.sep, '/')
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        return self._url(path)
+
+    def generate(self):
+        """Write every data file; returns the index and any slug collisions"""
+        print(f"[{self.generator_id}] Writing route data to {self.output_dir}...")
+
+        incidents = _read_json(self.snapshot_path, {}).get('incidents', [])
+        assignments = _read_json(self.aggregates_path, {}).get('assignments', {})
+        perimeters = {}
+        for feature in _read_json(self.perimeters_path, {}).get('features', []):
+            perimeters.setdefault(feature['properties'].get('fireId'), []).append(feature)
+
+        if os.path.isdir(self.output_dir):
+            for kind in ("counties", "incidents"):
+                shutil.rmtree(os.path.join(self.output_dir, kind), ignore_errors=True)
+
+        counties = {}
+        county_fips = {}
+        incident_slugs = {}
+        collisions = []
+        index = {"generated": _read_json(self.snapshot_path, {}).get('generated'),
+                 "counties": {}, "incidents": {}}
+
+        for incident in incidents:
+            county_slug = slugify(incident.get('county'))
+            incident_slug = unique_slug(incident['id'], incident_slugs)
+            if incident_slug != slugify(incident['id']):
+                collisions.append({"id": incident['id'], "slug": incident_slug,
+                                   "collides_with": incident_slugs[slugify(incident['id'])]})
+            path = os.path.join(self.output_dir, 'incidents', f"{incident_slug}.json")
+            index["incidents"][incident['id']] = self._write(path, {
+                "incident": incident,
+                "county": county_slug,
+                "perimeters": {"type": "FeatureCollection",
+                               "features": perimeters.get(incident['id'], [])}
+            })
+
+            county = counties.setdefault(county_slug, {
+                "name": incident.get('county') or 'Unknown',
+                "fips": None,
+                "incidents": [],
+                "totals": {"incidents": 0, "active": 0, "total_acres": 0, "max_containment_gap": 0}
+            })
+            if assignments.get(incident['id']):
+                county_fips.setdefault(county_slug, Counter())[assignments[incident['id']]] += 1
+            county["incidents"].append({
+                **{field: incident[field] for field in SUMMARY_FIELDS if field in incident},
+                "data": index["incidents"][incident['id']]
+            })
+            totals = county["totals"]
+            totals["incidents"] += 1
+            totals["total_acres"] += incident.get('acres') or 0
+            if incident.get('status') == 'Active':
+                totals["active"] += 1
+                totals["max_containment_gap"] = max(totals["max_containment_gap"],
+                                                    100 - (incident.get('containment') or 0))
+
+        for collision in collisions:
+            print(f"[ROUTE DATA] Slug collision: {collision['id']} -> {collision['slug']} "
+                  f"(already used by {collision['collides_with']})")
+
+        for county_slug, county in sorted(counties.items()):
+            # Point-in-county assignments can disagree near borders; take the majority
+            votes = county_fips.get(county_slug)
+            if votes:
+                county["fips"] = votes.most_common(1)[0][0]
+                if len(votes) > 1:
+                    print(f"[ROUTE DATA] {county['name']}: incidents assigned to FIPS "
+                          f"{dict(votes)}, using {county['fips']}")
+            path = os.path.join(self.output_dir, 'counties', f"{county_slug}.json")
+            index["counties"][county_slug] = self._write(path, county)
+
+        self._write(os.path.join(self.output_dir, 'index.json'), index)
+        print(f"[ROUTE DATA] {len(index['incidents'])} incident and "
+              f"{len(index['counties'])} county files written")
+
+        return {
+            "index": index,
+            "slug_collisions": collisions
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write per-county and per-incident route data")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--perimeters", default=PERIMETERS_PATH)
+    parser.add_argument("--aggregates", default=COUNTY_AGGREGATES_PATH)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    generator = RouteDataGenerator(args.snapshot, args.perimeters, args.aggregates, args.output_dir)
+    result = generator.generate()
+    print(json.dumps({"counties": len(result["index"]["counties"]),
+                      "incidents": len(result["index"]["incidents"]),
+                      "slug_collisions": len(result["slug_collisions"])}, indent=2))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+SEARCH INDEX BUILDER
+Precomputes a prefix/trigram index over incident names, counties and causes
+
+The search box filters the whole incident list with includes() on every
+keystroke. This stage writes public/data/search-index.json: compact document
+rows plus delta-encoded posting lists keyed by one- and two-character token
+prefixes (for short queries) and by trigrams of every indexed field.
+app/lib/searchIndex.ts intersects the postings for a query and only verifies
+the few candidates, so lookup cost tracks the number of matches, not the size
+of the dataset. Several snapshots can be merged, e.g. archived seasons.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+OUTPUT_PATH = 'public/data/search-index.json'
+
+INDEXED_FIELDS = ['name', 'county', 'cause']
+DOC_FIELDS = ['id', 'name', 'county', 'cause', 'status', 'acres']
+PREFIX_LENGTHS = (1, 2)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase and collapse everything but letters and digits to single spaces"""
+    return ' '.join(_TOKEN_RE.findall((text or '').lower()))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def delta_encode(postings):
+    """Ascending doc ids as first id plus gaps"""
+    return [postings[0]] + [b - a for a, b in zip(postings, postings[1:])]
+
+
+def build_index(incidents):
+    """Document rows plus prefix and trigram posting lists"""
+    # Largest fires first so truncated result lists keep the most relevant hits
+    incidents = sorted(incidents, key=lambda incident: -(incident.get('acres') or 0))
+    docs = []
+    prefixes = {}
+    grams = {}
+    for doc_id, incident in enumerate(incidents):
+        docs.append([incident.get(field) or (0 if field == 'acres' else '') for field in DOC_FIELDS])
+        keys = set()
+        prefix_keys = set()
+        for field in INDEXED_FIELDS:
+            text = normalize(incident.get(field))
+            keys |= trigrams(text)
+            for token in text.split():
+                prefix_keys.update(token[:length] for length in PREFIX_LENGTHS if len(token) >= length)
+        for key in keys:
+            grams.setdefault(key, []).append(doc_id)
+        for key in prefix_keys:
+            prefixes.setdefault(key, []).append(doc_id)
+
+    return {
+        "version": 1,
+        "fields": DOC_FIELDS,
+        "indexed": INDEXED_FIELDS,
+        "docs": docs,
+        "prefix": {key: delta_encode(postings) for key, postings in sorted(prefixes.items())},
+        "trigram": {key: delta_encode(postings) for key, postings in sorted(grams.items())}
+    }
+
+
+def search(index, query, limit=20):
+    """Reference lookup with the same semantics as searchIndex.ts"""
+    text = normalize(query)
+    if not text:
+        return []
+
+    candidates = None
+    for token in text.split():
+        keys = trigrams(token) if len(token) >= 3 else {token}
+        table = index["trigram"] if len(token) >= 3 else index["prefix"]
+        for key in keys:
+            postings = set(itertools.accumulate(table.get(key, ())))
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return []
+
+    field_positions = [index["fields"].index(field) for field in index["indexed"]]
+    results = []
+    for doc_id in sorted(candidates):
+        doc = index["docs"][doc_id]
+        haystack = ' '.join(normalize(doc[position]) for position in field_positions)
+        if all(token in haystack for token in text.split()):
+            results.append(dict(zip(index["fields"], doc)))
+            if len(results) >= limit:
+                break
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the static search index")
+    parser.add_argument("--snapshot", nargs="+", default=[SNAPSHOT_PATH],
+                        help="One or more snapshot JSON files to merge")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--query", help="Run a lookup against the built index")
+    args = parser.parse_args()
+
+    merged = {}
+    for path in args.snapshot:
+        with open(path, 'r') as f:
+            for incident in json.load(f).get('incidents', []):
+                merged[incident['id']] = incident
+
+    index = build_index(list(merged.values()))
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+
+    print(f"[SEARCH INDEX] {len(index['docs'])} incidents, {len(index['prefix'])} prefixes, "
+          f"{len(index['trigram'])} trigrams -> {args.output} ({os.path.getsize(args.output)} bytes)")
+    if args.query:
+        print(json.dumps(search(index, args.query), indent=2))
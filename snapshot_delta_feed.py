@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+SNAPSHOT DELTA FEED
+Diffs successive normalized fire snapshots into a small versioned delta chain
+
+Each run compares public/data/fire-snapshot.json with the previous snapshot by
+incident id and writes added incidents, changed fields of updated incidents,
+and removed ids. The last --max-chain deltas are kept in .snapshot-state/
+(cached between builds) and mirrored into public/data/deltas/ with an
+index.json, so a client at version N polls a few hundred bytes instead of the
+full feed and only refetches the snapshot when it falls off the chain.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+from build_reproducibility import build_timestamp
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+STATE_DIR = '.snapshot-state'
+OUTPUT_DIR = 'public/data/deltas'
+DEFAULT_MAX_CHAIN = 48
+
+
+def diff_incidents(previous, current):
+    """Added incidents, changed fields (null = dropped) and removed ids"""
+    previous_by_id = {incident['id']: incident for incident in previous}
+    current_by_id = {incident['id']: incident for incident in current}
+
+    added = [current_by_id[i] for i in sorted(current_by_id.keys() - previous_by_id.keys())]
+    removed = sorted(previous_by_id.keys() - current_by_id.keys())
+
+    updated = []
+    for incident_id in sorted(current_by_id.keys() & previous_by_id.keys()):
+        before, after = previous_by_id[incident_id], current_by_id[incident_id]
+        changes = {
+            field: after.get(field)
+            for field in sorted(before.keys() | after.keys())
+            if before.get(field) != after.get(field)
+        }
+        if changes:
+            updated.append({"id": incident_id, "changes": changes})
+
+    return {"added": added, "updated": updated, "removed": removed}
+
+
+def _incidents_hash(incidents):
+    return hashlib.md5(json.dumps(incidents, sort_keys=True).encode()).hexdigest()
+
+
+class SnapshotDeltaFeed:
+    """Maintain a bounded chain of snapshot deltas"""
+
+    def __init__(self, state_dir=STATE_DIR, output_dir=OUTPUT_DIR, max_chain=DEFAULT_MAX_CHAIN):
+        self.state_dir = state_dir
+        self.deltas_dir = os.path.join(state_dir, 'deltas')
+        self.output_dir = output_dir
+        self.max_chain = max_chain
+        self.feed_id = "Snapshot-Delta-Feed-v1"
+
+    def _read_json(self, path, default):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def _write_json(self, path, data):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def _delta_path(self, version):
+        return os.path.join(self.deltas_dir, f"delta-{version:06d}.json")
+
+    def chain_versions(self):
+        """Versions that currently have a delta file, oldest first"""
+        if not os.path.isdir(self.deltas_dir):
+            return []
+        return sorted(
+            int(name[len('delta-'):-len('.json')])
+            for name in os.listdir(self.deltas_dir)
+            if name.startswith('delta-') and name.endswith('.json')
+        )
+
+    def _trim_chain(self):
+        versions = self.chain_versions()
+        for version in versions[:max(0, len(versions) - self.max_chain)]:
+            os.remove(self._delta_path(version))
+
+    def _publish(self, state):
+        """Mirror the chain and its index into the static output"""
+        if os.path.isdir(self.output_dir):
+            shutil.rmtree(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        deltas = []
+        for version in self.chain_versions():
+            source = self._delta_path(version)
+            shutil.copy2(source, os.path.join(self.output_dir, os.path.basename(source)))
+            deltas.append({
+                "from": version - 1,
+                "to": version,
+                "file": os.path.basename(source),
+                "bytes": os.path.getsize(source)
+            })
+
+        index = {
+            "version": state["version"],
+            "generated": state["generated"],
+            "min_version": deltas[0]["from"] if deltas else state["version"],
+            "snapshot": "/data/fire-snapshot.json",
+            "deltas": deltas
+        }
+        self._write_json(os.path.join(self.output_dir, 'index.json'), index)
+        return index
+
+    def update(self, snapshot_path=SNAPSHOT_PATH):
+        """Diff the new snapshot against the previous one and extend the chain"""
+        print(f"[{self.feed_id}] Diffing {snapshot_path} against previous snapshot...")
+
+        snapshot = self._read_json(snapshot_path, None)
+        if snapshot is None:
+            return {"status": "SNAPSHOT_NOT_FOUND", "snapshot": snapshot_path}
+
+        incidents = snapshot.get('incidents', [])
+        state_path = os.path.join(self.state_dir, 'state.json')
+        previous_path = os.path.join(self.state_dir, 'previous-snapshot.json')
+        state = self._read_json(state_path, {"version": 0, "hash": None})
+        previous = self._read_json(previous_path, None)
+        current_hash = _incidents_hash(incidents)
+
+        delta = None
+        if previous is None:
+            state["version"] += 1
+            action = "BASELINE"
+        elif current_hash == state.get("hash"):
+            action = "UNCHANGED"
+        else:
+            state["version"] += 1
+            delta = diff_incidents(previous.get('incidents', []), incidents)
+            delta.update({
+                "from": state["version"] - 1,
+                "to": state["version"],
+                "generated": snapshot.get("generated")
+            })
+            self._write_json(self._delta_path(state["version"]), delta)
+            self._trim_chain()
+            action = "DELTA"
+
+        state["hash"] = current_hash
+        state["generated"] = snapshot.get("generated") or build_timestamp()
+        self._write_json(state_path, state)
+        self._write_json(previous_path, snapshot)
+        index = self._publish(state)
+
+        summary = {
+            "status": action,
+            "version": state["version"],
+            "chain_length": len(index["deltas"])
+        }
+        if delta is not None:
+            summary.update({
+                "added": len(delta["added"]),
+                "updated": len(delta["updated"]),
+                "removed": len(delta["removed"]),
+                "delta_bytes": os.path.getsize(self._delta_path(state["version"]))
+            })
+
+        print(f"[DELTA] {action}: version {state['version']}, "
+              f"{len(index['deltas'])} deltas in chain")
+        return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate incremental snapshot deltas")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--max-chain", type=int, default=DEFAULT_MAX_CHAIN)
+    args = parser.parse_args()
+
+    feed = SnapshotDeltaFeed(args.state_dir, args.output_dir, args.max_chain)
+    result = feed.update(args.snapshot)
+    print(json.dumps(result, indent=2))
@@ -16,9 +16,12 @@ modularity, and mutation awareness logic are my own.
 
 import json
 import os
-from datetime import datetime
 from pathlib import Path
 
+from asset_fingerprinter import AssetFingerprinter
+from build_reproducibility import build_timestamp, json_options, run_log_name
+from nft_trace_generator import NftTraceGenerator
+
 class SyntheticSSRScaffolding:
     """Generate synthetic trace and manifest files that mimic SSR without SSR logic"""
     
@@ -29,7 +32,7 @@ class SyntheticSSRScaffolding:
     def log_mutation(self, file, content_type, hypothesis):
         """Log synthetic file creation as mutation artifact"""
         self.mutations.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "file": file,
             "type": content_type,
             "hypothesis": hypothesis
@@ -39,7 +42,7 @@ class SyntheticSSRScaffolding:
         """Generate build-trace.json with static-safe defaults"""
         build_trace = {
             "version": 2,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "mode": "production",
             "runtime": "static",
             "hasServerComponents": False,
@@ -90,7 +93,7 @@ class SyntheticSSRScaffolding:
         for location in locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(build_trace, f, indent=2)
+                json.dump(build_trace, f, **json_options(indent=2))
                 
         self.log_mutation("build-trace.json", "TRACE", "Primary build trace for Amplify validation")
         return build_trace
@@ -141,6 +144,9 @@ class SyntheticSSRScaffolding:
             }
         }
         
+        # Immutable caching for hashed assets, revalidation for HTML
+        routes_manifest["headers"].update(AssetFingerprinter("out").fingerprint_export())
+        
         locations = [
             "out/routes-manifest.json",
             "out/.next/routes-manifest.json",
@@ -150,7 +156,7 @@ class SyntheticSSRScaffolding:
         for location in locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(routes_manifest, f, indent=2)
+                json.dump(routes_manifest, f, **json_options(indent=2))
                 
         self.log_mutation("routes-manifest.json", "MANIFEST", "Route configuration for static pages")
         return routes_manifest
@@ -185,7 +191,7 @@ class SyntheticSSRScaffolding:
         for location in locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(prerender_manifest, f, indent=2)
+                json.dump(prerender_manifest, f, **json_options(indent=2))
                 
         self.log_mutation("prerender-manifest.json", "MANIFEST", "Prerender configuration for SSG")
         return prerender_manifest
@@ -232,7 +238,7 @@ class SyntheticSSRScaffolding:
         for location in locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(build_manifest, f, indent=2)
+                json.dump(build_manifest, f, **json_options(indent=2))
                 
         self.log_mutation("build-manifest.json", "MANIFEST", "Build assets manifest")
         return build_manifest
@@ -292,7 +298,7 @@ class SyntheticSSRScaffolding:
             for location in locations:
                 os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
                 with open(location, 'w') as f:
-                    json.dump(content, f, indent=2)
+                    json.dump(content, f, **json_options(indent=2))
                     
             self.log_mutation(filename, "SERVER_MANIFEST", f"Server manifest for {filename}")
             
@@ -308,11 +314,8 @@ class SyntheticSSRScaffolding:
             "modules": {}
         }
         
-        # NFT trace files for pages
-        nft_trace = {
-            "version": 1,
-            "files": []
-        }
+        # NFT traces resolve the real import graph of each emitted entry
+        tracer = NftTraceGenerator()
         
         trace_locations = [
             "out/trace",
@@ -323,7 +326,7 @@ class SyntheticSSRScaffolding:
         for location in trace_locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(trace_content, f)
+                json.dump(trace_content, f, **json_options())
                 
         # Create NFT files for all potential pages
         pages = ["_app", "_document", "index", "404", "_error"]
@@ -337,8 +340,13 @@ class SyntheticSSRScaffolding:
             
             for location in nft_locations:
                 os.makedirs(os.path.dirname(location), exist_ok=True)
+                nft_trace = tracer.nft_content(location[:-len('.nft.json')], location)
                 with open(location, 'w') as f:
-                    json.dump(nft_trace, f)
+                    json.dump(nft_trace, f, **json_options())
+                    
+        # Trace every other emitted server entry as well
+        for entry in tracer.find_entries():
+            tracer.write_nft(entry)
                     
         self.log_mutation("trace-files", "TRACE", "Comprehensive trace file coverage")
         
@@ -384,7 +392,7 @@ class SyntheticSSRScaffolding:
         for location in locations:
             os.makedirs(os.path.dirname(location) or ".", exist_ok=True)
             with open(location, 'w') as f:
-                json.dump(required_server_files, f, indent=2)
+                json.dump(required_server_files, f, **json_options(indent=2))
                 
         self.log_mutation("required-server-files.json", "COMPLIANCE", "SSR compliance flags without SSR logic")
         
@@ -394,7 +402,7 @@ class SyntheticSSRScaffolding:
         # Create health check response
         health_check = {
             "status": "OK",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "deployment": "static",
             "ssr": False,
             "validation": "PASS"
@@ -409,7 +417,7 @@ if (typeof process !== 'undefined' && process.env.VALIDATION) console.log(JSON.s
         
         # Write health check
         with open("out/health.json", 'w') as f:
-            json.dump(health_check, f)
+            json.dump(health_check, f, **json_options())
             
         # Write server stubs
         server_locations = [
@@ -429,16 +437,16 @@ if (typeof process !== 'undefined' && process.env.VALIDATION) console.log(JSON.s
         """Save comprehensive mutation log"""
         log_data = {
             "scaffold_id": self.scaffold_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": build_timestamp(),
             "total_mutations": len(self.mutations),
             "mutations": self.mutations,
             "hypothesis": "AWS Amplify requires complete SSR scaffolding even for static builds",
             "strategy": "Create synthetic files that satisfy schema without SSR execution"
         }
         
-        log_file = f"scaffold_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        log_file = run_log_name("scaffold_log", self.scaffold_id)
         with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+            json.dump(log_data, f, **json_options(indent=2))
             
         return log_file
         
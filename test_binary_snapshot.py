@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+TEST BINARY SNAPSHOT - Round-trip records whose fields fall outside the packed ranges
+"""
+
+import os
+import tempfile
+
+from binary_snapshot import BinarySnapshotReader, encode_snapshot
+
+
+def _round_trip(incidents):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fire-snapshot.bin')
+        with open(path, 'wb') as f:
+            f.write(encode_snapshot({'generated': '2025-01-08T12:00:00Z', 'incidents': incidents}))
+        reader = BinarySnapshotReader(path)
+        decoded = list(reader)
+        reader.close()
+    return decoded
+
+
+def test_out_of_range_start_dates():
+    """Pre-1970 and post-2149 start dates pack as unknown instead of raising struct.error"""
+    decoded = _round_trip([
+        {'id': 'old', 'name': 'Old Fire', 'started_date': '1969-12-31', 'status': 'Active'},
+        {'id': 'far', 'name': 'Far Fire', 'started_date': '2200-01-01', 'status': 'Active'},
+        {'id': 'bad', 'name': 'Bad Fire', 'started_date': 'not a date', 'status': 'Active'},
+        {'id': 'ok', 'name': 'Ok Fire', 'started_date': '2025-01-07T10:30:00', 'acres': -5}
+    ])
+    assert [incident.get('started_date') for incident in decoded] == [None, None, None, '2025-01-07']
+    assert decoded[3]['acres'] == 0
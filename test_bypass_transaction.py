@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+TEST BYPASS TRANSACTION - Commit, roll back and revert the bypass file mutations
+"""
+
+import os
+
+import pytest
+
+import bypass_transaction
+from bypass_transaction import JOURNAL_PATH, BypassTransaction
+
+
+def _tree(root='.'):
+    """Every file (bytes and mode) and directory under root, minus the journal"""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames:
+            tree[os.path.relpath(os.path.join(dirpath, name), root)] = 'dir'
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, root) == JOURNAL_PATH:
+                continue
+            with open(path, 'rb') as f:
+                tree[os.path.relpath(path, root)] = (f.read(), os.stat(path).st_mode & 0o777)
+    return tree
+
+
+def _pristine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open('package.json', 'w') as f:
+        f.write('{"name": "fire-map"}\n')
+    with open('next.config.mjs', 'w') as f:
+        f.write('export default {};\n')
+    os.chmod('next.config.mjs', 0o640)
+    return _tree()
+
+
+def test_commit_applies_every_change(tmp_path, monkeypatch):
+    _pristine(tmp_path, monkeypatch)
+    transaction = BypassTransaction()
+    transaction.write('package.json', '{"name": "static-site"}\n')
+    transaction.move('next.config.mjs', '.next.config.mjs.bypass')
+    transaction.write('next.config.mjs', '// Static-only configuration\n')
+    transaction.write('out/.next/server/pages-manifest.json', '{}')
+    committed = transaction.commit()
+
+    assert committed == sorted(['package.json', 'next.config.mjs', '.next.config.mjs.bypass',
+                                'out/.next/server/pages-manifest.json'])
+    with open('package.json') as f:
+        assert f.read() == '{"name": "static-site"}\n'
+    with open('.next.config.mjs.bypass') as f:
+        assert f.read() == 'export default {};\n'
+    assert os.stat('.next.config.mjs.bypass').st_mode & 0o777 == 0o640
+    assert os.path.isfile('out/.next/server/pages-manifest.json')
+    assert os.path.isfile(JOURNAL_PATH)
+
+
+def test_failed_step_rolls_back_everything(tmp_path, monkeypatch):
+    pristine = _pristine(tmp_path, monkeypatch)
+    apply = bypass_transaction._apply
+
+    def failing_apply(path, data, mode=None):
+        if path == 'next.config.mjs' and data is not None and data.startswith(b'//'):
+            raise OSError("disk full")
+        apply(path, data, mode)
+
+    monkeypatch.setattr(bypass_transaction, '_apply', failing_apply)
+    transaction = BypassTransaction()
+    transaction.write('package.json', '{"name": "static-site"}\n')
+    transaction.write('out/.next/server/pages-manifest.json', '{}')
+    transaction.write('next.config.mjs', '// Static-only configuration\n')
+    with pytest.raises(OSError):
+        transaction.commit()
+
+    assert _tree() == pristine
+
+
+def test_revert_restores_bytes_and_mode(tmp_path, monkeypatch):
+    pristine = _pristine(tmp_path, monkeypatch)
+    transaction = BypassTransaction()
+    transaction.write('next.config.mjs', '// Static-only configuration\n', mode=0o755)
+    transaction.remove('package.json')
+    transaction.commit()
+    assert not os.path.exists('package.json')
+    assert os.stat('next.config.mjs').st_mode & 0o777 == 0o755
+
+    BypassTransaction().revert()
+    assert _tree() == pristine
+    assert not os.path.exists(JOURNAL_PATH)
+
+
+def test_revert_removes_created_directories(tmp_path, monkeypatch):
+    pristine = _pristine(tmp_path, monkeypatch)
+    transaction = BypassTransaction()
+    transaction.makedirs('out/.next/cache')
+    transaction.write('out/.next/server/pages/_app.js.nft.json', '{}')
+    transaction.commit()
+    assert os.path.isdir('out/.next/cache')
+
+    BypassTransaction().revert()
+    assert not os.path.exists('out')
+    assert _tree() == pristine
+
+
+def test_two_runs_revert_to_pristine(tmp_path, monkeypatch):
+    pristine = _pristine(tmp_path, monkeypatch)
+    first = BypassTransaction()
+    first.write('package.json', '{"name": "static-site"}\n')
+    first.move('next.config.mjs', '.next.config.mjs.bypass')
+    first.write('next.config.mjs', '// Static-only configuration\n')
+    first.commit()
+
+    second = BypassTransaction()
+    second.write('package.json', '{"name": "static-site", "private": true}\n')
+    second.write('next.config.mjs', '// Static-only configuration v2\n')
+    second.write('out/server.js', '// Static export stub\n')
+    second.commit()
+
+    BypassTransaction().revert()
+    assert _tree() == pristine
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+TEST FIRE INGEST ENGINE - Fetch, revalidate and degrade against the local stand-in server
+"""
+
+import asyncio
+import glob
+import json
+import os
+import socket
+
+from calfire_standin_server import CalFireStandInServer
+from fire_ingest_engine import FireIngestEngine
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'calfire_active.geojson')
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _ingest(cache_dir, port, **stand_in_options):
+    """One engine run against a fresh stand-in; returns (result, per-source statuses)"""
+    async def run():
+        stand_in = CalFireStandInServer(FIXTURE_PATH, update_interval=0, **stand_in_options)
+        await stand_in.start(port=port)
+        try:
+            engine = FireIngestEngine(cache_dir=str(cache_dir), base_url=f"http://127.0.0.1:{port}",
+                                      timeout=5.0)
+            return await engine.ingest()
+        finally:
+            await stand_in.stop()
+
+    result = asyncio.run(run())
+    return result, {source["source"]: source["status"] for source in result["sources"]}
+
+
+def test_updated_then_not_modified(tmp_path):
+    port = _free_port()
+    result, statuses = _ingest(tmp_path, port)
+    assert set(statuses.values()) == {"UPDATED"}
+    assert result["changed"] and result["count"] > 0
+
+    result, statuses = _ingest(tmp_path, port)
+    assert set(statuses.values()) == {"NOT_MODIFIED"}
+    assert not result["changed"] and result["count"] > 0
+
+
+def test_server_errors_fall_back_to_cache(tmp_path):
+    port = _free_port()
+    first, _ = _ingest(tmp_path, port)
+    result, statuses = _ingest(tmp_path, port, error_rate=1.0)
+    assert set(statuses.values()) == {"STALE_CACHE"}
+    assert result["count"] == first["count"]
+
+
+def test_truncated_responses_degrade_per_source(tmp_path):
+    port = _free_port()
+    result, statuses = _ingest(tmp_path, port, truncate_rate=1.0)
+    assert set(statuses.values()) == {"FAILED"}
+    assert result["count"] == 0
+
+    first, _ = _ingest(tmp_path, port)
+    # Without validators the stand-in sends the full body again, and cuts it off
+    for path in glob.glob(os.path.join(str(tmp_path), '*.meta.json')):
+        with open(path, 'r') as f:
+            meta = json.load(f)
+        meta.update(etag=None, last_modified=None)
+        with open(path, 'w') as f:
+            json.dump(meta, f)
+    result, statuses = _ingest(tmp_path, port, truncate_rate=1.0)
+    assert set(statuses.values()) == {"STALE_CACHE"}
+    assert result["count"] == first["count"]
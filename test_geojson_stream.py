@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+TEST GEOJSON STREAM - The built-in reader must yield exactly what json.load sees
+"""
+
+import json
+import os
+
+from geojson_stream import iter_features
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'calfire_active.geojson')
+
+
+def _loaded_features(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['features']
+
+
+def test_builtin_matches_json_load_on_fixture():
+    for chunk_size in (1, 7, 4096):
+        assert list(iter_features(FIXTURE_PATH, chunk_size, backend='builtin')) == _loaded_features(FIXTURE_PATH)
+
+
+def test_builtin_matches_json_load_across_chunk_edges(tmp_path):
+    """Escapes, brackets inside strings, scalars and a feature spanning many chunks"""
+    path = str(tmp_path / 'feed.geojson')
+    collection = {
+        "type": "FeatureCollection",
+        "metadata": {"note": "}]\\\"{[", "values": [1, -2.5e-3, True, None]},
+        "features": [
+            {"type": "Feature", "properties": {"Name": "Quote \" and \\ fire", "Acres": 12345678901234},
+             "geometry": {"type": "Polygon",
+                          "coordinates": [[[-120 + i * 1e-4, 38 + i * 2e-4] for i in range(20000)]]}},
+            {"type": "Feature", "properties": {"Name": "Café ]}", "County": None}, "geometry": None},
+            -12.5, "x]", None
+        ]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(collection, f)
+    for chunk_size in (3, 1024):
+        assert list(iter_features(path, chunk_size, backend='builtin')) == _loaded_features(path)
@@ -17,6 +17,8 @@ import os
 import hashlib
 from pathlib import Path
 
+from directory_stats import collect_directory_stats, format_bytes
+
 def test_output_file_tracing():
     """Test if outputFileTracing config would help"""
     
@@ -68,10 +70,12 @@ def test_artifact_paths():
     
     # Check what actually exists
     print("\nActual directories that exist:")
-    for dir_path in ['out', '.next', '.next/server', '.next/standalone']:
-        if Path(dir_path).exists():
-            file_count = len(list(Path(dir_path).rglob('*')))
-            print(f"  {dir_path}: {file_count} files")
+    stats = collect_directory_stats(['out', '.next', '.next/server', '.next/standalone'])
+    for dir_path, dir_stats in stats.items():
+        if dir_stats["exists"]:
+            # Same count as the old rglob('*') listing, which included directories
+            entries = dir_stats['files'] + dir_stats['dirs']
+            print(f"  {dir_path}: {entries} files ({format_bytes(dir_stats['bytes'])})")
 
 def test_hash_mismatch():
     """Test if there's a hash mismatch in trace files"""
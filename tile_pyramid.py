@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+TILE PYRAMID
+Rasterizes incident density and perimeter coverage into static XYZ PNG tiles
+
+EmbeddedFireMap draws every incident as its own vector shape. This stage paints
+two aggregate layers over the California extent of the standard Web Mercator
+XYZ grid with NumPy: a blurred, acreage-weighted incident density heat layer and
+the union of the precomputed fire perimeters (fire-perimeters.geojson). Tiles
+are 256 px PNGs encoded with zlib under public/tiles/<layer>/<z>/<x>/<y>.png;
+fully transparent tiles are not written. The input hash is kept in
+public/tiles/manifest.json and the pyramid is only rebuilt when it changes.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import zlib
+
+import numpy as np
+
+from build_reproducibility import build_timestamp
+
+SNAPSHOT_PATH = 'public/data/fire-snapshot.json'
+PERIMETERS_PATH = 'public/data/fire-perimeters.geojson'
+OUTPUT_DIR = 'public/tiles'
+
+TILE_SIZE = 256
+CALIFORNIA_BOUNDS = (-124.6, 32.4, -113.9, 42.1)
+DEFAULT_MIN_ZOOM = 4
+DEFAULT_MAX_ZOOM = 8
+DENSITY_BLUR_PX = 6
+COVERAGE_RGBA = (255, 69, 0, 150)
+
+
+def lng_to_px(lng, zoom):
+    return (np.asarray(lng, dtype=np.float64) + 180.0) / 360.0 * TILE_SIZE * 2 ** zoom
+
+
+def lat_to_px(lat, zoom):
+    sin_lat = np.sin(np.radians(np.clip(np.asarray(lat, dtype=np.float64), -85.0511, 85.0511)))
+    return (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * TILE_SIZE * 2 ** zoom
+
+
+def encode_png(rgba):
+    """Encode an (h, w, 4) uint8 array as an RGBA PNG"""
+    height, width, _ = rgba.shape
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw.tobytes(), 9))
+            + chunk(b'IEND', b''))
+
+
+def box_blur(grid, radius):
+    """Separable box blur via cumulative sums; three passes approximate a Gaussian"""
+    for _ in range(3):
+        for axis in (0, 1):
+            padded = np.pad(grid, [(radius + 1, radius) if a == axis else (0, 0) for a in (0, 1)])
+            cumulative = np.cumsum(padded, axis=axis)
+            size = grid.shape[axis]
+            upper = np.take(cumulative, np.arange(2 * radius + 1, 2 * radius + 1 + size), axis=axis)
+            lower = np.take(cumulative, np.arange(0, size), axis=axis)
+            grid = (upper - lower) / (2 * radius + 1)
+    return grid
+
+
+def density_rgba(density):
+    """Yellow-to-red ramp with alpha rising with intensity"""
+    peak = density.max()
+    t = np.sqrt(density / peak) if peak > 0 else density
+    rgba = np.zeros(density.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = 255
+    rgba[..., 1] = np.round(220 * (1 - t))
+    rgba[..., 3] = np.round(np.clip(t * 1.6, 0, 1) * 200)
+    rgba[..., 3][t < 0.02] = 0
+    return rgba
+
+
+def fill_polygon(mask, ring_x, ring_y):
+    """Even-odd fill of one ring (canvas pixel coordinates) into a boolean mask"""
+    height, width = mask.shape
+    x0, x1 = max(int(np.floor(ring_x.min())), 0), min(int(np.ceil(ring_x.max())), width)
+    y0, y1 = max(int(np.floor(ring_y.min())), 0), min(int(np.ceil(ring_y.max())), height)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    px = np.arange(x0, x1) + 0.5
+    py = (np.arange(y0, y1) + 0.5)[:, None]
+    ax, ay, bx, by = ring_x[:-1], ring_y[:-1], ring_x[1:], ring_y[1:]
+
+    # Crossing x of every edge on every pixel row: (rows x edges)
+    crosses = (ay > py) != (by > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_intersect = np.where(crosses, ax + (py - ay) * (bx - ax) / (by - ay), np.inf)
+    inside = np.count_nonzero(px[None, :, None] < x_intersect[:, None, :], axis=2) % 2 == 1
+    mask[y0:y1, x0:x1] |= inside
+
+
+class TilePyramid:
+    """Density and perimeter-coverage tiles for the California extent"""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, perimeters_path=PERIMETERS_PATH,
+                 output_dir=OUTPUT_DIR, min_zoom=DEFAULT_MIN_ZOOM, max_zoom=DEFAULT_MAX_ZOOM):
+        self.snapshot_path = snapshot_path
+        self.perimeters_path = perimeters_path
+        self.output_dir = output_dir
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.pyramid_id = "Tile-Pyramid-v1"
+
+    def _load_inputs(self):
+        with open(self.snapshot_path, 'r') as f:
+            incidents = json.load(f).get('incidents', [])
+        rings = []
+        if os.path.exists(self.perimeters_path):
+            with open(self.perimeters_path, 'r') as f:
+                rings = [
+                    np.asarray(feature['geometry']['coordinates'][0], dtype=np.float64)
+                    for feature in json.load(f).get('features', [])
+                    if feature.get('properties', {}).get('layer') == 'perimeter'
+                ]
+        return incidents, rings
+
+    def input_hash(self, incidents, rings):
+        digest = hashlib.md5(json.dumps(incidents, sort_keys=True).encode())
+        for ring in rings:
+            digest.update(ring.tobytes())
+        digest.update(f"{self.min_zoom}-{self.max_zoom}-{TILE_SIZE}-{DENSITY_BLUR_PX}".encode())
+        return digest.hexdigest()
+
+    def tile_range(self, zoom):
+        """Inclusive tile x/y ranges covering California at a zoom level"""
+        west, south, east, north = CALIFORNIA_BOUNDS
+        x0, x1 = (int(v // TILE_SIZE) for v in lng_to_px([west, east], zoom))
+        y0, y1 = (int(v // TILE_SIZE) for v in lat_to_px([north, south], zoom))
+        return x0, x1, y0, y1
+
+    def render_zoom(self, zoom, incidents, rings):
+        """Full-extent RGBA canvases for both layers at one zoom"""
+        x0, x1, y0, y1 = self.tile_range(zoom)
+        height, width = (y1 - y0 + 1) * TILE_SIZE, (x1 - x0 + 1) * TILE_SIZE
+        origin_x, origin_y = x0 * TILE_SIZE, y0 * TILE_SIZE
+
+        located = [i for i in incidents if i.get('lat') is not None and i.get('lng') is not None]
+        density = np.zeros((height, width), dtype=np.float64)
+        if located:
+            ix = np.floor(lng_to_px([i['lng'] for i in located], zoom) - origin_x).astype(np.int64)
+            iy = np.floor(lat_to_px([i['lat'] for i in located], zoom) - origin_y).astype(np.int64)
+            weights = np.log1p([i.get('acres') or 0 for i in located]) + 1
+            keep = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+            np.add.at(density, (iy[keep], ix[keep]), weights[keep])
+            density = box_blur(density, DENSITY_BLUR_PX)
+
+        coverage = np.zeros((height, width), dtype=bool)
+        for ring in rings:
+            fill_polygon(coverage, lng_to_px(ring[:, 0], zoom) - origin_x,
+                         lat_to_px(ring[:, 1], zoom) - origin_y)
+        coverage_rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        coverage_rgba[coverage] = COVERAGE_RGBA
+
+        return (x0, y0), {"density": density_rgba(density), "perimeters": coverage_rgba}
+
+    def _write_tiles(self, zoom, origin, canvases):
+        written = {}
+        for layer, canvas in canvases.items():
+            tiles = []
+            rows, cols = canvas.shape[0] // TILE_SIZE, canvas.shape[1] // TILE_SIZE
+            for row in range(rows):
+                for col in range(cols):
+                    tile = canvas[row * TILE_SIZE:(row + 1) * TILE_SIZE, col * TILE_SIZE:(col + 1) * TILE_SIZE]
+                    if not tile[..., 3].any():
+                        continue
+                    x, y = origin[0] + col, origin[1] + row
+                    path = os.path.join(self.output_dir, layer, str(zoom), str(x), f"{y}.png")
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(encode_png(np.ascontiguousarray(tile)))
+                    tiles.append(f"{zoom}/{x}/{y}")
+            written[layer] = tiles
+        return written
+
+    def build(self, force=False):
+        """Regenerate the pyramid when the snapshot or perimeters changed"""
+        print(f"[{self.pyramid_id}] Rasterizing zoom {self.min_zoom}-{self.max_zoom} tiles...")
+
+        incidents, rings = self._load_inputs()
+        input_hash = self.input_hash(incidents, rings)
+        manifest_path = os.path.join(self.output_dir, 'manifest.json')
+        try:
+            with open(manifest_path, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+
+        if previous.get('hash') == input_hash and not force:
+            print(f"[TILES] Inputs unchanged ({input_hash[:12]}), keeping existing tiles")
+            return {"status": "UNCHANGED", "hash": input_hash}
+
+        if os.path.isdir(self.output_dir):
+            shutil.rmtree(self.output_dir)
+
+        layers = {"density": [], "perimeters": []}
+        for zoom in range(self.min_zoom, self.max_zoom + 1):
+            origin, canvases = self.render_zoom(zoom, incidents, rings)
+            for layer, tiles in self._write_tiles(zoom, origin, canvases).items():
+                layers[layer].extend(tiles)
+
+        manifest = {
+            "hash": input_hash,
+            "generated": build_timestamp(),
+            "tileSize": TILE_SIZE,
+            "minZoom": self.min_zoom,
+            "maxZoom": self.max_zoom,
+            "bounds": CALIFORNIA_BOUNDS,
+            "layers": layers
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+
+        counts = {layer: len(tiles) for layer, tiles in layers.items()}
+        print(f"[TILES] Wrote {counts} tiles to {self.output_dir}")
+        return {"status": "REBUILT", "hash": input_hash, "tiles": counts}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build density and perimeter XYZ tiles")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--perimeters", default=PERIMETERS_PATH)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--min-zoom", type=int, default=DEFAULT_MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=DEFAULT_MAX_ZOOM)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    pyramid = TilePyramid(args.snapshot, args.perimeters, args.output_dir, args.min_zoom, args.max_zoom)
+    print(json.dumps(pyramid.build(args.force), indent=2))